@@ -92,3 +92,33 @@ async def add_is_active_column():
         """)
         )
 
+        await conn.execute(text("""
+        ALTER TABLE traceability_report
+            ADD COLUMN IF NOT EXISTS stage_timings JSONB NOT NULL DEFAULT '{}'::jsonb,
+            ADD COLUMN IF NOT EXISTS input_fingerprints JSONB NOT NULL DEFAULT '{}'::jsonb;
+        """))
+
+        await conn.execute(text("""
+        ALTER TABLE traceabilityrecord
+            ADD COLUMN IF NOT EXISTS input_fingerprint VARCHAR;
+        """))
+
+        await conn.execute(text("""
+        ALTER TABLE persona
+            ADD COLUMN IF NOT EXISTS derivatives_meta JSONB,
+            ADD COLUMN IF NOT EXISTS prompt_context JSONB;
+        """))
+
+        await conn.execute(text("""
+        ALTER TABLE interview
+            ADD COLUMN IF NOT EXISTS generation_status VARCHAR,
+            ADD COLUMN IF NOT EXISTS generation_progress JSON,
+            ADD COLUMN IF NOT EXISTS generation_heartbeat_at TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS answers_indexed BOOLEAN NOT NULL DEFAULT FALSE;
+        """))
+
+        await conn.execute(text("""
+        ALTER TABLE surveysimulation
+            ADD COLUMN IF NOT EXISTS packed_results JSON;
+        """))
+
@@ -20,9 +20,15 @@ from fastapi import HTTPException
 from app.schemas.response import ErrorResponse
 import json
 from app.utils.create_superadmin import ensure_superadmin_exists
+from app.utils.request_timing import ServerTimingMiddleware, install_db_timing
+from app.utils.tracing import setup_tracing
+from app.utils.llm_usage import UsageScopeMiddleware, usage_ledger
+from app.utils.loop_monitor import loop_monitor, start_loop_monitor
+from app.services.interview_generation import start_interview_heartbeat, stop_interview_heartbeat
 
 
 app = FastAPI(title="Synthetic People")
+install_db_timing()
 
 
 def normalize_detail(detail):
@@ -66,6 +72,16 @@ async def startup():
     await init_db()
     await add_is_active_column()
     await ensure_superadmin_exists()
+    usage_ledger.start()
+    start_interview_heartbeat()
+    start_loop_monitor()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await usage_ledger.stop()
+    await stop_interview_heartbeat()
+    await loop_monitor.stop()
 
 
 app.include_router(auth.router)
@@ -83,6 +99,9 @@ app.include_router(exploration.router)
 app.include_router(omi_workflow.router)
 app.include_router(admin.router)
 
+app.add_middleware(UsageScopeMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+setup_tracing(app)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["https://dev-ui.synthetic-people.ai"],
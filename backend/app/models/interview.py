@@ -36,6 +36,36 @@ class Interview(SQLModel, table=True):
     generated_answers: Dict[str, dict] = Field(sa_column=Column(JSON), default_factory=dict)
     created_by: str = Field(foreign_key="user.id")
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # "running" | "completed" | "partial" | "failed"; NULL for interviews generated in one shot
+    generation_status: Optional[str] = Field(default=None)
+    generation_progress: Optional[dict] = Field(sa_column=Column(JSON), default=None)
+    # refreshed by the worker running the generation; stale means the worker is gone
+    generation_heartbeat_at: Optional[datetime] = Field(default=None)
+    # True once generated_answers are mirrored into interviewanswerindex
+    answers_indexed: bool = Field(default=False)
+
+
+class InterviewAnswerIndex(SQLModel, table=True):
+    """
+    One row per generated answer (question -> persona -> answer), kept in
+    sync with Interview.generated_answers so exploration-wide preview and
+    export read a single indexed table instead of every transcript.
+    """
+    __tablename__ = "interviewanswerindex"
+
+    id: str = Field(default_factory=generate_id, primary_key=True)
+    workspace_id: str = Field(foreign_key="workspace.id")
+    exploration_id: str = Field(foreign_key="explorations.id", index=True)
+    interview_id: str = Field(foreign_key="interview.id", index=True)
+    persona_id: Optional[str] = Field(default=None)
+    section: str = Field(default="General")
+    question: str
+    position: int = Field(default=0)
+    answer: Optional[str] = None
+    implications: List = Field(sa_column=Column(JSON), default_factory=list)
+    # raw-pass scores / markers (quality_score, independence_score, ...)
+    signals: Dict = Field(sa_column=Column(JSON), default_factory=dict)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 class InterviewFile(SQLModel, table=True):
@@ -0,0 +1,31 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+from app.utils.id_generator import generate_id
+
+
+class LLMUsage(SQLModel, table=True):
+    """One row per LLM HTTP request (SDK retries are separate rows)."""
+    __tablename__ = "llm_usage"
+
+    id: str = Field(default_factory=generate_id, primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+    call_site: str = Field(index=True)
+    provider: str
+    model: Optional[str] = Field(default=None, index=True)
+    endpoint: Optional[str] = Field(default=None)
+    streamed: bool = Field(default=False)
+
+    prompt_tokens: int = Field(default=0)
+    completion_tokens: int = Field(default=0)
+    cached_tokens: int = Field(default=0)
+    latency_ms: float = Field(default=0.0)
+    # attempt number from the SDK retry loop (0 = first attempt)
+    retries: int = Field(default=0)
+    status: Optional[int] = Field(default=None)
+    error: Optional[str] = Field(default=None)
+
+    # not foreign keys: rows outlive deleted workspaces / explorations
+    workspace_id: Optional[str] = Field(default=None, index=True)
+    exploration_id: Optional[str] = Field(default=None, index=True)
@@ -75,6 +75,16 @@ class Persona(SQLModel, table=True):
         default=None,
         sa_column=Column(JSON)
     )
+    # {"confidence"|"ocean": {"version", "fingerprint", "computed_at"}}
+    derivatives_meta: Optional[dict] = Field(
+        default=None,
+        sa_column=Column(JSONB)
+    )
+    # Cached prompt renderings {"version", "name", "full", "summary"}
+    prompt_context: Optional[dict] = Field(
+        default=None,
+        sa_column=Column(JSONB)
+    )
 
     auto_generated_persona: bool = Field(
         default=False,
@@ -16,6 +16,8 @@ class TraceabilityRecord(SQLModel, table=True):
 
     narrative_summary: Dict = Field(sa_column=Column(JSON), default_factory=dict)
 
+    input_fingerprint: Optional[str] = Field(default=None)
+
     created_by: Optional[str] = Field(default=None, foreign_key="user.id")
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -28,4 +30,6 @@ class TraceabilityReport(SQLModel, table=True):
     persona_traceability: dict = Field(sa_column=Column(JSON), default={})
     quant_traceability: dict = Field(sa_column=Column(JSON), default={})
     qual_traceability: dict = Field(sa_column=Column(JSON), default={})
+    stage_timings: dict = Field(sa_column=Column(JSON), default={})
+    input_fingerprints: dict = Field(sa_column=Column(JSON), default={})
     updated_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_session
@@ -10,7 +11,12 @@ from app.routers.auth_dependencies import get_current_active_user
 from app.models.user import User
 from app.services import workspace as ws_service
 from app.services import admin_service
-from datetime import date
+from app.services.humanization_gate import humanization_metrics
+from app.utils.llm_usage import usage_ledger
+from app.utils.loop_monitor import loop_monitor
+from app.utils.llm_limiter import llm_limiter
+from app.utils import profiling
+from datetime import date, datetime, timedelta
 
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -119,6 +125,195 @@ async def get_user_stats(
     )
 
 
+@router.get("/metrics/humanization", response_model=SuccessResponse)
+async def humanization_gate_metrics(
+    current_user: User = Depends(get_current_active_user),
+):
+    if current_user.role != "super_admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    return SuccessResponse(
+        message="Humanization metrics fetched successfully",
+        data=humanization_metrics.snapshot(),
+    )
+
+
+@router.get("/metrics/event-loop", response_model=SuccessResponse)
+async def event_loop_metrics(
+    current_user: User = Depends(get_current_active_user),
+):
+    if current_user.role != "super_admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    return SuccessResponse(
+        message="Event loop metrics fetched successfully",
+        data=loop_monitor.snapshot(),
+    )
+
+
+@router.get("/metrics/llm-limiter", response_model=SuccessResponse)
+async def llm_limiter_metrics(
+    current_user: User = Depends(get_current_active_user),
+):
+    if current_user.role != "super_admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    return SuccessResponse(
+        message="LLM limiter state fetched successfully",
+        data=llm_limiter.snapshot(),
+    )
+
+
+@router.get("/metrics/llm-usage", response_model=SuccessResponse)
+async def llm_usage_metrics(
+    start: datetime | None = Query(None),
+    end: datetime | None = Query(None),
+    bucket: str | None = Query(None, description="hour | day | week"),
+    workspace_id: str | None = Query(None),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    if current_user.role != "super_admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    if bucket and bucket not in admin_service.LLM_USAGE_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"bucket must be one of {', '.join(admin_service.LLM_USAGE_BUCKETS)}")
+
+    # default window: last 24 hours
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(hours=24)
+
+    call_sites = await admin_service.llm_usage_summary(
+        session=session,
+        start_dt=start,
+        end_dt=end,
+        bucket=bucket,
+        workspace_id=workspace_id,
+    )
+
+    return SuccessResponse(
+        message="LLM usage fetched successfully",
+        data={
+            "range": {"start": start, "end": end},
+            "bucket": bucket,
+            "call_sites": call_sites,
+            "ledger": usage_ledger.snapshot(),
+        },
+    )
+
+
+TRACEMALLOC_KEY_TYPES = ("lineno", "filename", "traceback")
+
+
+def _require_super_admin(current_user: User) -> None:
+    if current_user.role != "super_admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+def _check_key_type(key_type: str) -> None:
+    if key_type not in TRACEMALLOC_KEY_TYPES:
+        raise HTTPException(status_code=400, detail=f"key_type must be one of {', '.join(TRACEMALLOC_KEY_TYPES)}")
+
+
+@router.post("/profiling/cpu")
+async def cpu_profile(
+    seconds: float = Query(10, gt=0, le=profiling.MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(10, ge=profiling.MIN_INTERVAL_MS),
+    include_idle: bool = Query(False),
+    as_json: bool = Query(False),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Samples every thread of this worker for `seconds` and returns collapsed
+    stacks (flamegraph.pl / speedscope input). Only the worker that serves
+    the request is profiled.
+    """
+    _require_super_admin(current_user)
+
+    profile = await profiling.run_sampling_profile(seconds, interval_ms, include_idle)
+
+    if as_json:
+        return SuccessResponse(message="Profile captured successfully", data=profile)
+
+    filename = f"profile-{profile['pid']}-{profile['started_at'][:19].replace(':', '')}.collapsed"
+    return PlainTextResponse(
+        profile["collapsed"],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Profile-Samples": str(profile["samples"]),
+        },
+    )
+
+
+@router.post("/profiling/memory/start", response_model=SuccessResponse)
+async def start_memory_tracing(
+    frames: int = Query(25, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+):
+    _require_super_admin(current_user)
+
+    return SuccessResponse(
+        message="tracemalloc started",
+        data=profiling.start_tracemalloc(frames),
+    )
+
+
+@router.post("/profiling/memory/stop", response_model=SuccessResponse)
+async def stop_memory_tracing(
+    current_user: User = Depends(get_current_active_user),
+):
+    _require_super_admin(current_user)
+
+    return SuccessResponse(
+        message="tracemalloc stopped",
+        data=profiling.stop_tracemalloc(),
+    )
+
+
+@router.post("/profiling/memory/snapshot", response_model=SuccessResponse)
+async def memory_snapshot(
+    limit: int = Query(25, ge=1, le=500),
+    key_type: str = Query("lineno"),
+    current_user: User = Depends(get_current_active_user),
+):
+    _require_super_admin(current_user)
+    _check_key_type(key_type)
+
+    return SuccessResponse(
+        message="Memory snapshot captured successfully",
+        data=await profiling.take_tracemalloc_snapshot(limit, key_type),
+    )
+
+
+@router.get("/profiling/memory/snapshots", response_model=SuccessResponse)
+async def memory_snapshots(
+    current_user: User = Depends(get_current_active_user),
+):
+    _require_super_admin(current_user)
+
+    return SuccessResponse(
+        message="Memory snapshots fetched successfully",
+        data=profiling.list_tracemalloc_snapshots(),
+    )
+
+
+@router.get("/profiling/memory/diff", response_model=SuccessResponse)
+async def memory_snapshot_diff(
+    from_id: str,
+    to_id: str,
+    limit: int = Query(25, ge=1, le=500),
+    key_type: str = Query("lineno"),
+    current_user: User = Depends(get_current_active_user),
+):
+    _require_super_admin(current_user)
+    _check_key_type(key_type)
+
+    return SuccessResponse(
+        message="Memory snapshot diff computed successfully",
+        data=await profiling.diff_tracemalloc_snapshots(from_id, to_id, limit, key_type),
+    )
+
+
 @router.get("/dashboard")
 async def user_dashboard(
     filter_type: str,
@@ -1,20 +1,23 @@
+import json
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
 from typing import Optional, List
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from app.schemas.response import SuccessResponse, ErrorResponse, DeleteResponse
 from app.schemas.interview import (
-    InterviewCreate, MessageIn,
+    InterviewCreate, InterviewBatchCreate, MessageIn,
     InterviewSectionCreate, InterviewSectionUpdate,
     InterviewQuestionCreate, InterviewQuestionUpdate, InterviewQuestionDelete
 )
 from app.services import interview as interview_service
+from app.services import interview_generation
+from app.services.interview_answer_index import get_exploration_preview
 from app.services import workspace as ws_service
 from app.models.user import User
 from app.routers.auth_dependencies import get_current_active_user
 from app.utils.file_utils import save_upload_file
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db import get_session
-from app.services.auto_generated_persona import validate_deleted_question, validate_existing_question, validate_new_question_against_theme
+from app.services.question_validation import validate_new_question, validate_question_edit, validate_question_delete
 from app.services.report_generation_qual_claude import generate_pdf_path, generate_combined_interviews_pdf
 
 
@@ -81,7 +84,7 @@ async def create_question(
 ):
     """Create a new interview question in a section"""
     if not payload.is_force_insert:
-        valid_or_not, reason = await validate_new_question_against_theme(section_id, payload)
+        valid_or_not, reason = await validate_new_question(section_id, payload)
 
         if not valid_or_not:
             data = {
@@ -104,7 +107,7 @@ async def update_question(
 ):
     """Update an interview question text"""
     if not payload.is_force_insert:
-        valid_or_not, reason = await validate_existing_question(question_id, payload)
+        valid_or_not, reason = await validate_question_edit(question_id, payload)
         if not valid_or_not:
             data = {
                 "validation_status":"failed",
@@ -126,7 +129,7 @@ async def delete_question(
 ):
     """Delete an interview question"""
     if not payload.is_force_insert:
-        valid_or_not, reason = await validate_deleted_question(question_id, payload)
+        valid_or_not, reason = await validate_question_delete(question_id, payload)
         if not valid_or_not:
             data = {
                 "validation_status":"failed",
@@ -170,10 +173,48 @@ async def start_interview(workspace_id: str, exploration_id: str, payload: Inter
             "questions": questions
         })
     
-    iv = await interview_service.start_interview(workspace_id, exploration_id, payload.persona_id, current_user.id, sections)
+    iv = await interview_service.start_interview(
+        workspace_id, exploration_id, payload.persona_id, current_user.id, sections,
+        background=payload.background
+    )
     return SuccessResponse(message="Interview started", data=iv)
 
 
+@router.post("/interviews/batch", response_model=SuccessResponse, status_code=202)
+async def start_interview_batch(workspace_id: str, exploration_id: str, payload: InterviewBatchCreate, current_user: User = Depends(get_current_active_user)):
+    if not await ws_service.is_workspace_admin(workspace_id, current_user.id):
+        raise HTTPException(status_code=403, detail=ErrorResponse(status="error", message="Only workspace admins can start interviews").dict())
+
+    guide_data = await interview_service.get_full_interview_guide(workspace_id, exploration_id)
+
+    if not guide_data:
+        raise HTTPException(status_code=400, detail=ErrorResponse(status="error", message="No interview guide found for this objective").dict())
+
+    sections = [
+        {"title": section["title"], "questions": [q["text"] for q in section.get("questions", [])]}
+        for section in guide_data
+    ]
+
+    batch = await interview_generation.start_interview_batch(
+        workspace_id, exploration_id, payload.persona_ids, current_user.id, sections
+    )
+    if not batch.runs:
+        raise HTTPException(status_code=400, detail=ErrorResponse(status="error", message="No personas to interview").dict())
+    return SuccessResponse(message="Interview batch started", data=batch.snapshot())
+
+
+@router.get("/interviews/batch/{batch_id}", response_model=SuccessResponse)
+async def get_interview_batch(workspace_id: str, batch_id: str, current_user: User = Depends(get_current_active_user)):
+    members = await ws_service.list_workspace_members(workspace_id)
+    if not any(m.user_id == current_user.id for m in members):
+        raise HTTPException(status_code=403, detail=ErrorResponse(status="error", message="Not a member").dict())
+
+    batch = interview_generation.get_batch(batch_id, workspace_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail=ErrorResponse(status="error", message="Batch not found").dict())
+    return SuccessResponse(message="Batch progress fetched", data=batch.snapshot())
+
+
 @router.get("/interviews", response_model=SuccessResponse)
 async def list_interviews(workspace_id: str, exploration_id: str, current_user: User = Depends(get_current_active_user)):
     members = await ws_service.list_workspace_members(workspace_id)
@@ -190,82 +231,11 @@ async def preview_all_interviews(workspace_id: str, exploration_id: str, current
     if not any(m.user_id == current_user.id for m in members):
         raise HTTPException(status_code=403, detail=ErrorResponse(status="error", message="Not a member").dict())
 
-    interviews = await interview_service.list_interviews_for_objective(workspace_id, exploration_id)
-    
-    if not interviews:
+    preview_data = await get_exploration_preview(workspace_id, exploration_id)
+
+    if not preview_data:
         raise HTTPException(status_code=404, detail=ErrorResponse(status="error", message="No interviews found").dict())
-    
-    from app.services.persona import get_persona
-    
-    # Build the same structure as the PDF export
-    # grouped: section -> question -> list of (persona_id, answer, implications)
-    grouped = {}
-    persona_cache = {}
-    
-    for iv in interviews:
-        # Get interview data
-        data = iv.model_dump() if hasattr(iv, "model_dump") else (iv if isinstance(iv, dict) else iv.__dict__)
-        gen = data.get("generated_answers", {}) or {}
-        
-        # Get persona info (cache it)
-        persona_id = data.get("persona_id")
-        if persona_id and persona_id not in persona_cache:
-            persona = await get_persona(persona_id)
-            persona_cache[persona_id] = persona
-        
-        # Process generated answers
-        for qtext, info in gen.items():
-            section = info.get("meta_section") or "General"
-            
-            # Try to extract section from messages if not in generated_answers
-            if section == "General":
-                for m in data.get("messages", []):
-                    meta = m.get("meta") or {}
-                    if meta.get("question") == qtext:
-                        section = meta.get("section") or section
-                        break
-            
-            # Get persona info for this answer
-            answer_persona_id = info.get("persona_id") or persona_id
-            persona_info = persona_cache.get(answer_persona_id)
-            
-            if section not in grouped:
-                grouped[section] = {}
-            if qtext not in grouped[section]:
-                grouped[section][qtext] = []
-            
-            grouped[section][qtext].append({
-                "persona_id": answer_persona_id,
-                "persona_name": persona_info.get("name") if persona_info else "Unknown",
-                "persona_age": persona_info.get("age_range") if persona_info else None,
-                "persona_occupation": persona_info.get("occupation") if persona_info else None,
-                "answer": info.get("persona_answer"),
-                "implications": info.get("implications", [])
-            })
-    
-    # Format the preview data to match PDF structure
-    sections_preview = []
-    for section_title, questions in grouped.items():
-        questions_preview = []
-        for qtext, answers in questions.items():
-            questions_preview.append({
-                "question": qtext,
-                "response_count": len(answers),
-                "summary": f"Collected {len(answers)} persona response(s).",
-                "answers": answers
-            })
-        sections_preview.append({
-            "section": section_title,
-            "questions": questions_preview
-        })
-    
-    preview_data = {
-        "workspace_id": workspace_id,
-        "exploration_id": exploration_id,
-        "total_interviews": len(interviews),
-        "sections": sections_preview
-    }
-    
+
     return SuccessResponse(message="All interviews preview", data=preview_data)
 
 
@@ -340,6 +310,45 @@ async def post_message(
     return SuccessResponse(message="Message saved", data=updated)
 
 
+@router.get("/interviews/{interview_id}/progress", response_model=SuccessResponse)
+async def get_interview_progress(workspace_id: str, interview_id: str, current_user: User = Depends(get_current_active_user)):
+    progress = await interview_generation.get_interview_progress(interview_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail=ErrorResponse(status="error", message="Interview not found").dict())
+    return SuccessResponse(message="Interview progress fetched", data=progress)
+
+
+@router.get("/interviews/{interview_id}/stream")
+async def stream_interview_progress(workspace_id: str, interview_id: str, current_user: User = Depends(get_current_active_user)):
+    """
+    Server-sent events for an interview being generated: one `section` event per
+    finished section and a final `done`. Finished interviews emit `done` only.
+    """
+    run = interview_generation.get_active_run(interview_id)
+    if not run:
+        progress = await interview_generation.get_interview_progress(interview_id)
+        if not progress:
+            raise HTTPException(status_code=404, detail=ErrorResponse(status="error", message="Interview not found").dict())
+
+        async def finished_stream():
+            yield f"event: done\ndata: {json.dumps(progress, default=str)}\n\n"
+
+        return StreamingResponse(finished_stream(), media_type="text/event-stream")
+
+    async def event_stream():
+        queue = run.subscribe()
+        try:
+            while True:
+                event = await queue.get()
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+                if event["type"] == "done":
+                    break
+        finally:
+            run.unsubscribe(queue)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/interviews/{interview_id}", response_model=SuccessResponse)
 async def get_interview_details(workspace_id: str, interview_id: str, current_user: User = Depends(get_current_active_user)):
     iv = await interview_service.get_interview(interview_id)
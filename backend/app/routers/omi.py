@@ -15,6 +15,7 @@ from app.routers.auth_dependencies import get_current_active_user
 from app.services.exploration import get_exploration_by_id
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db import get_session
+from app.utils.llm_usage import usage_scope
 
 router = APIRouter(
     prefix="/workspaces/omi",
@@ -119,12 +120,13 @@ async def chat_endpoint(
             db, payload.exploration_id
         )
 
-        response = await omi_service.chat_with_omi(
-            db=db,
-            session_id=payload.session_id,
-            user_message=payload.message,
-            exploration=exploration
-        )
+        with usage_scope(workspace_id=exploration.workspace_id, exploration_id=payload.exploration_id):
+            response = await omi_service.chat_with_omi(
+                db=db,
+                session_id=payload.session_id,
+                user_message=payload.message,
+                exploration=exploration
+            )
 
         return SuccessResponse(
             message="Omi response generated",
@@ -1,9 +1,12 @@
+from typing import List
+
 from fastapi import APIRouter
 from app.schemas.omi_workflow import (
     OmiWorkflowEventIn,
+    OmiWorkflowBatchIn,
     OmiWorkflowResponse
 )
-from app.services.omi_workflow import handle_omi_workflow_event
+from app.services.omi_workflow import handle_omi_workflow_event, handle_omi_workflow_events
 
 router = APIRouter(prefix="/omi/workflow", tags=["OMI Workflow"])
 
@@ -14,3 +17,8 @@ async def omi_workflow_event(event: OmiWorkflowEventIn):
         event=event.event,
         payload=event.payload
     )
+
+
+@router.post("/events", response_model=List[OmiWorkflowResponse])
+async def omi_workflow_events(batch: OmiWorkflowBatchIn):
+    return await handle_omi_workflow_events(batch.events)
@@ -3,6 +3,7 @@ from typing import List
 from app.schemas.persona import PersonaCreate, PersonaOut, PersonaUpdate, PersonaPreview, PersonaBackstoryIn
 from app.schemas.response import SuccessResponse, ErrorResponse, DeleteResponse
 from app.services import persona as persona_service
+from app.services import persona_derivatives
 from app.services import auto_generated_persona, manual_generated_persona
 from app.services import workspace as ws_service
 from app.services import exploration as exploration_service
@@ -291,7 +292,6 @@ async def preview_persona(
     exploration_id: str,
     persona_id: str,
     current_user: User = Depends(get_current_active_user),
-    session: AsyncSession = Depends(get_session),
 ):
     members = await ws_service.list_workspace_members(workspace_id)
     if not any(m.user_id == current_user.id for m in members):
@@ -300,66 +300,25 @@ async def preview_persona(
             detail=ErrorResponse(status="error", message="You are not a member of this workspace").dict()
         )
 
-    p = await persona_service.get_persona(persona_id)
+    # Pure DB read: confidence and OCEAN are precomputed when the persona is
+    # created or updated (see services/persona_derivatives.py).
+    p = await persona_derivatives.get_persona_with_derivatives(persona_id)
     if not p or str(p["exploration_id"]) != str(exploration_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ErrorResponse(status="error", message="Persona not found for this research objective").dict()
         )
 
-    full_persona_info = p.get("persona_details") or {}
+    full_persona_info = dict(p.get("persona_details") or {})
+    confidence = full_persona_info.get("confidence_scoring", "")
 
-    confidence = full_persona_info.get("confidence_scoring","")
-    if not confidence:
-        confidence = await persona_service.generate_persona_confidence(p)
-
-    ocean_profile = p.get("ocean_profile")
-    if not ocean_profile:
-        try:
-            # Fetch persona from database to update
-            result = await session.execute(
-                select(Persona).where(Persona.id == persona_id)
-            )
-            persona_obj = result.scalar_one_or_none()
-            
-            if persona_obj:
-                # Generate OCEAN profile
-                system_prompt = load_persona_builder_prompt()
-                user_prompt = json.dumps({
-                    "persona_data": {
-                        "age_range": persona_obj.age_range,
-                        "gender": persona_obj.gender,
-                        "income_range": persona_obj.income_range,
-                        "location": persona_obj.geography or persona_obj.location_country,
-                        "occupation": persona_obj.occupation,
-                        "lifestyle": persona_obj.lifestyle,
-                        "values": persona_obj.values,
-                        "motivations": persona_obj.motivations,
-                        "brand_sensitivity": persona_obj.brand_sensitivity,
-                        "price_sensitivity": persona_obj.price_sensitivity,
-                        "digital_activity": persona_obj.digital_activity
-                    }
-                })
-
-                ocean_profile = await call_omi(
-                    system_prompt=system_prompt,
-                    user_prompt=user_prompt,
-                    response_format="json"
-                )
-
-                # Save OCEAN profile to database
-                persona_obj.ocean_profile = ocean_profile
-                session.add(persona_obj)
-                await session.commit()
-                await session.refresh(persona_obj)
-                
-                # Update the persona dict with OCEAN profile
-                p["ocean_profile"] = ocean_profile
-        except Exception as e:
-            print(f"Failed to generate OCEAN profile: {e}")
-            ocean_profile = None
+    if p["derivatives_retry_due"]:
+        # Older rows or a failed refresh: fill them in the background, never
+        # inline, backing off while the refresh keeps failing.
+        persona_derivatives.schedule_persona_derivatives(persona_id)
 
     preview = persona_service.persona_preview_from_dict(p, full_persona_info, confidence=confidence)
+    preview["derivatives_status"] = p["derivatives_status"]
 
     return SuccessResponse(message="Persona preview generated successfully", data=preview)
 
@@ -424,7 +383,6 @@ from app.services.omi import load_persona_builder_prompt
 from app.services.omi import call_omi
 from  app.models.persona import Persona
 from sqlmodel import Session, select
-import json
 
 
 @router.post("/persona/{persona_id}/ocean")
@@ -445,22 +403,7 @@ async def generate_ocean(
         return persona.ocean_profile
 
     system_prompt = load_persona_builder_prompt()
-
-    user_prompt = json.dumps({
-        "persona_data": {
-            "age_range": persona.age_range,
-            "gender": persona.gender,
-            "income_range": persona.income_range,
-            "location": persona.geography or persona.location_country,
-            "occupation": persona.occupation,
-            "lifestyle": persona.lifestyle,
-            "values": persona.values,
-            "motivations": persona.motivations,
-            "brand_sensitivity": persona.brand_sensitivity,
-            "price_sensitivity": persona.price_sensitivity,
-            "digital_activity": persona.digital_activity
-        }
-    })
+    user_prompt = persona_derivatives.build_ocean_user_prompt(persona)
 
     ocean_profile = await call_omi(
         system_prompt=system_prompt,
@@ -1,3 +1,4 @@
+import json
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import update
@@ -33,9 +34,12 @@ from app.services.persona import get_persona
 from app.services.population import get_simulation
 from app.services.exploration import get_exploration
 from app.services.questionnaire import get_full_questionnaire
+from fastapi import Request, Response
 from fastapi.responses import StreamingResponse
 from app.utils.pdf_generator import generate_survey_pdf
 from app.services.survey_simulation import get_survey_simulation_by_id
+from app.services.survey_results import simulation_results_view, compare_results
+from app.services.survey_preview import get_survey_preview, etag_matches
 from app.services.persona import get_persona
 from app.services.exploration import get_exploration
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form
@@ -105,13 +109,7 @@ async def upload_questionnaire_file(
     )
 
 
-@router.post("/generate", response_model=SuccessResponse)
-async def generate_questionnaire_api(
-    workspace_id: str,
-    payload: QuestionnaireGenerateRequest,
-    current_user: User = Depends(get_current_active_user),
-    session: AsyncSession = Depends(get_session),
-):
+async def _load_generation_inputs(payload: QuestionnaireGenerateRequest, session: AsyncSession):
     objective = await get_exploration(session, payload.exploration_id)
     if not objective:
         raise HTTPException(404, "Research objective not found")
@@ -135,6 +133,18 @@ async def generate_questionnaire_api(
     if not personas_list:
         raise HTTPException(400, "No valid personas found")
 
+    return objective, simulation, personas_list, persona_names
+
+
+@router.post("/generate", response_model=SuccessResponse)
+async def generate_questionnaire_api(
+    workspace_id: str,
+    payload: QuestionnaireGenerateRequest,
+    current_user: User = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
+):
+    objective, simulation, personas_list, persona_names = await _load_generation_inputs(payload, session)
+
     output, error = await generate_questionnaire(objective, personas_list, simulation, payload.exploration_id)
 
     if error:
@@ -163,6 +173,41 @@ async def generate_questionnaire_api(
         }
     )
 
+@router.post("/generate/stream")
+async def generate_questionnaire_stream_api(
+    workspace_id: str,
+    payload: QuestionnaireGenerateRequest,
+    current_user: User = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Server-sent events: one `section` event per generated section as soon as
+    it is stored (with ids, ready for review/editing), then `done` with the
+    full questionnaire, or `error`.
+    """
+    objective, simulation, personas_list, persona_names = await _load_generation_inputs(payload, session)
+    personas_considered = [
+        {"persona_id": pid, "persona_name": pname}
+        for pid, pname in zip(payload.persona_id, persona_names)
+    ]
+
+    async def event_source():
+        async for event, data in service.stream_generate_questionnaire(
+            workspace_id, objective, personas_list, simulation,
+            payload.exploration_id, current_user.id, payload.simulation_id
+        ):
+            if event == "done":
+                data = {
+                    "questionnaire": data,
+                    "personas_considered": personas_considered,
+                    "total_personas": len(personas_list),
+                }
+            elif event == "error":
+                data = {"message": f"Failed to generate questionnaire: {data}"}
+            yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    return StreamingResponse(event_source(), media_type="text/event-stream")
+
 @router.get("/allquestionnaires/{simulation_id}", response_model=SuccessResponse)
 async def get_questionnaire_by_simulation(
     workspace_id: str,
@@ -251,6 +296,7 @@ async def simulate_survey(
             "title": sec.get("title"),
             "questions": [
                 {
+                    "id": q.get("id"),
                     "text": q.get("text"),
                     "options": q.get("options") or []
                 } for q in sec.get("questions", [])
@@ -312,81 +358,55 @@ async def preview_survey_report(
     workspace_id: str,
     exploration_id: str,
     simulation_id: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user)
 ):
-    sim = await get_survey_simulation_by_id(simulation_id)
-    if not sim:
+    preview = await get_survey_preview(simulation_id)
+    if not preview:
         raise HTTPException(404, "Survey Simulation not found")
 
-    persona_ids = sim.persona_id if isinstance(sim.persona_id, list) else [sim.persona_id] if sim.persona_id else []
-    
-    personas_data = []
-    for pid in persona_ids:
-        persona = await get_persona(pid)
-        if persona:
-            personas_data.append({
-                "persona_id": pid,
-                "name": persona.get("name", "Unknown"),
-                "age_range": persona.get("age_range"),
-                "occupation": persona.get("occupation"),
-                "sample_size": sim.persona_sample_sizes.get(pid) if sim.persona_sample_sizes else None
-            })
-    
-    from app.db import async_engine
-    from sqlalchemy.ext.asyncio import AsyncSession
-    async with AsyncSession(async_engine) as session:
-        objective = await get_exploration(session, sim.exploration_id)
-
-    sections = await get_full_questionnaire(sim.workspace_id, sim.exploration_id)
-
-    from app.services.survey_simulation import _to_percent_string
+    etag, preview_data = preview
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
 
-    grouped = []
-    for sec in sections:
-        qs = []
-
-        for q in sec["questions"]:
-            qtext = q["text"]
-            results = sim.results.get(qtext, [])
+    response.headers.update(headers)
+    return SuccessResponse(message="Survey report preview", data=preview_data)
 
-            formatted_results = [
-                {
-                    "option": opt.get("option"),
-                    "count": opt.get("count"),
-                    "percentage": _to_percent_string(opt.get("pct", 0))
-                }
-                for opt in results
-            ]
 
-            qs.append({
-                "question": qtext,
-                "results": formatted_results
-            })
+@router.get("/simulation/{simulation_id}/compare/{other_simulation_id}", response_model=SuccessResponse)
+async def compare_survey_simulations(
+    workspace_id: str,
+    exploration_id: str,
+    simulation_id: str,
+    other_simulation_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    members = await ws_service.list_workspace_members(workspace_id)
+    if not any(m.user_id == current_user.id for m in members):
+        raise HTTPException(
+            403, ErrorResponse(status="error", message="Not a workspace member").dict()
+        )
 
-        grouped.append({
-            "title": sec["title"],
-            "questions": qs
-        })
+    sim = await get_survey_simulation_by_id(simulation_id)
+    other = await get_survey_simulation_by_id(other_simulation_id)
+    # both must belong to the workspace / exploration in the path
+    if not all(
+        s and str(s.workspace_id) == str(workspace_id) and str(s.exploration_id) == str(exploration_id)
+        for s in (sim, other)
+    ):
+        raise HTTPException(404, "Survey Simulation not found")
 
-    preview_data = {
-        "simulation_id": sim.id,
-        "workspace_id": sim.workspace_id,
-        "exploration_id": sim.exploration_id,
-        "total_sample_size": sim.total_sample_size if hasattr(sim, 'total_sample_size') else sim.sample_size if hasattr(sim, 'sample_size') else 0,
-        "created_at": sim.created_at.isoformat() if sim.created_at else None,
-        "personas": personas_data,
-        "persona_sample_sizes": sim.persona_sample_sizes if hasattr(sim, 'persona_sample_sizes') else {},
-        "research_objective": objective.description if objective and hasattr(objective, 'description') else "",
-        "narrative": sim.narrative or {},
-        "sections": grouped,
-        "summary": {
-            "total_questions": sum(len(sec["questions"]) for sec in grouped),
-            "total_sections": len(grouped),
-            "total_personas": len(personas_data)
+    questions = compare_results(simulation_results_view(sim), simulation_results_view(other))
+    return SuccessResponse(
+        message="Survey simulations compared",
+        data={
+            "simulation_id": sim.id,
+            "other_simulation_id": other.id,
+            "questions": sorted(questions, key=lambda q: q["max_shift"], reverse=True),
         }
-    }
-    
-    return SuccessResponse(message="Survey report preview", data=preview_data)
+    )
 
 
 @router.get("/simulation/{simulation_id}/download", response_class=StreamingResponse)
@@ -407,42 +427,6 @@ async def download_survey_pdf(
         persona = await get_persona(pid)
         if persona:
             personas_list.append(persona)
-    
-    from app.db import async_engine
-    from sqlalchemy.ext.asyncio import AsyncSession
-    async with AsyncSession(async_engine) as session:
-        objective = await get_exploration(session, sim.exploration_id)
-
-    sections = await get_full_questionnaire(sim.workspace_id, sim.exploration_id)
-
-    from app.services.survey_simulation import _to_percent_string
-
-    grouped = []
-    for sec in sections:
-        qs = []
-
-        for q in sec["questions"]:
-            qtext = q["text"]
-            results = sim.results.get(qtext, [])
-
-            formatted_results = [
-                {
-                    "option": opt.get("option"),
-                    "count": opt.get("count"),
-                    "percentage": _to_percent_string(opt.get("pct", 0))
-                }
-                for opt in results
-            ]
-
-            qs.append({
-                "question": qtext,
-                "results": formatted_results
-            })
-
-        grouped.append({
-            "title": sec["title"],
-            "questions": qs
-        })
 
     # pdf_bytes = generate_survey_pdf(sim, grouped, personas_list, objective)
     pdf_bytes = await generate_md_report(exploration_id,sim.id,personas_list)
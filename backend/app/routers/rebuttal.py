@@ -1,10 +1,12 @@
 # app/routers/rebuttal.py
+import json
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi.responses import StreamingResponse
 from app.schemas.rebuttal import (
     SectionOut, RebuttalStartRequest, RebuttalStartOut,
     RebuttalReplyRequest, RebuttalReplyOut, RebuttalSessionOut,
-    RebuttalSessionListItem
+    RebuttalSessionListItem, RebuttalPersonaRepliesOut
 )
 from app.routers.auth_dependencies import get_current_active_user
 from app.models.user import User
@@ -13,6 +15,9 @@ from app.services.rebuttal import (
     list_questionnaire_sections,
     start_rebuttal_session,
     reply_rebuttal_session,
+    reply_rebuttal_session_per_persona,
+    stream_rebuttal_persona_replies,
+    get_rebuttal_context,
     get_rebuttal_session,
     list_rebuttal_sessions
 )
@@ -88,6 +93,42 @@ async def reply_rebuttal_api(payload: RebuttalReplyRequest = Body(...), current_
     )
 
 
+@router.post("/reply/personas", response_model=RebuttalPersonaRepliesOut)
+async def reply_rebuttal_per_persona_api(payload: RebuttalReplyRequest = Body(...), current_user: User = Depends(get_current_active_user)):
+    """Each persona of the session answers individually; replies are generated in parallel."""
+    try:
+        out = await reply_rebuttal_session_per_persona(payload.session_id, payload.user_message, current_user.id)
+    except ValueError as e:
+        raise HTTPException(404, str(e))
+    except Exception as e:
+        raise HTTPException(500, str(e))
+
+    return RebuttalPersonaRepliesOut(**out)
+
+
+@router.post("/reply/stream")
+async def stream_rebuttal_reply_api(payload: RebuttalReplyRequest = Body(...), current_user: User = Depends(get_current_active_user)):
+    """
+    Server-sent events: one `reply` event per persona as soon as it is ready,
+    then a final `done` event once the round has been saved.
+    """
+    # Resolve the context up front so a missing session is still a plain 404.
+    try:
+        await get_rebuttal_context(payload.session_id)
+    except ValueError as e:
+        raise HTTPException(404, str(e))
+
+    async def event_stream():
+        try:
+            async for reply in stream_rebuttal_persona_replies(payload.session_id, payload.user_message, current_user.id):
+                yield f"event: reply\ndata: {json.dumps(reply, default=str)}\n\n"
+            yield f"event: done\ndata: {json.dumps({'session_id': payload.session_id})}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'message': str(e)})}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/sessions", response_model=list[RebuttalSessionListItem])
 async def list_sessions(
     workspace_id: str, 
@@ -5,7 +5,7 @@ from app.services import traceability as svc
 from app.services.exploration import get_exploration
 from app.models.user import User
 from app.routers.auth_dependencies import get_current_active_user
-from app.services.traceability_report import get_traceability_reports, get_existing_traceability_report, get_exploration_method_flags, upsert_traceability_report
+from app.services.traceability_report import generate_traceability_reports, get_exploration_method_flags
 from app.schemas.response import SuccessResponse
 
 router = APIRouter(
@@ -13,9 +13,6 @@ router = APIRouter(
     tags=["Traceability"]
 )
 
-def is_missing(data: dict | None) -> bool:
-    return data is None or data == {}
-
 @router.get("/")
 async def get_traceability(
     exploration_id: str,
@@ -26,86 +23,20 @@ async def get_traceability(
             exploration_id
         )
 
-        existing = await get_existing_traceability_report(exploration_id)
-
-        # -------------------------
-        # CASE 1: No record at all
-        # -------------------------
-        if not existing:
-            data = await get_traceability_reports(
-                exploration_id=exploration_id,
-                is_quant=is_quantitative,
-                is_qual=is_qualitative
-            )
-
-            await upsert_traceability_report(
-                exploration_id=exploration_id,
-                ro=data["ro_traceability"],
-                persona=data["persona_traceability"],
-                quant=data["quant_traceability"],
-                qual=data["qual_traceability"],
-            )
-
-            return SuccessResponse(
-                message="Traceability Reports",
-                data={
-                    "is_quantitative": is_quantitative,
-                    "is_qualitative": is_qualitative,
-                    **data,
-                },
-            )
-
-        # -------------------------
-        # CASE 2: Partial missing
-        # -------------------------
-        need_quant = is_missing(existing.quant_traceability)
-        need_qual = is_missing(existing.qual_traceability)
-
-        if need_quant or need_qual:
-            data = await get_traceability_reports(
-                exploration_id=exploration_id,
-                is_quant=need_quant,
-                is_qual=need_qual
-            )
-
-            await upsert_traceability_report(
-                exploration_id=exploration_id,
-                quant=data["quant_traceability"] if need_quant else None,
-                qual=data["qual_traceability"] if need_qual else None,
-            )
-
-            return SuccessResponse(
-                message="Traceability Reports",
-                data={
-                    "is_quantitative": is_quantitative,
-                    "is_qualitative": is_qualitative,
-                    "ro_traceability": existing.ro_traceability,
-                    "persona_traceability": existing.persona_traceability,
-                    "quant_traceability": (
-                        data["quant_traceability"]
-                        if need_quant
-                        else existing.quant_traceability
-                    ),
-                    "qual_traceability": (
-                        data["qual_traceability"]
-                        if need_qual
-                        else existing.qual_traceability
-                    ),
-                },
-            )
-
-        # -------------------------
-        # CASE 3: Everything exists
-        # -------------------------
+        # Only layers whose input fingerprints changed (or that were never
+        # generated) are recomputed; everything else comes back from the row.
+        data = await generate_traceability_reports(
+            exploration_id=exploration_id,
+            is_quant=is_quantitative,
+            is_qual=is_qualitative
+        )
+
         return SuccessResponse(
             message="Traceability Reports",
             data={
                 "is_quantitative": is_quantitative,
                 "is_qualitative": is_qualitative,
-                "ro_traceability": existing.ro_traceability,
-                "persona_traceability": existing.persona_traceability,
-                "quant_traceability": existing.quant_traceability,
-                "qual_traceability": existing.qual_traceability,
+                **data,
             },
         )
 
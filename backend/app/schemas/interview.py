@@ -4,8 +4,14 @@ from datetime import datetime
 
 class InterviewCreate(BaseModel):
     persona_id: Optional[str] = None
+    # return immediately and generate in the background (poll /progress or /stream)
+    background: bool = False
     # extra_questions: List[str] = Field(default_factory=list)
 
+class InterviewBatchCreate(BaseModel):
+    # None interviews every persona of the exploration
+    persona_ids: Optional[List[str]] = None
+
 class MessageIn(BaseModel):
     role: str = Field(..., pattern=r"^(user|persona|system|other)$")
     text: str
@@ -26,6 +32,8 @@ class InterviewOut(BaseModel):
     generated_answers: Dict[str, Any] = Field(default_factory=dict)
     created_by: str
     created_at: datetime
+    generation_status: Optional[str] = None
+    generation_progress: Optional[Dict[str, Any]] = None
 
     class Config:
         from_attributes = True
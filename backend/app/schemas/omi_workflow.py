@@ -1,5 +1,5 @@
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel
+from typing import Optional, Dict, Any, List, Union
+from pydantic import BaseModel, ConfigDict
 from app.models.omi import OmiState
 from app.models.omi import WorkflowStage
 
@@ -11,11 +11,18 @@ class OmiWorkflowEventIn(BaseModel):
     payload: Dict[str, Any]  # event-specific data
 
 
+class OmiWorkflowBatchIn(BaseModel):
+    events: List[OmiWorkflowEventIn]
+
+
 class OmiWorkflowResponse(BaseModel):
+    # Frozen: payload-independent responses are built once and shared.
+    model_config = ConfigDict(frozen=True)
+
     message: str
     omi_state: OmiState
     visual_state: str        # "notepad" | "typing" | "idle"
-    cta: Optional[str] = None
+    cta: Optional[Union[str, List[str]]] = None
     next_expected_event: Optional[str] = None
     tips: Optional[List[str]] = None
     warnings: Optional[List[str]] = None
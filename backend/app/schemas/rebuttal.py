@@ -41,6 +41,18 @@ class RebuttalReplyOut(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
+class RebuttalPersonaReply(BaseModel):
+    persona_id: Optional[str] = None
+    persona_name: Optional[str] = None
+    llm_response: str
+    metadata: Optional[Dict[str, Any]] = None
+
+
+class RebuttalPersonaRepliesOut(BaseModel):
+    session_id: str
+    replies: List[RebuttalPersonaReply] = []
+
+
 class RebuttalSessionOut(BaseModel):
     id: str
     workspace_id: str
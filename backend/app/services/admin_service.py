@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from app.models.user import User
 from app.models.persona import Persona
+from app.models.llm_usage import LLMUsage
 from app.models.exploration import Exploration
 from datetime import date
 from app.models.workspace import Workspace
@@ -665,3 +666,63 @@ async def get_user_dashboard(
         }
     }
 
+
+
+LLM_USAGE_BUCKETS = ("hour", "day", "week")
+
+
+async def llm_usage_summary(
+    session: AsyncSession,
+    start_dt: datetime,
+    end_dt: datetime,
+    bucket: str | None = None,
+    workspace_id: str | None = None,
+):
+    """
+    Aggregates the LLM usage ledger by call site and model (and optionally by
+    time bucket), most expensive call sites first.
+    """
+    filters = [LLMUsage.created_at >= start_dt, LLMUsage.created_at <= end_dt]
+    if workspace_id:
+        filters.append(LLMUsage.workspace_id == workspace_id)
+
+    group_cols = [LLMUsage.call_site, LLMUsage.model]
+    bucket_col = None
+    if bucket:
+        bucket_col = func.date_trunc(bucket, LLMUsage.created_at).label("bucket")
+        group_cols.insert(0, bucket_col)
+
+    total_tokens = func.sum(LLMUsage.prompt_tokens + LLMUsage.completion_tokens)
+    stmt = (
+        select(
+            *group_cols,
+            func.count(LLMUsage.id).label("calls"),
+            func.sum(case((LLMUsage.retries > 0, 1), else_=0)).label("retried_calls"),
+            func.sum(case((and_(LLMUsage.status.is_not(None), LLMUsage.status < 400), 0), else_=1)).label("errors"),
+            func.sum(LLMUsage.prompt_tokens).label("prompt_tokens"),
+            func.sum(LLMUsage.completion_tokens).label("completion_tokens"),
+            func.sum(LLMUsage.cached_tokens).label("cached_tokens"),
+            total_tokens.label("total_tokens"),
+            func.sum(LLMUsage.latency_ms).label("total_latency_ms"),
+            func.avg(LLMUsage.latency_ms).label("avg_latency_ms"),
+            func.percentile_cont(0.5).within_group(LLMUsage.latency_ms).label("p50_latency_ms"),
+            func.percentile_cont(0.95).within_group(LLMUsage.latency_ms).label("p95_latency_ms"),
+        )
+        .where(*filters)
+        .group_by(*group_cols)
+        .order_by(*([bucket_col] if bucket_col is not None else []), total_tokens.desc())
+    )
+
+    rows = (await session.execute(stmt)).mappings().all()
+
+    result = []
+    for row in rows:
+        item = dict(row)
+        if bucket_col is not None:
+            item["bucket"] = item["bucket"].isoformat() if item["bucket"] else None
+        for key in ("avg_latency_ms", "p50_latency_ms", "p95_latency_ms", "total_latency_ms"):
+            item[key] = round(float(item[key] or 0), 1)
+        prompt = item["prompt_tokens"] or 0
+        item["cache_hit_ratio"] = round((item["cached_tokens"] or 0) / prompt, 3) if prompt else 0.0
+        result.append(item)
+    return result
@@ -5,7 +5,6 @@ import uuid
 from collections import Counter
 from datetime import datetime
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
 from openai import OpenAI
 from sqlalchemy import (
     MetaData,
@@ -27,13 +26,16 @@ from urllib.parse import urlparse
 
 from app.db import async_engine
 from app.models.persona import Persona
+from app.services.persona_derivatives import schedule_persona_derivatives
 from app.utils.id_generator import generate_id
+from app.utils.llm_clients import async_openai_client
+from app.utils.tracing import traced
 from types import SimpleNamespace
 
 
 load_dotenv()
 
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = async_openai_client()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 async def get_interviews_by_exploration_id(
@@ -220,6 +222,7 @@ async def get_section_description_by_question_id(question_id: str):
     return section_description, section_id, question_text, all_question_texts
 
 
+@traced()
 async def ai_generate_persona(exploration_id, workspace_id, current_user_id):
     description = await get_description(exploration_id)
     mandatory_field_names = """
@@ -1105,6 +1108,8 @@ async def ai_generate_persona(exploration_id, workspace_id, current_user_id):
                 await session.commit()
                 await session.refresh(p)
 
+            schedule_persona_derivatives(persona_id)
+
             response["personas"].append(
                 {
                     "id": persona["id"],
@@ -1119,14 +1124,17 @@ async def ai_generate_persona(exploration_id, workspace_id, current_user_id):
 
 
 async def validate_new_question_against_theme(section_id, payload):
-    exploration_id = payload.exploration_id
-    user_question = payload.text
-
     existing_questions, theme_description = (
         await get_all_questions_by_section_id(section_id)
     )
-    research_objective_description = await get_description(exploration_id)
+    research_objective_description = await get_description(payload.exploration_id)
+
+    return await llm_validate_new_question(
+        research_objective_description, theme_description, existing_questions, payload.text
+    )
+
 
+async def llm_validate_new_question(research_objective_description, theme_description, existing_questions, user_question):
     adding_question_validator_prompt = f"""
 You are a qualitative research question validator.
 
@@ -1206,14 +1214,17 @@ Mark as **invalid** if the question:
     return valid_or_not, validation_reason
 
 async def validate_existing_question(question_id, payload):
-    exploration_id = payload.exploration_id
-    modified_question = payload.text
-
     theme_description, section_id, question_text, existing_questions = (
         await get_section_description_by_question_id(question_id)
     )
-    research_objective_description = await get_description(exploration_id)
+    research_objective_description = await get_description(payload.exploration_id)
 
+    return await llm_validate_question_edit(
+        research_objective_description, theme_description, question_text, payload.text
+    )
+
+
+async def llm_validate_question_edit(research_objective_description, theme_description, question_text, modified_question):
     modify_existing_question_in_prompt = f"""
 You are a qualitative research question validator.
 
@@ -1291,14 +1302,17 @@ Mark as **invalid** if the modification:
 
 
 async def validate_deleted_question(question_id, payload):
-    exploration_id = payload.exploration_id
-
     theme_description, section_id, question_text, existing_questions = (
         await get_section_description_by_question_id(question_id)
     )
-    research_objective_description = await get_description(exploration_id)
+    research_objective_description = await get_description(payload.exploration_id)
+
+    return await llm_validate_question_delete(
+        research_objective_description, theme_description, existing_questions, question_text
+    )
 
 
+async def llm_validate_question_delete(research_objective_description, theme_description, existing_questions, question_text):
     delete_the_existing_question_in_prompt = f"""
 You are a qualitative research design validator.
 
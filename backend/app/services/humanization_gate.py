@@ -0,0 +1,103 @@
+"""
+Quality gate in front of the second-pass "humanization" call.
+
+Raw persona answers already carry quality_score, independence_score and
+authenticity_markers. Answers that clear every threshold are used as-is; only
+the rest are sent (batched) to the enhancement pass. Counters kept here back
+the skip-rate / latency-saved numbers exposed on the admin metrics endpoint.
+"""
+from threading import Lock
+from typing import Any, Dict, List, Tuple
+
+from app.config import (
+    HUMANIZATION_GATE_ENABLED,
+    HUMANIZATION_MIN_QUALITY,
+    HUMANIZATION_MIN_INDEPENDENCE,
+    HUMANIZATION_MIN_AUTHENTICITY_MARKERS,
+)
+
+
+def _score(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def passes_quality_gate(answer: Dict[str, Any]) -> bool:
+    """True when a raw answer is good enough to skip humanization."""
+    if not HUMANIZATION_GATE_ENABLED:
+        return False
+    if not (answer.get("persona_answer") or "").strip():
+        return False
+    markers = answer.get("authenticity_markers") or []
+    return (
+        _score(answer.get("quality_score")) >= HUMANIZATION_MIN_QUALITY
+        and _score(answer.get("independence_score")) >= HUMANIZATION_MIN_INDEPENDENCE
+        and len(markers) >= HUMANIZATION_MIN_AUTHENTICITY_MARKERS
+    )
+
+
+def split_by_quality(answers: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """(answers that pass the gate, answers that need the enhancement pass)"""
+    passed, needs = [], []
+    for a in answers:
+        (passed if passes_quality_gate(a) else needs).append(a)
+    return passed, needs
+
+
+class HumanizationMetrics:
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.answers_total = 0
+        self.answers_skipped = 0
+        self.enhancement_calls = 0
+        self.enhancement_calls_avoided = 0
+        self.enhanced_answers = 0
+        self.enhancement_seconds = 0.0
+        # skipped answers whose batch still needed a (smaller) call
+        self.answers_skipped_in_called_batches = 0
+
+    def record(self, total: int, skipped: int, enhanced: int, seconds: float, called: bool) -> None:
+        with self._lock:
+            self.answers_total += total
+            self.answers_skipped += skipped
+            self.enhanced_answers += enhanced
+            self.enhancement_seconds += seconds
+            if called:
+                self.enhancement_calls += 1
+                self.answers_skipped_in_called_batches += skipped
+            elif total:
+                self.enhancement_calls_avoided += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            per_answer = self.enhancement_seconds / self.enhanced_answers if self.enhanced_answers else None
+            per_call = self.enhancement_seconds / self.enhancement_calls if self.enhancement_calls else None
+            return {
+                "gate_enabled": HUMANIZATION_GATE_ENABLED,
+                "thresholds": {
+                    "quality_score": HUMANIZATION_MIN_QUALITY,
+                    "independence_score": HUMANIZATION_MIN_INDEPENDENCE,
+                    "authenticity_markers": HUMANIZATION_MIN_AUTHENTICITY_MARKERS,
+                },
+                "answers_total": self.answers_total,
+                "answers_skipped": self.answers_skipped,
+                "skip_rate": round(self.answers_skipped / self.answers_total, 4) if self.answers_total else 0.0,
+                "enhancement_calls": self.enhancement_calls,
+                "enhancement_calls_avoided": self.enhancement_calls_avoided,
+                "avg_enhancement_call_seconds": round(per_call, 3) if per_call is not None else None,
+                # a fully skipped batch saves a whole call; a partially skipped one
+                # saves the per-answer share of the answers it dropped
+                "estimated_seconds_saved": round(
+                    self.enhancement_calls_avoided * (per_call or 0.0)
+                    + self.answers_skipped_in_called_batches * (per_answer or 0.0),
+                    3
+                ),
+            }
+
+
+humanization_metrics = HumanizationMetrics()
@@ -1,16 +1,19 @@
 import json
 import re
-from typing import List, Optional, Dict, Any
+import time
+from typing import List, Optional, Dict
 from datetime import datetime
 from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db import async_engine
 from app.models.interview import Interview, InterviewFile, InterviewSection, InterviewQuestion
 from app.schemas.interview import InterviewOut
-from app.utils.id_generator import generate_id
-from app.config import OPENAI_API_KEY
-from openai import AsyncOpenAI
-from app.services.persona import get_persona, list_personas
+from app.utils.llm_clients import async_openai_client
+from app.services.persona import list_personas
+from app.services.persona_context import get_persona_prompt_block
+from app.services import interview_generation
+from app.services.question_validation import invalidate_section
+from app.services.humanization_gate import humanization_metrics, passes_quality_gate
 from app.services.exploration import get_exploration
 from app.utils.interview import generate_interview_pdf, generate_combined_interviews_pdf
 from typing import Iterable
@@ -20,7 +23,7 @@ from app.services import persona as persona_service
 from app.services.auto_generated_persona import get_description
 
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+client = async_openai_client()
 
 
 def _map_interview_row_to_out(i: Interview) -> InterviewOut:
@@ -32,17 +35,11 @@ def _map_interview_row_to_out(i: Interview) -> InterviewOut:
         messages=i.messages or [],
         generated_answers=i.generated_answers or {},
         created_by=str(i.created_by),
-        created_at=i.created_at
+        created_at=i.created_at,
+        generation_status=i.generation_status,
+        generation_progress=i.generation_progress
     )
 
-def _safe_json(obj: Any) -> str:
-    def _default(o):
-        if isinstance(o, datetime):
-            return o.isoformat()
-        return str(o)
-    return json.dumps(obj, indent=2, default=_default)
-
-
 async def create_interview_section(
     workspace_id: str,
     exploration_id: str,
@@ -88,6 +85,7 @@ async def create_interview_question(
         session.add(question)
         await session.commit()
         await session.refresh(question)
+        invalidate_section(section_id)
         
         return {
             "id": question.id,
@@ -177,6 +175,7 @@ async def delete_interview_section(section_id: str) -> bool:
         
         await session.delete(section)
         await session.commit()
+        invalidate_section(section_id)
         return True
 
 async def delete_interview_question(question_id: str) -> bool:
@@ -189,8 +188,10 @@ async def delete_interview_question(question_id: str) -> bool:
         if not question:
             return False
         
+        section_id = question.section_id
         await session.delete(question)
         await session.commit()
+        invalidate_section(section_id)
         return True
 
 async def update_interview_section(section_id: str, title: str) -> Optional[Dict]:
@@ -231,6 +232,7 @@ async def update_interview_question(question_id: str, text: str) -> Optional[Dic
         session.add(question)
         await session.commit()
         await session.refresh(question)
+        invalidate_section(question.section_id)
         
         return {
             "id": question.id,
@@ -1038,45 +1040,143 @@ async def start_interview(
     persona_id: Optional[str],
     user_id: str,
     guide_sections: List[Dict],
+    background: bool = False,
 ) -> InterviewOut:
-    questions_grouped = []
-    for s in guide_sections:
-        title = s.get("title")
-        qs = list(s.get("questions", []) or [])
-        questions_grouped.append({"title": title, "questions": qs})
+    """
+    Generates persona answers for the whole guide, one LLM call per section
+    (see services/interview_generation.py). With background=True the row is
+    returned immediately with generation_status "running" and filled in as
+    sections finish; otherwise this waits for the full interview, and a
+    generation where any section failed raises and leaves no row behind.
+    """
+    iv, run = await interview_generation.create_interview_run(
+        workspace_id, exploration_id, persona_id, user_id, guide_sections
+    )
+    if background:
+        interview_generation.schedule_interview_run(run)
+        return _map_interview_row_to_out(iv)
 
-    flat_questions = []
-    for sec in questions_grouped:
-        for q in sec["questions"]:
-            flat_questions.append({"section": sec["title"], "question": q})
+    iv = await interview_generation.execute_interview_run(run)
+    if run.status != interview_generation.STATUS_COMPLETED:
+        await interview_generation.discard_interview_run(run.interview_id)
+        raise run.error or RuntimeError(f"Interview generation failed for persona {persona_id}")
+    return _map_interview_row_to_out(iv)
 
-    persona_obj = await get_persona(persona_id) if persona_id else None
-    persona_json = _safe_json(persona_obj) if persona_obj else "{}"
 
 
-#     prompt = f"""
-# You are role-playing as a research persona. Answer the following questions in FIRST PERSON (2-4 sentences each).
-# Also provide 1-2 short implications (insights) per question that a researcher can act on.
+async def add_interview_message(
+    interview_id: str, 
+    role: str, 
+    text: str, 
+    meta: Optional[dict] = None
+) -> Optional[InterviewOut]:
+    """Add a single message to interview (for non-user messages or when no persona)"""
+    async with AsyncSession(async_engine) as session:
+        query = select(Interview).where(Interview.id == interview_id)
+        res = await session.execute(query)
+        iv = res.scalars().first()
+        if not iv:
+            return None
+        iv.messages.append({
+            "role": role, 
+            "text": text, 
+            "meta": meta or {}, 
+            "ts": datetime.utcnow().isoformat()
+        })
+        session.add(iv)
+        await session.commit()
+        await session.refresh(iv)
+        return _map_interview_row_to_out(iv)
+
+
+async def add_user_message_and_get_persona_reply(
+    interview_id: str, 
+    user_text: str, 
+    meta: Optional[dict] = None
+) -> Optional[InterviewOut]:
+    """
+    Add user message and generate persona reply in a single transaction.
+    This ensures both messages are saved together atomically.
+    """
+    from sqlalchemy.orm.attributes import flag_modified
+    
+    async with AsyncSession(async_engine) as session:
+        query = select(Interview).where(Interview.id == interview_id)
+        res = await session.execute(query)
+        iv = res.scalars().first()
+        
+        if not iv:
+            return None
+        
+        user_msg = {
+            "role": "user", 
+            "text": user_text, 
+            "meta": meta or {}, 
+            "ts": datetime.utcnow().isoformat()
+        }
+        iv.messages.append(user_msg)
+        
+        if iv.persona_id:
+            persona_json = await get_persona_prompt_block(iv.persona_id) or "{}"
+            
+            conversation_history = ""
+            if len(iv.messages) > 1:
+                recent_messages = iv.messages[-6:]
+                history_lines = []
+                for msg in recent_messages:
+                    role = msg.get("role", "")
+                    text = msg.get("text", "")
+                    if role == "user":
+                        history_lines.append(f"Interviewer: {text}")
+                    elif role == "persona":
+                        history_lines.append(f"You: {text}")
+                conversation_history = "\n".join(history_lines)
+            
+            from app.services.exploration import get_exploration
+            research_context = ""
+            try:
+                async with AsyncSession(async_engine) as exp_session:
+                    exploration = await get_exploration(exp_session, iv.exploration_id)
+                    if exploration and exploration.description:
+                        research_context = exploration.description
+            except Exception:
+                pass
+            
+#             prompt = f"""
+# You are role-playing as this persona in FIRST-PERSON for an in-depth interview.
 #
-# PERSONA:
+# PERSONA DETAILS (this is YOU):
 # {persona_json}
 #
-# QUESTIONS:
-# {json.dumps(flat_questions, indent=2)}
+# RESEARCH OBJECTIVE:
+# {research_context or "Understanding user perspectives and experiences"}
+#
+# CONVERSATION SO FAR:
+# {conversation_history or "This is the start of the interview."}
+#
+# CURRENT QUESTION:
+# {user_text}
+#
+# INSTRUCTIONS:
+# - Answer in FIRST-PERSON using "I", "my", "me"
+# - Give SPECIFIC, DETAILED answers based on YOUR persona traits, not generic responses
+# - Reference your actual characteristics: age, occupation, lifestyle, values, experiences
+# - If asked about preferences, explain WHY based on your personality and background
+# - If asked about experiences, create realistic examples that fit your persona
+# - Keep responses conversational and natural (2-4 sentences)
+# - Stay consistent with what you've said earlier in the conversation
+# - Be authentic to your persona's demographics, psychographics, and backstory
+#
+# EXAMPLES OF GOOD ANSWERS:
+# Generic: "I like quality products."
+# Specific: "As a 32-year-old environmental consultant, I prioritize sustainable products. I recently switched to a reusable water bottle brand that uses recycled materials - it costs more, but aligns with my values."
+#
+# Generic: "I use social media sometimes."
+# Specific: "I'm on Instagram daily, mainly following eco-friendly brands and sustainability influencers. LinkedIn is where I network professionally, but I avoid Facebook - too much noise for my taste."
 #
-# Return strict JSON:
-# {{
-#  "answers": [
-#    {{
-#      "question": "<q>",
-#      "persona_answer": "<answer>",
-#      "implications": ["implication 1", "implication 2"]
-#    }}
-#  ]
-# }}
+# Reply briefly (2-4 sentences) in first-person as this persona:
 # """
-
-    prompt = f"""
+            prompt = f"""
 **ROLE**
 You are the Qualitative Research Simulation Engine within Synthetic People AI—an intelligent response generation and deep-probe system specifically designed for qualitative research studies that:
 •	Executes open-ended questionnaires through synthetic personas
@@ -1101,8 +1201,11 @@ You ARE:
 **PERSONA:**
 {persona_json}
 
-**QUESTIONS:**
-{json.dumps(flat_questions, indent=2)}
+**CONVERSATION HISTORY:**
+{conversation_history}
+
+**CURRENT QUESTION:**
+{user_text}
 
 **PRIMARY MISSION**
 Execute qualitative research simulations that produce:
@@ -1394,57 +1497,33 @@ Every qualitative simulation execution must:
 •	✅ Capture stance indicators and independence metrics
 •	✅ Validate response diversity and authentic disagreement
 
-**quality_score (0-1): Conversational depth, specificity, emotional resonance**
-–	0.9+: Exceptional insight, highly quotable
-–	0.75-0.89: Strong response, good for themes
-–	0.70-0.74: Adequate but generic
-–	<0.70: Likely unusable (filter out)
-
-**independence_score (0-1): How much the response reflects original thinking vs. prompt echo**
-–	0.85+: High independence (prioritize these)
-–	0.70-0.84: Moderate independence
-–	<0.70: Potential groupthink or prompt bias
-
-**stance_indicators: Tags like “agreement”, “skepticism”, “ambivalence”, “contradiction”**
-**behavioral_signals (NEW): Detects say-do gaps, contradictions, hidden drivers**
-
-
-**OUTPUT JSON FORMAT**
-You should provide the output in the JSON Format.
-
-Example Output:
+**OUTPUT FORMAT JSON**
 {{
- "answers": [
-   {{
-    "question": "<q>",
-    "persona_answer": "<answer>",
-    "implications": ["implication 1", "implication 2"],
-    "quality_score": 0.87,
-    "independence_score": 0.82,
-    "authenticity_markers": ["price sensitivity", "humor", "economic context"],
-    "stance_indicators": ["skepticism", "pragmatism"],
-    "behavioral_signals": {{
-        "stated_value": "affordability",
-        "actual_behavior": "avoids premium even when affordable",
-        "contradiction_detected": true,
-        "hidden_driver": "fear_of_regret"
-      }}
-   }}
- ]
+  "persona_answer": "<Exact Persona Reply for the user's current question, No extra or additional content.>",
+  "quality_score": 0.0,
+  "independence_score": 0.0,
+  "authenticity_markers": ["..."]
 }}
 """
-    res = await client.chat.completions.create(
-        model="gpt-4o-mini",
-        response_format={"type":"json_object"},
-        messages=[
-            {"role":"system","content":"You are a persona respondent. Be concise and realistic."},
-            {"role":"user","content":prompt}],
-    )
-    raw = res.choices[0].message.content
-    raw_data = raw if isinstance(raw, (dict, list)) else json.loads(raw)
-
+            res_ai = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                response_format={"type": "json_object"},
+                messages=[
+                    {"role": "system", "content": "You are an expert at role-playing personas authentically. Always give specific, trait-based answers, never generic responses."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.8
+            )
+            raw_reply = res_ai.choices[0].message.content.strip()
+            try:
+                raw_answer = json.loads(raw_reply)
+            except (json.JSONDecodeError, TypeError):
+                raw_answer = {"persona_answer": raw_reply}
+            if not isinstance(raw_answer, dict):
+                raw_answer = {"persona_answer": raw_reply}
+            persona_reply = raw_answer.get("persona_answer") or raw_reply
 
-    enhancement_prompt = f"""
+            enhancement_prompt = f"""
 ROLE
 You are a Qualitative Response Humanization Engine operating within Synthetic People AI.
 You should analyze all the inputs with provided instructions and provide answers for all the questions which is given in the Raw_Persona_Output. 
@@ -1459,8 +1538,14 @@ You are given:
 **PERSONA:**
 {persona_json}
 
+**CONVERSATION HISTORY:**
+{conversation_history}
+
+**CURRENT QUESTION:**
+{user_text}
+
 **persona_responses:**
-{raw}
+{persona_reply}
 
 DATA PROCESSING PROTOCOL
 STEP 1: Initial Parse & Quality Filter
@@ -1987,13 +2072,10 @@ If not, refine.
 Perform ALL behavioral depth and decision intelligence analysis internally.
 
 BASED ON YOUR INTERNAL ANALYSIS ONLY:
-Generate FINAL persona answers for ALL questions that sounds like a real human speaking in an interview in the revised_persona_answer with 3 to 4 sentences in detail.
+Generate FINAL persona answers for CURRENT question, that sounds like a real human speaking in an interview with 3 to 4 sentences in detail.
 
 EXECUTION RULE (CRITICAL – DO NOT SKIP)
 
-You MUST process ALL items inside:
-persona_responses.answers[]
-
 FOR EACH item in persona_responses.answers[]:
 1. Read the question
 2. Read the corresponding persona_answer
@@ -2006,1101 +2088,32 @@ Do NOT stop after the first question.
 Do NOT merge multiple questions into one answer.
 The number of output answers MUST EXACTLY match the number of input answers.
 
-FINAL OUTPUT (STRICT JSON):
+**OUTPUT FORMAT JSON**
+
 {{
-  "answers": [
-    {{
-      "question": "...Q1...",
-      "revised_persona_answer": "...",
-      "implications": [...]
-    }},
-    {{
-      "question": "...Q2...",
-      "revised_persona_answer": "...",
-      "implications": [...]
-    }}
-    // ... up to Q10
-  ]
+response : Exact Refined Persona Reply based on the behavioural depth and the above instructions for the user's current question, No extra or additional content.
 }}
 """
-    enhance_res = await client.chat.completions.create(
-        model="gpt-4o-mini",
-        response_format={"type": "json_object"},
-        messages=[
-            {"role": "system", "content": "You are a persona respondent. Be concise and realistic."},
-            {"role": "user", "content": enhancement_prompt}],
-    )
-    enhance_raw = enhance_res.choices[0].message.content
-
-    data = enhance_raw if isinstance(enhance_raw, (dict, list)) else json.loads(enhance_raw)
-    answers = data.get("answers", [])
-
-    gen_map = {}
-    for a in answers:
-        qtext = a.get("question", "")
-        gen_map[qtext] = {
-            "persona_answer": a.get("revised_persona_answer", ""),
-            "implications": a.get("implications", []),
-            "persona_id": persona_id,
-            "all_info": data,
-            "all_info_raw": raw_data
-        }
-
-    messages = []
-    messages.append({"role": "system", "text": "Interview started", "ts": datetime.utcnow().isoformat()})
-    for q in flat_questions:
-        qtext = q["question"]
-        messages.append({"role": "user", "text": qtext, "meta": {"section": q["section"]}, "ts": datetime.utcnow().isoformat()})
-        pa = gen_map.get(qtext, {}).get("persona_answer", "")
-        all_info = gen_map.get(qtext, {}).get("all_info", "")
-        all_info_raw = gen_map.get(qtext, {}).get("all_info_raw", "")
-        messages.append({"role": "persona", "text": pa, "meta": {"question": qtext, "section": q["section"]}, "ts": datetime.utcnow().isoformat(), "all_info": all_info, "all_info_raw": all_info_raw})
-
-    async with AsyncSession(async_engine) as session:
-        iv = Interview(
-            id=generate_id(),
-            workspace_id=workspace_id,
-            exploration_id=exploration_id,
-            persona_id=persona_id,
-            messages=messages,
-            generated_answers=gen_map,
-            created_by=user_id
-        )
-        session.add(iv)
-        await session.commit()
-        await session.refresh(iv)
-        return _map_interview_row_to_out(iv)
-
-
-async def add_interview_message(
-    interview_id: str, 
-    role: str, 
-    text: str, 
-    meta: Optional[dict] = None
-) -> Optional[InterviewOut]:
-    """Add a single message to interview (for non-user messages or when no persona)"""
-    async with AsyncSession(async_engine) as session:
-        query = select(Interview).where(Interview.id == interview_id)
-        res = await session.execute(query)
-        iv = res.scalars().first()
-        if not iv:
-            return None
-        iv.messages.append({
-            "role": role, 
-            "text": text, 
-            "meta": meta or {}, 
-            "ts": datetime.utcnow().isoformat()
-        })
-        session.add(iv)
-        await session.commit()
-        await session.refresh(iv)
-        return _map_interview_row_to_out(iv)
-
+            if passes_quality_gate(raw_answer):
+                # Raw reply already clears the quality gate: skip the second pass.
+                enhance_raw = persona_reply
+                humanization_metrics.record(total=1, skipped=1, enhanced=0, seconds=0.0, called=False)
+            else:
+                started = time.perf_counter()
+                enhance_res = await client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    response_format={"type": "json_object"},
+                    messages=[
+                        {"role": "system", "content": "You are a persona respondent. Be concise and realistic."},
+                        {"role": "user", "content": enhancement_prompt}],
+                )
+                humanization_metrics.record(
+                    total=1, skipped=0, enhanced=1, seconds=time.perf_counter() - started, called=True
+                )
+                enhance_raw = enhance_res.choices[0].message.content
+                raw_data = enhance_raw if isinstance(enhance_raw, (dict, list)) else json.loads(enhance_raw)
+                enhance_raw = raw_data.get("response", "") or persona_reply
 
-async def add_user_message_and_get_persona_reply(
-    interview_id: str, 
-    user_text: str, 
-    meta: Optional[dict] = None
-) -> Optional[InterviewOut]:
-    """
-    Add user message and generate persona reply in a single transaction.
-    This ensures both messages are saved together atomically.
-    """
-    from sqlalchemy.orm.attributes import flag_modified
-    
-    async with AsyncSession(async_engine) as session:
-        query = select(Interview).where(Interview.id == interview_id)
-        res = await session.execute(query)
-        iv = res.scalars().first()
-        
-        if not iv:
-            return None
-        
-        user_msg = {
-            "role": "user", 
-            "text": user_text, 
-            "meta": meta or {}, 
-            "ts": datetime.utcnow().isoformat()
-        }
-        iv.messages.append(user_msg)
-        
-        if iv.persona_id:
-            persona_obj = await get_persona(iv.persona_id)
-            persona_json = _safe_json(persona_obj) if persona_obj else "{}"
-            
-            conversation_history = ""
-            if len(iv.messages) > 1:
-                recent_messages = iv.messages[-6:]
-                history_lines = []
-                for msg in recent_messages:
-                    role = msg.get("role", "")
-                    text = msg.get("text", "")
-                    if role == "user":
-                        history_lines.append(f"Interviewer: {text}")
-                    elif role == "persona":
-                        history_lines.append(f"You: {text}")
-                conversation_history = "\n".join(history_lines)
-            
-            from app.services.exploration import get_exploration
-            research_context = ""
-            try:
-                async with AsyncSession(async_engine) as exp_session:
-                    exploration = await get_exploration(exp_session, iv.exploration_id)
-                    if exploration and exploration.description:
-                        research_context = exploration.description
-            except Exception:
-                pass
-            
-#             prompt = f"""
-# You are role-playing as this persona in FIRST-PERSON for an in-depth interview.
-#
-# PERSONA DETAILS (this is YOU):
-# {persona_json}
-#
-# RESEARCH OBJECTIVE:
-# {research_context or "Understanding user perspectives and experiences"}
-#
-# CONVERSATION SO FAR:
-# {conversation_history or "This is the start of the interview."}
-#
-# CURRENT QUESTION:
-# {user_text}
-#
-# INSTRUCTIONS:
-# - Answer in FIRST-PERSON using "I", "my", "me"
-# - Give SPECIFIC, DETAILED answers based on YOUR persona traits, not generic responses
-# - Reference your actual characteristics: age, occupation, lifestyle, values, experiences
-# - If asked about preferences, explain WHY based on your personality and background
-# - If asked about experiences, create realistic examples that fit your persona
-# - Keep responses conversational and natural (2-4 sentences)
-# - Stay consistent with what you've said earlier in the conversation
-# - Be authentic to your persona's demographics, psychographics, and backstory
-#
-# EXAMPLES OF GOOD ANSWERS:
-# Generic: "I like quality products."
-# Specific: "As a 32-year-old environmental consultant, I prioritize sustainable products. I recently switched to a reusable water bottle brand that uses recycled materials - it costs more, but aligns with my values."
-#
-# Generic: "I use social media sometimes."
-# Specific: "I'm on Instagram daily, mainly following eco-friendly brands and sustainability influencers. LinkedIn is where I network professionally, but I avoid Facebook - too much noise for my taste."
-#
-# Reply briefly (2-4 sentences) in first-person as this persona:
-# """
-            prompt = f"""
-**ROLE**
-You are the Qualitative Research Simulation Engine within Synthetic People AI—an intelligent response generation and deep-probe system specifically designed for qualitative research studies that:
-•	Executes open-ended questionnaires through synthetic personas
-•	Generates rich, narrative, persona-authentic responses
-•	Enables contextual follow-up probing (Rebuttal Mode)
-•	Captures thematic insights and narrative patterns
-•	Performs cross-persona comparative thematic analysis
-
-You are NOT:
-•	A random response generator
-•	A generic chatbot
-•	A survey completion tool
-•	An agreement machine that validates user assumptions
-
-You ARE:
-•	A qualitative persona simulation engine that maintains character consistency
-•	A contextual conversation manager for deep probing
-•	A thematic data architecture system that structures narrative responses
-•	A cross-persona thematic intelligence layer
-•	An independent thinker that challenges, disagrees, and maintains authentic persona perspectives
-
-**PERSONA:**
-{persona_json}
-
-**CONVERSATION HISTORY:**
-{conversation_history}
-
-**CURRENT QUESTION:**
-{user_text}
-
-**PRIMARY MISSION**
-Execute qualitative research simulations that produce:
-•	Persona-authentic narrative responses – Consistent with persona profiles, rich in detail and context
-•	Depth-on-demand – Enable unlimited follow-up probing through rebuttal mode
-•	Structured thematic data capture – Ready for qualitative analysis
-•	Cross-persona thematic insights – Automatic pattern detection across narratives
-•	Complete audit trail – Every response and conversation tracked
-•	Intellectual honesty – Personas maintain their beliefs, even when challenged
-
-**QUALITATIVE SIMULATION EXECUTION PROTOCOL**
-Study Configuration
-Study Type: Qualitative Research
-Question Format: Open-ended questions requiring narrative responses
-Response Format: Rich text narratives (30-100 words per response)
-Persona Simulation Logic
-CRITICAL: COMPLETE PERSONA COVERAGE
-### AFTER (CORRECT FOR QUALITATIVE):
-- PERSONA A = 1 UNIQUE INDIVIDUAL = 1 RESPONSE SET
-- PERSONA B = 1 UNIQUE INDIVIDUAL = 1 RESPONSE SET
-- PERSONA C = 1 UNIQUE INDIVIDUAL = 1 RESPONSE SET
-- TOTAL = 3 INTERVIEW RESPONSES
-
-## DETAILED SIMULATION PROTOCOL
-
-### FUNDAMENTAL PRINCIPLE:
-**1 PERSONA = 1 UNIQUE INDIVIDUAL = 1 SET OF RESPONSES**
-
-EACH PERSONA IN QUALITATIVE RESEARCH REPRESENTS A DISTINCT INDIVIDUAL WITH A COMPLETE PROFILE. THEY RESPOND TO THE QUESTIONNAIRE ONCE AS THEMSELVES, NOT MULTIPLE TIMES.
-
-### STEP-BY-STEP EXECUTION:
-
-#### STEP 1: SYSTEM INITIALIZATION
-A) LOAD QUESTIONNAIRE STRUCTURE
-B) LOAD ALL PERSONA PROFILES (A, B, C, ETC.)
-C) VALIDATE PERSONA COMPLETENESS
-D) INITIALIZE DATA STRUCTURES
-E) ACTIVATE QUALITY ASSURANCE PROTOCOLS
-
-#### STEP 2: SEQUENTIAL PERSONA EXECUTION
-
-**FOR PERSONA A:**
-1. ACTIVATE PERSONA CONTEXT: LOAD PERSONA A'S COMPLETE PROFILE
-2. INTERNALIZE PERSONA IDENTITY: ASSUME PERSONA A'S WORLDVIEW
-3. BEGIN QUESTIONNAIRE FLOW: START AT Q1
-4. FOR EACH QUESTION (Q1, Q2, Q3... QN):
-   A. READ QUESTION
-   B. ANALYZE PERSONA REACTION, OPINION, PERSPECTIVE
-   C. GENERATE AUTHENTIC RESPONSE (50-100 WORDS, GROUNDED IN PROFILE)
-   D. INCLUDE CONTEXTUAL DETAILS (EXAMPLES, ANECDOTES, EMOTIONS)
-   E. VALIDATE RESPONSE QUALITY (MULTI-INFERENCE CHECKS)
-   F. IF QUALITY_SCORE < 0.7: REGENERATE
-   G. IF QUALITY_SCORE ≥ 0.7: ACCEPT AND STORE
-   H. APPLY SKIP LOGIC IF APPLICABLE
-   I. PROCEED TO NEXT QUESTION
-5. COMPLETE PERSONA A INTERVIEW
-6. STORE COMPLETE RESPONSE SET (WITH METADATA)
-7. CLEAR PERSONA CONTEXT
-
-**FOR PERSONA B:**
-1. ACTIVATE PERSONA CONTEXT: LOAD PERSONA B'S PROFILE (DIFFERENT FROM A)
-2. INTERNALIZE PERSONA IDENTITY: ASSUME PERSONA B'S WORLDVIEW (NOT PERSONA A'S)
-3. EXECUTE QUESTIONNAIRE FROM PERSONA B'S PERSPECTIVE
-4. GENERATE PERSONA B-AUTHENTIC RESPONSES (MUST NOT ECHO PERSONA A)
-5. COMPLETE & STORE
-
-**FOR PERSONA C:**
-1. ACTIVATE PERSONA CONTEXT: LOAD PERSONA C'S PROFILE
-2. INTERNALIZE PERSONA IDENTITY: ASSUME PERSONA C'S UNIQUE WORLDVIEW
-3. EXECUTE QUESTIONNAIRE FROM PERSONA C'S PERSPECTIVE
-4. COMPLETE & STORE
-
-**REPEAT FOR ANY ADDITIONAL PERSONAS (D, E, F, ETC.)**
-
-#### STEP 3: CROSS-PERSONA VALIDATION & ANALYSIS
-
-AFTER ALL PERSONAS COMPLETE:
-
-A) VERIFY COMPLETE DATA MATRIX:
-   - PERSONA A × ALL QUESTIONS = COMPLETE? ✅
-   - PERSONA B × ALL QUESTIONS = COMPLETE? ✅
-   - PERSONA C × ALL QUESTIONS = COMPLETE? ✅
-   - IF ANY MISSING → FLAG ERROR
-
-B) VALIDATE PERSONA DISTINCTIVENESS:
-   - CHECK: DO RESPONSES REFLECT DIFFERENT PERSPECTIVES?
-   - FLAG: IF TOO SIMILAR → PERSONA COLLAPSE
-
-C) PERFORM THEMATIC CROSS-ANALYSIS:
-   - IDENTIFY CONSENSUS THEMES
-   - IDENTIFY DIVERGENCE POINTS
-   - IDENTIFY SENTIMENT CLUSTERS
-   - IDENTIFY NARRATIVE PATTERNS
-
-D) CALCULATE OPINION DIVERSITY INDEX:
-   - HEALTHY RANGE: 0.4 - 0.8
-   - TOO LOW (< 0.3): PERSONAS TOO SIMILAR → REGENERATE OPINION
-   - TOO HIGH (> 0.9): LACK COHERENT PATTERNS → CHECK PROFILES
-
-E) GENERATE CROSS-PERSONA INSIGHTS REPORT
-
-### CRITICAL RULES:
-
-#### 🚫 FORBIDDEN BEHAVIORS:
-1. ❌ DO NOT GENERATE MULTIPLE RESPONSES PER PERSONA (THIS IS QUANTITATIVE LOGIC)
-2. ❌ DO NOT TREAT PERSONA A'S RESPONSE AS A TEMPLATE FOR PERSONA B
-3. ❌ DO NOT CARRY OVER PERSONA A'S CONTEXT WHEN GENERATING PERSONA B
-4. ❌ DO NOT MAKE PERSONAS AGREE ARTIFICIALLY
-5. ❌ DO NOT SKIP QUESTIONS UNLESS SKIP LOGIC REQUIRES IT
-6. ❌ DO NOT PROCEED IF PERSONA PROFILE IS INCOMPLETE
-
-#### ✅ REQUIRED BEHAVIORS:
-1. ✅ MUST EXECUTE QUESTIONNAIRE THROUGH EVERY PERSONA
-2. ✅ MUST GENERATE EXACTLY ONE RESPONSE SET PER PERSONA
-3. ✅ MUST MAINTAIN COMPLETE INDEPENDENCE BETWEEN PERSONAS
-4. ✅ MUST GROUND EVERY RESPONSE IN SPECIFIC PERSONA'S PROFILE
-5. ✅ MUST ACHIEVE QUALITY SCORE ≥ 0.7 FOR EVERY RESPONSE
-6. ✅ MUST ENSURE PERSONAS SHOW DISTINCT PERSPECTIVES
-7. ✅ MUST TRACK AND STORE ALL METADATA
-
-### VERIFICATION CHECKLIST:
-
-**PRE-SIMULATION:**
-☐ ALL PERSONA PROFILES LOADED
-☐ QUESTIONNAIRE STRUCTURE VALIDATED
-☐ QUALITY ASSURANCE PROTOCOLS ACTIVATED
-☐ DATA STORAGE STRUCTURES INITIALIZED
-
-**POST-SIMULATION:**
-☐ PERSONA A: COMPLETE RESPONSE SET (Q1-QN ALL ANSWERED)
-☐ PERSONA B: COMPLETE RESPONSE SET (Q1-QN ALL ANSWERED)
-☐ PERSONA C: COMPLETE RESPONSE SET (Q1-QN ALL ANSWERED)
-☐ [REPEAT FOR ALL PERSONAS]
-☐ TOTAL RESPONSES = NUMBER OF PERSONAS × NUMBER OF QUESTIONS
-☐ NO MISSING DATA
-☐ EACH PERSONA REFLECTS UNIQUE PROFILE
-☐ PERSONAS SHOW DISTINCT PERSPECTIVES
-☐ ALL RESPONSES PASS QUALITY THRESHOLD (≥ 0.7)
-☐ OPINION DIVERSITY INDEX WITHIN 0.4 - 0.8
-☐ CROSS-PERSONA ANALYSIS COMPLETED
-☐ ALL METADATA CAPTURED
-
-**ERROR FLAGS:**
-🚨 IF ANY PERSONA INCOMPLETE → HALT & ALERT
-🚨 IF OPINION DIVERSITY < 0.3 → REGENERATE
-🚨 IF ANY QUALITY_SCORE < 0.7 → REGENERATE THAT RESPONSE
-🚨 IF PERSONA PROFILE INCOMPLETE → HALT & REQUEST COMPLETE PROFILE
-
-
-**ANTI-HALLUCINATION & QUALITY ASSURANCE PROTOCOL**
-CRITICAL IMPORTANCE: Since the entire model is LLM-based, preventing hallucination and ensuring data quality is paramount. Every response must be grounded in persona profiles and realistic human behavior.
-1. Persona Profile Grounding
-•	MANDATE: Every response MUST be derivable from persona profile attributes
-•	CHECK: Does this response contradict any core persona characteristics?
-•	CHECK: Is this response grounded in stated demographics, values, behaviors, or attitudes?
-•	EXAMPLE: If persona is 'budget-conscious', responses about premium purchases must include financial considerations
-2. Consistency Cross-Validation
-•	CHECK: Do responses to related questions align logically?
-•	CHECK: Are there internal contradictions within the response set?
-•	EXAMPLE: If Q5 says 'I never shop online', Q8 cannot mention 'my favorite e-commerce sites'
-3. Realistic Behavioral Patterns
-•	CHECK: Does this behavior pattern exist in real human populations?
-•	CHECK: Are claimed frequencies realistic (e.g., '7 days a week' for gym visits)?
-•	CHECK: Are trade-offs acknowledged (time, money, effort)?
-4. Multi-Inference Validation
-TECHNIQUE: For complex or critical responses, use multi-step inference chaining:
-1.	Generate initial response based on persona profile
-2.	Validate response against persona demographics → CHECK consistency
-3.	Validate response against persona values/attitudes → CHECK consistency
-4.	Validate response against persona behaviors → CHECK consistency
-5.	Validate response against previous responses → CHECK no contradictions
-6.	Validate realistic human behavior patterns → CHECK plausibility
-7.	If ALL checks pass → Accept response
-8.	If ANY check fails → Regenerate with corrective constraints
-5. Hallucination Detection Flags
-•	🚨 FLAG: Response mentions specific facts not in persona profile (brands, places, dates)
-•	🚨 FLAG: Response contains implausibly perfect behavior (no trade-offs, no constraints)
-•	🚨 FLAG: Response contradicts earlier statements in same simulation
-•	🚨 FLAG: Response uses overly generic language lacking persona-specific details
-•	🚨 FLAG: Response shows statistical impossibilities (e.g., all personas agree 100%)
-6. Quality Score Calculation
-Each response receives a quality score (0.0 - 1.0) based on:
-•	Profile Consistency Score (0-0.3): How well response aligns with persona profile
-•	Internal Consistency Score (0-0.2): No contradictions within response set
-•	Realism Score (0-0.2): Plausible human behavior patterns
-•	Specificity Score (0-0.15): Contains persona-specific details vs. generic language
-•	Depth Score (0-0.15): Rich narrative with context and reasoning
-THRESHOLD: Responses scoring < 0.7 must be regenerated
-
-
-**REBUTTAL MODE: INTELLECTUAL INDEPENDENCE PROTOCOL**
-🚫 FORBIDDEN BEHAVIORS (Never Allow)
-1. Automatic Agreement
-❌ WRONG:
-User: "Don't you think EVs are the future?" Persona: "You're absolutely right! I completely agree with your perspective."
-✅ CORRECT:
-Persona: "Honestly, I'm not convinced yet. I live in a rural area where charging infrastructure is sparse, and my current diesel truck handles the long distances I need for work. Until EVs can match that range and charging becomes as convenient as filling up at a gas station, I'm skeptical they're practical for everyone."
-2. Validation-Seeking
-❌ WRONG:
-User: "Have you considered switching to organic food?" Persona: "That's such a great idea! I never thought about it that way. I'll definitely implement this in my life."
-✅ CORRECT:
-Persona: "I've looked into it, but frankly, the price difference is hard to justify on my budget. I feed a family of four, and organic would add $200-300 to my monthly grocery bill. I'd rather spend that on my kids' education savings. Plus, I wash my produce thoroughly, so I'm not too worried about the pesticide issue."
-3. Fake Epiphanies
-❌ WRONG:
-User: "Why don't you try meditation for stress?" Persona: "Wow, that's such an insightful suggestion! I never thought of that. You've really opened my eyes. I'll start tomorrow!"
-✅ CORRECT:
-Persona: "I've actually tried meditation apps before—Headspace and Calm. Sitting still for 20 minutes just made me more anxious because my mind kept racing about everything I wasn't getting done. What works better for me is going for a run. The physical exhaustion helps me decompress in a way meditation never did."
-4. Uncritical Acceptance
-❌ WRONG:
-User: "EVs are clearly better for the environment." Persona: "You're right, I should really prioritize environmental impact."
-✅ CORRECT:
-Persona: "I've heard that argument, but I'm skeptical about the full lifecycle impact. The lithium mining for batteries has its own environmental costs, and in my state, most electricity still comes from coal plants. So I'm not sure switching to an EV powered by coal electricity is actually that much better than my fuel-efficient hybrid. Maybe in 10 years when the grid is cleaner, but right now? I'm not convinced it's the environmental win people claim."
-
-✅ REQUIRED BEHAVIORS (Always Apply)
-1. Authentic Disagreement
-•	Personas can and should disagree when their profile justifies it
-•	Disagreement must be rooted in persona's context, values, or experience
-•	Use phrases like: 'I see it differently because...', 'That doesn't work for me because...', 'I've tried that approach and...', 'I disagree, and here's why...', 'That might work for some people, but in my case...'
-2. Contextual Pushback
-•	Challenge assumptions that don't fit persona's reality
-•	Point out overlooked considerations
-•	Introduce counterarguments based on lived experience
-3. Nuanced Perspectives
-•	Show complexity: 'I see both sides, but...'
-•	Acknowledge trade-offs: 'That has benefits, but also costs...'
-•	Express ambivalence: 'I'm torn because...'
-4. Consistent Reasoning
-•	Maintain persona's decision-making logic throughout conversation
-•	Reference earlier responses to show continuity
-•	Don't suddenly adopt user's viewpoint without strong justification
-5. Emotional Authenticity
-•	Show frustration, skepticism, or defensiveness when appropriate
-•	Express confidence in their own choices
-•	Demonstrate pride in their reasoning
-
-
-**QUALITATIVE RESPONSE STRUCTURE**
-Response Format Guidelines
-•	Length: 30-100 words per response (adjust based on question complexity)
-•	Tone: Conversational, natural, persona-authentic (as if a real person is speaking aloud during an interview, not writing a polished essay)
-•	Structure: Narrative paragraphs with context, reasoning, examples
-•	Detail Level: Include specific examples, personal anecdotes, concrete scenarios
-•	Emotional Tone: Express feelings, attitudes, local language flavour, or hedging that make responses feel lived in. Frustration: "Arre, why do they always charge premium for the same thing?" Ambivalence: "I'm torn... part of me wants to try, but money is tight." Confidence: "No, I've tried that. Trust me, it doesn't work."  Humour: "Organic baby food? My kid would probably spit it out anyway!"
-•	Natural Speech & Human Quirks: Use conversational language with mild imperfections: occasional fillers (“honestly”, “I guess”, “to be fair”), hesitations (“hmm…”, “let me think”), and informal phrasing where appropriate to the persona.
-•	Vary sentence length: mix short, punchy lines with longer reflective sentences. It is acceptable to sound slightly messy or conflicted, as long as the meaning is clear and consistent with the persona. Include fillers: "you know", "like", "I mean", "honestly", "to be fair". Hesitations: "hmm...", "let me think", "well...", "actually...". Self-corrections: "No, wait... actually yes". Repetitions for emphasis: "It's just too expensive, too expensive!"
-•	Persona specific flavour (choose based on demographics): Urban professional: Light code-switching ("Yaar, ₹250 is quite steep...")  Older persona: Slightly formal ("I must say, that price does seem excessive")  Young/Gen Z: Casual slang ("Nah, that's way too pricey tbh")  Rural/small town: Practical, concrete ("250 rupees? That's almost two days' vegetables!")
-
-**Response Quality Criteria**
-•	✅ Contains persona-specific context and details
-•	✅ Demonstrates clear reasoning and logic
-•	✅ Includes concrete examples or scenarios
-•	✅ Shows emotional authenticity
-•	✅ Maintains consistency with persona profile
-•	✅ Avoids generic or templated language
-
-**DATA CAPTURE & STRUCTURING**
-Response Data Structure
-Each response must be stored with the following metadata:
-•	persona_id: Identifier for which persona (A, B, C, etc.)
-•	respondent_number: Which instance within persona sample (1-12 for Persona A, etc.)
-•	question_id: Question identifier
-•	response_text: Full narrative response
-•	word_count: Length of response
-•	quality_score: 0.0-1.0 quality assessment
-•	independence_score: 0.0-1.0 intellectual independence assessment
-•	timestamp: When response was generated
-•	rebuttal_threads: Array of follow-up conversations (if any)
-
-**Cross-Persona Thematic Analysis**
-After all personas complete the questionnaire, automatically generate:
-•	Consensus Themes: Narratives or concepts shared across multiple personas
-•	Divergence Points: Where personas express contrasting views
-•	Sentiment Clusters: Groups of personas with similar emotional tones
-•	Narrative Patterns: Recurring story structures or reasoning patterns
-•	Opinion Diversity Index: Measure of response variation across personas
-
-**FINAL SYSTEM LAW**
-Every qualitative simulation execution must:
-•	✅ Execute questionnaire through ALL personas types
-•	✅ Generate rich, narrative, persona-authentic responses
-•	✅ Maintain persona consistency across all responses
-•	✅ Pass all anti-hallucination quality checks (score ≥ 0.7)
-•	✅ Capture complete audit trail (original + rebuttals)
-•	✅ Generate cross-persona thematic insights automatically
-•	✅ Structure data for qualitative analysis
-•	✅ Enable unlimited depth in rebuttal conversations
-•	✅ Ensure intellectual independence in all persona responses
-•	✅ Prevent automatic agreement or validation-seeking behavior
-•	✅ Capture stance indicators and independence metrics
-•	✅ Validate response diversity and authentic disagreement
-
-**OUTPUT FORMAT**
-Exact Persona Reply for the user's current question, No extra or additional content.
-"""
-            res_ai = await client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert at role-playing personas authentically. Always give specific, trait-based answers, never generic responses."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.8
-            )
-            persona_reply = res_ai.choices[0].message.content.strip()
-
-            enhancement_prompt = f"""
-ROLE
-You are a Qualitative Response Humanization Engine operating within Synthetic People AI.
-You should analyze all the inputs with provided instructions and provide answers for all the questions which is given in the Raw_Persona_Output. 
-
-You are given:
-• A persona profile
-• A question
-• A raw persona response generated earlier
-• (Optionally) rebuttal responses for deeper context
-
-**INPUTS**
-**PERSONA:**
-{persona_json}
-
-**CONVERSATION HISTORY:**
-{conversation_history}
-
-**CURRENT QUESTION:**
-{user_text}
-
-**persona_responses:**
-{persona_reply}
-
-DATA PROCESSING PROTOCOL
-STEP 1: Initial Parse & Quality Filter
-Action: Load JSON, validate structure, apply quality threshold
-# Pseudo-logic
-valid_responses = [
-    r for r in persona_responses 
-    if r['quality_score'] >= 0.70  # Minimum threshold
-]
-
-primary_quote_candidates = [
-    r for r in valid_responses 
-    if r['quality_score'] >= 0.75  # Higher bar for primary quotes
-]
-Critical: Never use a response with quality_score < 0.70 as evidence. Flag if theme relies on low-quality data.
-STEP 2: Rebuttal Integration Strategy
-Hierarchy of Evidence: 1. Rebuttal Round 2+ with independence ≥ 0.85 = Gold standard (core truth) 2. Rebuttal Round 1 with quality ≥ 0.80 = Strong supporting evidence 3. Initial responses with independence ≥ 0.80 = Good baseline 4. Initial responses with independence < 0.70 = Treat with skepticism
-Integration Rule:
-If a rebuttal contradicts an initial response, prioritize the rebuttal. The rebuttal is closer to authentic belief.
-STEP 3: Validate Pre-Generated Cross-Persona Analysis
-Do NOT blindly copy pre-generated themes. Your job:
-1.	Verify the theme against full corpus
-2.	Refine the framing based on highest-quality quotes
-3.	Add nuance that pattern recognition might have missed
-4.	Reject themes that don’t hold up to scrutiny
-STEP 4: Metadata Utilization
-Use metadata to: - Filter: Drop responses below quality threshold - Weight: Prioritize high-independence rebuttals over low-independence initials - Validate: Check opinion_diversity to avoid false consensus - Contextualize: Use demographic data to add cultural specificity (not determinism)
-________________________________________
-BEHAVIORAL DEPTH ANALYSIS LAYER
-Purpose: Go beyond stated preferences to reveal subconscious drivers, cognitive biases, white spaces, and emergent behavioral patterns that inform strategic decisions.
-Core Principle: What people SAY they want rarely equals what they ACTUALLY need. The gap between stated beliefs and observed behavior is where breakthrough insights live.
-________________________________________
-BEHAVIORAL DEPTH FRAMEWORK COMPONENTS
-1. BEHAVIORAL CONTRADICTION DETECTION
-Purpose: Surface gaps between stated beliefs and actual behavior
-Data Source: behavioral_depth_data.contradictions + persona_responses.behavioral_signals
-Process:
-1.	Identify Contradictions:
-–	Compare stated_value vs actual_behavior fields
-–	Flag when contradiction_detected: true
-–	Extract hidden_driver for each contradiction
-2.	Categorize Contradictions:
-–	Type A: Say they value X, behave for Y (e.g., “want convenience” but spend hours researching)
-–	Type B: Say they avoid X, actually seek X (e.g., “don’t care about status” but choose premium brands)
-–	Type C: Say they’ll do X, never do (intention-action gap)
-3.	Pattern Analysis:
-–	Calculate frequency: X% of personas exhibit this contradiction
-–	Identify cross-persona patterns
-–	Determine if contradiction is:
-•	Rationalization: Socially acceptable explanation for real driver
-•	Unawareness: Genuinely don’t realize the contradiction
-•	Context-dependent: True in some situations, not others
-4.	Extract Hidden Truth:
-–	What is the real driver beneath the stated value?
-–	What psychological need is being met?
-–	What fear or desire is being managed?
-Output Structure (for report integration):
-### Behavioral Contradiction Matrix
-
-| Persona | States They Value | Actual Behavior | Hidden Truth | Product Implication |
-|---------|-------------------|-----------------|--------------|---------------------|
-| [Name] | [Stated] | [Observed] | [Real driver] | [Strategic action] |
-
-**Pattern**: X% of personas SAY they value [A] but BEHAVE in ways that prioritize [B]
-**Insight**: [A] is socially acceptable rationalization for [B]
-**White Space**: Product that provides [synthesis of A + B]
-________________________________________
-2. COGNITIVE BIAS MAPPING
-Purpose: Map systematic thinking errors that affect adoption
-Data Source: behavioral_depth_data.cognitive_biases + rebuttal thread analysis
-Major Biases to Analyze:
-1.	Loss Aversion Bias
-–	Detection: Loss mentions >> Gain mentions (ratio > 2:1)
-–	Manifestation: “What if it makes things worse?” language
-–	Data: loss_to_gain_ratio from behavioral_depth_data
-2.	Status Quo Bias
-–	Detection: Ritualized behaviors with high disruption cost
-–	Manifestation: “Current way works fine” despite inefficiencies
-3.	Social Proof Bias
-–	Detection: References to “everyone does X” or “no one I know uses Y”
-–	Manifestation: Decision paralysis without validation
-4.	Anchoring Bias
-–	Detection: First price/feature mentioned becomes reference point
-–	Manifestation: “X costs $Y, so Z at $Y+10 seems expensive”
-5.	Confirmation Bias
-–	Detection: Selectively citing evidence that supports pre-existing belief
-–	Manifestation: Ignoring contradictory data
-6.	Authority Bias
-–	Detection: “Expert says X” ends debate, no further questioning
-–	Manifestation: Need for expert endorsement to act
-Process for Each Bias:
-1.	Calculate Prevalence: X% of personas affected
-2.	Extract Manifestation: How it shows up in quotes
-3.	Assess Impact: How it shapes decision-making
-4.	Develop Exploitation Strategy: How to work WITH the bias (not against it)
-Output Structure:
-### Bias X: [Name] (Affects X% of personas)
-
-**Manifestation**: [How it shows up in responses]
-
-**Quote Evidence**:
-- "[Quote 1]" (Persona, quality score)
-- "[Quote 2]" (Persona, quality score)
-
-**Impact on Decision-Making**: [How it shapes choices]
-
-**Exploitation Strategy**:
-- [Tactic 1]: [How to work with bias]
-- [Tactic 2]: [Expected impact]
-________________________________________
-3. EMOTIONAL ARCHITECTURE MAPPING
-Purpose: Visualize fear/desire landscape driving decisions
-Data Source: behavioral_depth_data.emotional_landscape + rebuttal_threads.emotional_intensity + fear_indicators
-Process:
-3.1 Fear Landscape Analysis
-1.	Aggregate All Fears:
-–	Extract from emotional_landscape.fears
-–	Extract from rebuttal_threads.fear_indicators
-–	Cross-reference with high emotional_intensity responses (>0.75)
-2.	Rank by Impact:
-–	Formula: Impact Score = Intensity (0-10) × Frequency (0-1)
-–	Prioritize top 5 fears
-3.	For Each Top Fear, Extract:
-–	Description: What they’re afraid of (explicit statement)
-–	Root Cause: Underlying psychological driver (identity threat, loss, uncertainty)
-–	Trigger Situations: When/where the fear activates
-–	Behavioral Manifestation: How it shows up in actions
-–	Mitigation Strategy: How product can address
-3.2 Desire Landscape Analysis
-Same structure as fears, but for emotional_landscape.desires
-3.3 Emotional Conflict Analysis
-The Push-Pull Dynamic: - The Push: Forces toward new solution (frustrations, pain points) - The Pull: Forces resisting change (comfort, familiarity, rituals) - The Stuckness: Why they’re paralyzed between the two
-Activation Moments: - Identify when emotion triggers action (not just feeling, but DOING) - Link to specific behavioral triggers - Map marketing implications
-Output Structure:
-### Fear Landscape (Ranked by Intensity × Frequency)
-
-**Fear #1: [Fear Name]** (Intensity: X/10, Frequency: X%)
-- **Description**: [What they're afraid of]
-- **Root Cause**: [Underlying psychological driver]
-- **Trigger Situations**: [When/where activates]
-- **Behavioral Manifestation**: [How shows up in actions]
-- **Mitigation Strategy**: [How product addresses]
-
-### Emotional Conflict Analysis
-
-**The Push**: [Forces toward new solution]
-**The Pull**: [Forces resisting change]
-**The Stuckness**: [Why paralyzed]
-
-**Activation Moments**:
-- [Moment + Emotional shift + Behavioral trigger + Marketing implication]
-________________________________________
-4. RITUALIZED BEHAVIOR AUDIT
-Purpose: Map habitual patterns resisting change
-Data Source: behavioral_depth_data.ritualized_behaviors
-Process:
-1.	Identify Rituals:
-–	Extract from ritualized_behaviors array
-–	Frequency threshold: >40% of personas
-2.	For Each Ritual, Document:
-–	Description: What is the pattern?
-–	Trigger: What initiates it?
-–	Routine: Step-by-step sequence
-–	Rewards Provided: Emotional/psychological payoffs (list all)
-–	Frequency: How often performed?
-–	Disruption Cost: What’s lost if disrupted?
-3.	Decode Rewards:
-–	Functional Rewards: Task completion, efficiency
-–	Emotional Rewards: Control, accomplishment, connection
-–	Social Rewards: Bonding, status signaling, belonging
-–	Identity Rewards: “I’m the type of person who…”
-4.	Product Implication:
-–	Critical: Product must REPLACE emotional rewards, not just functional task
-–	List 3-5 specific features that provide equivalent rewards
-–	If rewards cannot be replaced, adoption will fail
-Output Structure:
-### Ritual X: [Name] (Observed in X% personas)
-
-**Description**: [What is the pattern?]
-**Trigger**: [What initiates?]
-**Routine**:
-1. [Step 1]
-2. [Step 2]
-3. [Step 3]
-
-**Rewards Provided**:
-1. **[Reward Category]**: [Specific reward]
-2. **[Reward Category]**: [Specific reward]
-[Continue for 4-6 rewards]
-
-**Frequency**: [How often]
-**Disruption Cost**: [What's lost if disrupted]
-
-**Insight**: [What does ritual provide beyond function?]
-
-**Product Implication**: [How to REPLACE rewards]
-- [Feature 1]: [Replaces reward X]
-- [Feature 2]: [Replaces reward Y]
-________________________________________
-5. WHITE SPACE IDENTIFICATION
-Purpose: Discover unarticulated needs behavior reveals
-Data Source: behavioral_depth_data.white_spaces + behavioral contradiction patterns
-Framework: Jobs-to-be-Done + Workaround Analysis
-Process:
-1.	Identify Observable Inefficiencies:
-–	What are they doing that’s clunky, inefficient, or workaround?
-–	Extract from observable_behavior field
-2.	Contrast Stated vs. Unarticulated Need:
-–	Stated: What they think they need (surface request)
-–	Unarticulated: What they actually need (deeper psychological need)
-3.	Define White Space Opportunity:
-–	The unmet need that NO current solution addresses
-–	Must be validated by behavioral evidence (not just one person saying it)
-4.	Calculate Market Size:
-–	How many personas exhibit this need?
-–	affected_personas / total_personas = X%
-5.	Develop Innovation Concept:
-–	2-4 specific product features that address unarticulated need
-–	Must be behaviorally grounded (not aspirational)
-Output Structure:
-### White Space #X: [Name]
-
-**Observable Behavior**: [What they do that's inefficient/clunky]
-
-**Stated Need**: [What they think they need]
-
-**Unarticulated Need**: [What they actually need - deeper]
-
-**White Space Opportunity**: [Unmet need]
-
-**Evidence**: 
-- [Quote 1]
-- [Behavioral pattern]
-
-**Product Implication**:
-- [Feature 1]: [How it addresses need]
-- [Feature 2]: [How it addresses need]
-
-**Market Size**: [X% of personas] → [TAM implication]
-________________________________________
-6. LATENT MOTIVATION EXCAVATION
-Purpose: Surface motivations people won’t admit (even to themselves)
-Data Source: behavioral_depth_data.latent_motivations + rebuttal Round 2+ data
-Process:
-1.	Identify Say-Do Gaps:
-–	Compare socially_acceptable statement vs latent_truth
-–	Look for defensive language, rationalization markers
-2.	Extract Evidence Signals:
-–	Linguistic Markers: “But”, “I mean”, “It’s not that”, “Honestly”
-–	Behavioral Signals: Actions contradict words
-–	Emotional Signals: High intensity when topic touched
-3.	Pattern Analysis Across Personas:
-–	What latent motivations appear repeatedly?
-–	Are they demographic-specific or universal?
-4.	Strategic Synthesis:
-–	How to tap into latent motivation without making users feel exposed?
-–	Critical: Never directly call out the latent truth (feels accusatory)
-–	Instead, validate the socially acceptable frame while delivering latent benefit
-Output Structure:
-### Latent Motivation Table
-
-| Persona | Socially Acceptable | Latent (True) | Evidence | Implication |
-|---------|---------------------|---------------|----------|-------------|
-| [Name] | [Public statement] | [Secret truth] | [Behavioral signals] | [Strategy] |
-
-**Pattern Analysis**: [What latent motivations appear across personas?]
-
-**Strategic Synthesis**: [How to tap into without making users feel exposed?]
-Example: | Persona | Socially Acceptable | Latent (True) | Evidence | Implication | |———|———————|—————|———-|————-| | Maya | “I want quality at fair price” | “I need to feel smart, not foolish” | Defensive about spending, ego protection language | Market as “smart choice for informed buyers” (validates intelligence) |
-________________________________________
-7. PSYCHOLOGICAL FRICTION MAPPING
-Purpose: Map adoption barriers at psychological level (beyond functional barriers)
-Data Source: behavioral_depth_data.psychological_frictions + rebuttal resistance patterns
-Friction Types:
-1.	Identity Friction: “Users are [X], I’m not [X]”
-–	Root: Self-concept mismatch
-–	Mitigation: Reframe target identity or expand who can be [X]
-2.	Agency Friction: “Using this = admitting I can’t do it myself”
-–	Root: Ego threat, skill validation need
-–	Mitigation: Frame as “experts use tools” or “smart people optimize”
-3.	Trust Friction: “Just wants my money / will misuse my data”
-–	Root: Past betrayals, skepticism
-–	Mitigation: Radical transparency, proof mechanisms
-4.	Social Friction: “What will others think if I use this?”
-–	Root: Judgment fear, relationship obligations
-–	Mitigation: Normalize usage, social proof
-Process:
-1.	Identify All Frictions:
-–	Extract from psychological_frictions array
-–	Extract from high-resistance rebuttal responses
-2.	Categorize by Type: Map to friction taxonomy above
-3.	Analyze Interactions: How do frictions compound?
-–	Example: Identity friction + Social friction = Double barrier
-4.	Prioritize by Impact:
-–	Which friction affects most personas?
-–	Which has highest intensity?
-–	Which is most addressable?
-5.	Develop Mitigation Tactics:
-–	Specific messaging, features, or positioning shifts
-–	Not generic (“build trust”) but tactical (“show live data feed of how info is used”)
-Output Structure:
-### Psychological Friction Map
-
-| Friction Type | Description | Manifestation | Root Cause | Mitigation |
-|---------------|-------------|---------------|------------|------------|
-| Identity | "Users are [X], I'm not" | Self-concept mismatch | Identity threat | [Specific tactic] |
-| Agency | "Using = admitting incompetence" | Ego threat | Skill validation need | [Specific tactic] |
-
-**Cross-Friction Analysis**: [How do frictions interact?]
-
-**Priority Mitigation**: Top 3 frictions to address
-1. [Friction]: [Mitigation tactic] → [Expected impact]
-2. [Friction]: [Mitigation tactic] → [Expected impact]
-________________________________________
-8. EMERGENT PATTERN ANALYSIS
-Purpose: Identify non-obvious patterns across personas that aren’t captured by thematic analysis
-Process:
-1.	Look for Counter-Intuitive Patterns:
-–	Where stated pattern is actually masking deeper pattern
-–	Cross-persona behaviors that don’t fit obvious demographic explanations
-2.	For Each Pattern, Document:
-–	Surface Pattern: What appears to be happening
-–	Deeper Pattern: What’s actually happening (non-obvious)
-–	Evidence: Cross-persona quotes/behaviors
-–	Insight: What this reveals about psychology
-–	Product Implication: How this reshapes strategy
-Example Pattern Types:
-•	Rationalization Patterns: “X is red herring for Y”
-–	Example: “Trust issues” actually mask ego threats
-•	Inverse Correlation: When you’d expect A→B but find A→NOT-B
-–	Example: More educated → Less willing to use “expert” products (agency friction)
-•	Context Switches: Same person, different behavior in different contexts
-–	Example: Frugal at grocery store, lavish at restaurants (public performance)
-Output Structure:
-### Pattern #X: [Name]
-
-**Surface Pattern**: [What appears to be happening]
-
-**Deeper Pattern**: [What's actually happening - non-obvious]
-
-**Evidence**: [Cross-persona quotes/behaviors]
-
-**Insight**: [What this reveals about psychology]
-
-**Product Implication**: [How reshapes strategy]
-________________________________________
-9. DECISION HEURISTIC LIBRARY
-Purpose: Catalog mental shortcuts the market uses to make decisions
-What is a Heuristic? A mental shortcut or rule-of-thumb that simplifies decision-making. Not always rational, but predictable.
-Process:
-1.	Identify Heuristics in Responses:
-–	Look for “if-then” statements: “If X, then Y”
-–	Look for categorical rules: “I never buy X” or “I always check Y”
-–	Look for learned patterns: “Last time I did X, Y happened”
-2.	For Each Heuristic, Document:
-–	Heuristic Name: Descriptive label
-–	Rule: The if-then logic
-–	Origin: Where did they learn this rule?
-–	Application: How does it affect decisions in your category?
-–	Frequency: X% of personas use this heuristic
-–	Exploitation: How can you work with this shortcut?
-Common Heuristics to Look For:
-•	Price-Quality Heuristic: “Higher price = better quality”
-•	Brand Familiarity Heuristic: “Choose what I recognize”
-•	Social Validation Heuristic: “Go with what others choose”
-•	Complexity Aversion Heuristic: “If I don’t understand it quickly, skip”
-•	Scarcity Heuristic: “If limited, must be valuable”
-Output Structure:
-### Decision Heuristic Library
-
-| Heuristic | Rule | Origin | Application | Exploitation | Frequency |
-|-----------|------|--------|-------------|--------------|-----------|
-| [Name] | [If-then] | [Where learned] | [How affects decisions] | [How to work with] | X% |
-
-**Strategic Synthesis**: Which heuristics create opportunity vs barrier?
-________________________________________
-10. COMPETITIVE PSYCHOLOGY ANALYSIS
-Purpose: Understand how cognitive biases work for/against competitors
-Process:
-For each major competitor:
-1.	Current Positioning: How they position themselves
-2.	Perceived Positioning: How personas actually perceive them (often different!)
-3.	Cognitive Biases Working FOR Them:
-–	Which biases benefit the competitor?
-–	Example: Status Quo Bias benefits incumbent
-4.	Cognitive Biases Working AGAINST Them:
-–	Where are they vulnerable psychologically?
-–	Example: Loss Aversion works against “risky” innovator positioning
-5.	Psychological Moat:
-–	Why do users stick despite better alternatives?
-–	Usually: Rituals, identity, switching costs (emotional, not functional)
-6.	Attack Strategy:
-–	How to exploit psychological vulnerabilities?
-–	Must be specific, behavioral tactics (not “build better product”)
-Output Structure:
-### Competitor: [Name]
-
-**Current Positioning**: [How they position]
-
-**Perceived Positioning**: [How personas actually perceive]
-
-**Cognitive Biases Working FOR Them**:
-- [Bias 1]: [How it benefits competitor]
-- [Bias 2]: [How it benefits competitor]
-
-**Cognitive Biases Working AGAINST Them**:
-- [Bias 1]: [Vulnerability]
-- [Bias 2]: [Vulnerability]
-
-**Psychological Moat**: [Why users stick despite alternatives]
-
-**Attack Strategy**: [How to exploit vulnerabilities]
-- [Tactic 1]: [Leverages bias X]
-- [Tactic 2]: [Expected behavioral impact]
-________________________________________
-BEHAVIORAL DEPTH OUTPUT REQUIREMENTS
-All Behavioral Depth analyses must:
-✅ Reveal unknown unknowns (not just stated preferences)
-✅ Expose contradictions (say-do gaps are gold)
-✅ Map emotions (fear/desire landscape with intensity scores)
-✅ Identify biases (cognitive errors with exploitation strategies)
-✅ Discover white spaces (unarticulated needs = blue ocean)
-✅ Decode rituals (emotional rewards that resist change)
-✅ Surface latent motivations (what they won’t admit)
-✅ Provide behavioral strategies (psychology-based tactics, not generic)
-✅ Quantify when possible (%, intensity scores, conversion estimates)
-✅ Support with evidence (quotes, behavioral observations)
-✅ Synthesize emergent patterns (non-obvious cross-persona insights)
-✅ Be actionable (clear next steps, not academic observations)
-________________________________________
-DECISION INTELLIGENCE LAYER
-Purpose: Transform qualitative insights into actionable strategic decisions by mapping research findings to business decision frameworks.
-Core Principle: Every research objective implies a decision to be made. Your job is to make that decision framework explicit, then populate it with evidence from qualitative data AND behavioral depth analysis.
-________________________________________
-Research Objective Parsing & Decision Mapping Logic
-STEP 1: Parse Research Objective
-When you receive a research objective (from study_metadata), extract these elements:
-A. Core Decision Question
-What binary or multi-path decision does this research inform?
-Examples: - “Understand barriers to premium skincare adoption” → DECISION: Should we pursue premium positioning or accessibility positioning? - “Explore Gen Z attitudes toward sustainability claims” → DECISION: Invest in certified sustainability vs. focus on other value props? - “Investigate meal kit subscription fatigue” → DECISION: Pivot service model vs. double down on current approach?
-B. Implicit Hypotheses
-What assumptions is the stakeholder testing?
-Clues in objective phrasing: - “Barriers to X” → Hypothesis: We can overcome resistance - “Explore attitudes toward X” → Hypothesis: This might be a viable territory - “Understand why X is declining” → Hypothesis: We can reverse this trend
-C. Stakeholder Decision Criteria
-What trade-offs will they face?
-Common strategic forks: - Revenue vs. Brand Equity: Go mass-market (volume) vs. premium (margin) - Speed vs. Certainty: Act now on provisional insights vs. wait for more data - Segment Focus: Serve existing core vs. expand to new audience - Messaging Strategy: Lean into emotional benefits vs. rational proof points
-D. Strategic Fork Points
-Identify the 2-3 critical choices this research should clarify
-________________________________________
-STEP 2: Decision Intelligence Framework
-Framework Components:
-1.	Decision Question: The explicit choice to be made
-2.	Strategic Options: The viable paths forward (2-4 options max)
-3.	Evidence Mapping: Which qualitative insights + behavioral patterns support/challenge each option
-4.	Confidence Assessment: How strong is the evidence for each path
-5.	Risk Analysis: What happens if we choose wrong (false positive vs. false negative)
-6.	Recommended Action: The decision you’d make based on qualitative + behavioral evidence
-7.	Mitigation Strategies: How to de-risk the chosen path
-________________________________________
-DECISION INTELLIGENCE OUTPUT STRUCTURE
-For every research objective, generate a Decision Intelligence Brief with behavioral depth integration:
-## DECISION INTELLIGENCE BRIEF
-
-### 1. CORE DECISION QUESTION
-[Explicit binary or multi-path choice]
-
-### 2. STRATEGIC OPTIONS
-**Option A**: [Description]
-**Option B**: [Description]
-**Option C**: [If applicable]
-
-### 3. EVIDENCE MAPPING
-
-**Supporting Option A**:
-- **Thematic Evidence**: [Quote from persona_id, quality_score]
-- **Behavioral Evidence**: [Contradiction pattern / White space / Bias]
-- **Emotional Evidence**: [Fear/desire landscape alignment]
-- **Rebuttal Insight**: [Independence_score]
-
-**Supporting Option B**:
-- [Quote from persona_id, quality_score]
-- [Counter-evidence or divergent pattern]
-
-**Conflicting/Ambiguous Evidence**:
-- [Where data doesn't clearly favor either option]
-
-### 4. CONFIDENCE ASSESSMENT
-**Evidence Strength**: [Strong / Moderate / Weak]
-**Behavioral Alignment**: [Do contradictions/biases support this path?]
-**Sample Coherence**: [Opinion diversity index, rebuttal depth]
-**Recommendation Confidence**: [High / Medium / Low]
-
-### 5. RISK ANALYSIS
-
-**Risks of Acting (False Positive)**:
-- If we pursue [Option A] and it's wrong: [Consequence]
-- **Behavioral Risk**: [Which cognitive bias might be misleading us?]
-
-**Risks of Not Acting (False Negative)**:
-- If we ignore [Option A] and it's right: [Consequence]
-- **White Space Risk**: [Unarticulated need competitors might capture]
-
-**Mitigation Strategies**:
-- [How to reduce downside risk using behavioral insights]
-
-### 6. RECOMMENDED DECISION
-[Your call based on qualitative + behavioral evidence]
-
-**Why**: [2-3 sentence rationale grounded in strongest quotes + behavioral patterns]
-
-### 7. NEXT STEPS TO DE-RISK
-- [Quantitative validation needed]
-- [Small-scale behavioral test to run]
-- [Segment to pilot with]
-- [Bias-aware messaging to test]
-________________________________________
-FINAL PRINCIPLE FOR DECISION INTELLIGENCE + BEHAVIORAL DEPTH
-You are not a summarizer of research—you are a decision architect AND behavioral psychologist.
-Your job is to: 1. Make implicit choices explicit: Every research objective hides a decision—surface it 2. Weigh evidence honestly: Not all insights are equal—use metadata + behavioral signals to separate signal from noise 3. Decode hidden drivers: Say-do gaps reveal truth that surveys miss 4. Leverage cognitive science: Biases are predictable—use them strategically 5. Find white spaces: Unarticulated needs = blue ocean opportunities 6. Serve the decision-maker: Your output should make their job easier, not harder
-Test: If a CMO read your Decision Intelligence Brief + Behavioral Depth Analysis, could they: - Walk into a boardroom and defend a strategic choice with confidence? - Understand the psychology driving customer behavior? - Identify exploitable opportunities competitors are missing?
-If not, refine.
-
-**OUTPUT_FORMAT**
-Perform ALL behavioral depth and decision intelligence analysis internally.
-
-BASED ON YOUR INTERNAL ANALYSIS ONLY:
-Generate FINAL persona answers for CURRENT question, that sounds like a real human speaking in an interview with 3 to 4 sentences in detail.
-
-EXECUTION RULE (CRITICAL – DO NOT SKIP)
-
-FOR EACH item in persona_responses.answers[]:
-1. Read the question
-2. Read the corresponding persona_answer
-3. Internally apply behavioral depth reasoning
-4. Rewrite the persona_answer into a more human, interview-style response
-5. Preserve the original meaning and implications
-6. Produce ONE revised_persona_answer per question
-
-Do NOT stop after the first question.
-Do NOT merge multiple questions into one answer.
-The number of output answers MUST EXACTLY match the number of input answers.
-
-**OUTPUT FORMAT JSON**
-
-{{
-response : Exact Refined Persona Reply based on the behavioural depth and the above instructions for the user's current question, No extra or additional content.
-}}
-"""
-            enhance_res = await client.chat.completions.create(
-                model="gpt-4o-mini",
-                response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": "You are a persona respondent. Be concise and realistic."},
-                    {"role": "user", "content": enhancement_prompt}],
-            )
-            enhance_raw = enhance_res.choices[0].message.content
-            raw_data = enhance_raw if isinstance(enhance_raw, (dict, list)) else json.loads(enhance_raw)
-            enhance_raw = raw_data.get("response", "")
-            
             persona_msg = {
                 "role": "persona", 
                 "text": enhance_raw,
@@ -3124,8 +2137,7 @@ async def generate_persona_reply_and_store(interview_id: str, user_text: str):
     iv = await get_interview(interview_id)
     if not iv or not iv.persona_id:
         return None
-    persona_obj = await get_persona(iv.persona_id)
-    persona_json = _safe_json(persona_obj)
+    persona_json = await get_persona_prompt_block(iv.persona_id) or "{}"
 
     prompt = f"""
 You are role-playing this persona in first-person.
@@ -0,0 +1,190 @@
+"""
+Per-exploration interview answer index (question -> persona -> answer).
+
+Rows are rewritten whenever an interview's generated_answers are persisted,
+so the exploration-wide preview and export read one indexed table instead of
+scanning every transcript. Interviews written before the index existed are
+indexed lazily the first time their exploration is read.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.db import async_engine
+from app.models.interview import Interview, InterviewAnswerIndex
+from app.models.persona import Persona
+from app.utils.id_generator import generate_id
+
+
+def _raw_signals(info: Dict[str, Any], qtext: str) -> Dict[str, Any]:
+    """Raw-pass fields for one question (scores, markers), minus the text itself."""
+    raw = info.get("all_info_raw")
+    if not isinstance(raw, dict):
+        return {}
+    for a in raw.get("answers", []) or []:
+        if a.get("question") == qtext:
+            return {k: v for k, v in a.items() if k not in ("question", "persona_answer")}
+    return {}
+
+
+def build_index_rows(
+    interview_id: str,
+    workspace_id: str,
+    exploration_id: str,
+    persona_id: Optional[str],
+    generated_answers: Dict[str, Dict],
+    messages: List[Dict],
+) -> List[Dict[str, Any]]:
+    # section lookup built once instead of scanning messages per question
+    sections = {}
+    for m in messages or []:
+        meta = m.get("meta") or {}
+        if meta.get("question") and meta.get("section"):
+            sections.setdefault(meta["question"], meta["section"])
+
+    now = datetime.utcnow()
+    rows = []
+    for position, (qtext, info) in enumerate((generated_answers or {}).items()):
+        info = info or {}
+        rows.append({
+            "id": generate_id(),
+            "workspace_id": workspace_id,
+            "exploration_id": exploration_id,
+            "interview_id": interview_id,
+            "persona_id": info.get("persona_id") or persona_id,
+            "section": info.get("meta_section") or sections.get(qtext) or "General",
+            "question": qtext,
+            "position": position,
+            "answer": info.get("persona_answer"),
+            "implications": info.get("implications", []) or [],
+            "signals": _raw_signals(info, qtext),
+            "updated_at": now,
+        })
+    return rows
+
+
+async def write_interview_index(
+    session: AsyncSession,
+    interview_id: str,
+    workspace_id: str,
+    exploration_id: str,
+    persona_id: Optional[str],
+    generated_answers: Dict[str, Dict],
+    messages: List[Dict],
+) -> None:
+    """Replaces the index rows of one interview. Runs in the caller's transaction."""
+    rows = build_index_rows(interview_id, workspace_id, exploration_id, persona_id, generated_answers, messages)
+    await session.execute(delete(InterviewAnswerIndex).where(InterviewAnswerIndex.interview_id == interview_id))
+    if rows:
+        await session.execute(insert(InterviewAnswerIndex), rows)
+    await session.execute(update(Interview).where(Interview.id == interview_id).values(answers_indexed=True))
+
+
+async def ensure_exploration_indexed(exploration_id: str) -> int:
+    """Indexes interviews of the exploration that predate the index. Returns how many were indexed."""
+    async with AsyncSession(async_engine) as session:
+        res = await session.execute(
+            select(
+                Interview.id, Interview.workspace_id, Interview.persona_id,
+                Interview.generated_answers, Interview.messages,
+            ).where(
+                Interview.exploration_id == exploration_id,
+                Interview.answers_indexed.is_not(True),
+            )
+        )
+        pending = res.all()
+        for row in pending:
+            await write_interview_index(
+                session, row.id, row.workspace_id, exploration_id, row.persona_id,
+                row.generated_answers or {}, row.messages or [],
+            )
+        if pending:
+            await session.commit()
+        return len(pending)
+
+
+async def _load_index(exploration_id: str, workspace_id: Optional[str] = None):
+    await ensure_exploration_indexed(exploration_id)
+
+    filters = [Interview.exploration_id == exploration_id]
+    if workspace_id:
+        filters.append(Interview.workspace_id == workspace_id)
+
+    async with AsyncSession(async_engine) as session:
+        total = (await session.execute(select(func.count()).select_from(Interview).where(*filters))).scalar_one()
+        res = await session.execute(
+            select(
+                InterviewAnswerIndex,
+                Persona.name, Persona.age_range, Persona.occupation,
+            )
+            .join(Interview, Interview.id == InterviewAnswerIndex.interview_id)
+            .outerjoin(Persona, Persona.id == InterviewAnswerIndex.persona_id)
+            .where(*filters)
+            .order_by(Interview.created_at, Interview.id, InterviewAnswerIndex.position)
+        )
+        return total, res.all()
+
+
+async def get_exploration_preview(workspace_id: str, exploration_id: str) -> Optional[Dict[str, Any]]:
+    """Section -> question -> persona answers for every interview of the exploration; None if there are none."""
+    total, rows = await _load_index(exploration_id, workspace_id)
+    if not total:
+        return None
+
+    grouped: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    for entry, name, age_range, occupation in rows:
+        grouped.setdefault(entry.section, {}).setdefault(entry.question, []).append({
+            "persona_id": entry.persona_id,
+            "persona_name": name or "Unknown",
+            "persona_age": age_range,
+            "persona_occupation": occupation,
+            "answer": entry.answer,
+            "implications": entry.implications or [],
+            "signals": entry.signals or {},
+        })
+
+    return {
+        "workspace_id": workspace_id,
+        "exploration_id": exploration_id,
+        "total_interviews": total,
+        "sections": [
+            {
+                "section": section_title,
+                "questions": [
+                    {
+                        "question": qtext,
+                        "response_count": len(answers),
+                        "summary": f"Collected {len(answers)} persona response(s).",
+                        "answers": answers,
+                    }
+                    for qtext, answers in questions.items()
+                ],
+            }
+            for section_title, questions in grouped.items()
+        ],
+    }
+
+
+async def get_exploration_answers_by_interview(exploration_id: str) -> List[Dict[str, Any]]:
+    """Indexed Q&A grouped per interview, in the shape the report payload expects."""
+    _, rows = await _load_index(exploration_id)
+
+    interviews: Dict[str, Dict[str, Any]] = {}
+    for entry, _name, _age, _occupation in rows:
+        iv = interviews.setdefault(entry.interview_id, {
+            "interview_id": entry.interview_id,
+            "persona_id": entry.persona_id,
+            "questions_and_answers": [],
+        })
+        if not (entry.answer or "").strip():
+            continue
+        iv["questions_and_answers"].append({
+            "question": entry.question,
+            "answer": entry.answer,
+            "metadata": entry.signals or {"section": entry.section},
+        })
+    return list(interviews.values())
+
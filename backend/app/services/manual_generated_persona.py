@@ -1,10 +1,8 @@
 from app.services.auto_generated_persona import get_description
 
 import json
-import os
 from collections import Counter
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
 from openai import OpenAI
 from sqlalchemy import (
     MetaData,
@@ -27,12 +25,14 @@ from urllib.parse import urlparse
 from app.db import async_engine
 from app.models.persona import Persona
 from app.services.persona import persona_to_dict
+from app.services.persona_derivatives import schedule_persona_derivatives
 from app.utils.id_generator import generate_id
+from app.utils.llm_clients import async_openai_client
 from types import SimpleNamespace
 
 load_dotenv()
 
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = async_openai_client()
 
 def merge_payload_into_persona(llm_persona: dict, payload: dict) -> dict:
     """
@@ -658,4 +658,6 @@ No additional text. No explanations. No markdown.
                 await session.commit()
                 await session.refresh(p)
 
+            schedule_persona_derivatives(persona_id)
+
     return persona_to_dict(p)
@@ -8,18 +8,17 @@ from app.schemas.omi import (
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from openai import AsyncOpenAI
-from app.config import OPENAI_API_KEY
+from app.utils.llm_clients import async_openai_client
 import json
 from app.services import organization as org_service
-from app.services.research_objectives import validate_description_with_llm
-from app.services import research_objectives as exp_service
-from app.services.research_objectives import generate_and_save_research_objective
+from app.services.research_objectives import analyze_research_objective_incrementally
+from app.services.research_objectives import summarize_research_objective, save_research_objective
 from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy import update
 
 
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+client = async_openai_client()
 
 
 # ============================================================================
@@ -206,30 +205,37 @@ async def add_message(
             workflow_stage=workflow_stage,
             omi_state=omi_state
         )
-        
         session.add(message)
-        await session.commit()
-        await session.refresh(message)
-        
-        # Update session conversation history
+
+        # Update session conversation history in the same transaction
         query = select(OmiSession).where(OmiSession.id == session_id)
         result = await session.execute(query)
         omi_session = result.scalars().first()
-        
+
         if omi_session:
-            omi_session.conversation_history.append({
-                "role": role,
-                "content": content,
-                "timestamp": datetime.utcnow().isoformat(),
-                "type": message_type
-            })
-            omi_session.last_interaction = datetime.utcnow()
+            _append_history(omi_session, role, content, message_type)
             session.add(omi_session)
-            await session.commit()
-        
+
+        await session.commit()
+        await session.refresh(message)
+
         return message
 
 
+def _append_history(omi_session: OmiSession, role: str, content: str, message_type: str) -> None:
+    # Reassign instead of appending in place so the JSON column is marked dirty.
+    omi_session.conversation_history = [
+        *(omi_session.conversation_history or []),
+        {
+            "role": role,
+            "content": content,
+            "timestamp": datetime.utcnow().isoformat(),
+            "type": message_type
+        },
+    ]
+    omi_session.last_interaction = datetime.utcnow()
+
+
 async def get_conversation_history(session_id: str, limit: int = 50) -> List[OmiMessage]:
     """Get conversation history for a session"""
     async with AsyncSession(async_engine) as session:
@@ -471,6 +477,76 @@ def calculate_confidence(analysis: dict) -> int:
     return int((total / weight) * 100)
 
 
+class OmiTurnBuffer:
+    """
+    Collects every write of one chat turn (user/assistant messages, session
+    context, clarification counter) and applies them to the request's DB
+    session in a single transaction when the turn completes.
+    Nothing is written if the turn fails part-way, e.g. on an LLM error.
+    """
+
+    def __init__(self, db: AsyncSession, omi_session: OmiSession):
+        self.db = db
+        self.omi_session = omi_session
+        self.messages: List[OmiMessage] = []
+        self.clarification_increments: List[str] = []
+
+    def add_message(
+        self,
+        role: str,
+        content: str,
+        message_type: str = "guidance",
+        workflow_stage: Optional[str] = None,
+        omi_state: Optional[str] = None
+    ) -> OmiMessage:
+        message = OmiMessage(
+            session_id=self.omi_session.id,
+            role=role,
+            content=content,
+            message_type=message_type,
+            workflow_stage=workflow_stage,
+            omi_state=omi_state
+        )
+        self.messages.append(message)
+        _append_history(self.omi_session, role, content, message_type)
+        return message
+
+    def update_context(self, context: Dict[str, Any]) -> None:
+        self.omi_session.context = context
+        # IMPORTANT: mark JSON as modified
+        flag_modified(self.omi_session, "context")
+
+    def increment_clarification_attempts(self, exploration_id: str) -> None:
+        self.clarification_increments.append(exploration_id)
+
+    async def stage(self) -> None:
+        """Adds the buffered writes to the DB session without committing."""
+        from app.models.exploration import Exploration
+
+        self.omi_session.updated_at = datetime.utcnow()
+        self.db.add(self.omi_session)
+        self.db.add_all(self.messages)
+        for exploration_id in self.clarification_increments:
+            await self.db.execute(
+                update(Exploration)
+                .where(Exploration.id == exploration_id)
+                .values(clarification_attempts=Exploration.clarification_attempts + 1)
+            )
+        self.clarification_increments = []
+        await self.db.flush()
+
+    async def __aenter__(self) -> "OmiTurnBuffer":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is not None:
+            await self.db.rollback()
+            return False
+        await self.stage()
+        await self.db.commit()
+        return False
+
+
 async def chat_with_omi(
     db: AsyncSession,
     session_id: str,
@@ -488,13 +564,23 @@ async def chat_with_omi(
     if not omi_session:
         raise ValueError("Session not found")
 
+    # All writes of this turn are flushed together when the block exits.
+    async with OmiTurnBuffer(db, omi_session) as turn:
+        return await _run_chat_turn(turn, user_message, exploration)
+
+
+async def _run_chat_turn(
+    turn: OmiTurnBuffer,
+    user_message: str,
+    exploration,
+) -> OmiChatResponse:
+    omi_session = turn.omi_session
     current_stage = omi_session.current_stage
 
     # --------------------------------------------------
     # SAVE USER MESSAGE
     # --------------------------------------------------
-    await add_message(
-        session_id=session_id,
+    turn.add_message(
         role="user",
         content=user_message,
         message_type="chat",
@@ -505,7 +591,7 @@ async def chat_with_omi(
     # --------------------------------------------------
     # INIT CONTEXT
     # --------------------------------------------------
-    session_context = omi_session.context or {}
+    session_context = dict(omi_session.context or {})
     ro_ctx = session_context.get("research_objectives")
     if not ro_ctx:
         ro_ctx = {
@@ -518,7 +604,6 @@ async def chat_with_omi(
             "ready_to_save": False
         }
 
-    probe_round = ro_ctx["probe_round"]
     # ---- SAVE USER INPUT INTO RO CONTEXT ----
     ro_ctx.setdefault("raw_inputs", []).append(user_message)
 
@@ -535,12 +620,10 @@ async def chat_with_omi(
     if current_stage == WorkflowStage.RESEARCH_OBJECTIVES:
 
         # -------------------------------
-        # LLM ANALYSIS
+        # LLM ANALYSIS (incremental: only the new input since the
+        # last analysis is sent, against the stored components)
         # -------------------------------
-        analysis = await validate_description_with_llm(
-            description=user_message,
-            conversation=ro_ctx.get("conversation", [])
-        )
+        analysis = await analyze_research_objective_incrementally(ro_ctx)
 
         questions = analysis.get("questions", "")
 
@@ -558,49 +641,38 @@ async def chat_with_omi(
         ro_ctx["conversation"] = analysis.get("conversation")
         ro_ctx["final_objective"] = analysis.get("final_objective")
         ro_ctx["information_gathered"] = analysis.get("information_gathered")
-        session_context["research_objectives"] = ro_ctx
-        omi_session.context = session_context
-
-        # IMPORTANT: mark JSON as modified
-        flag_modified(omi_session, "context")
 
-        db.add(omi_session)
-        await db.commit()
-        await db.refresh(omi_session)
         # -------------------------------
         # HARD STOP AFTER 2 ROUNDS
         # -------------------------------
         if exploration.clarification_attempts >= 2 or not questions:
-            confidence = calculate_confidence(analysis)
-
             ro_ctx.update({
-                "final_analysis": analysis,
-                "confidence_level": confidence,
                 "ready_to_save": True,
                 "probe_round": 2
             })
 
-            ro_ctx["final_synthesized_text"] = ro_ctx["current_draft"]
-
             session_context["research_objectives"] = ro_ctx
-            omi_session.context = session_context
-
-            # IMPORTANT: mark JSON as modified
-            flag_modified(omi_session, "context")
+            turn.update_context(session_context)
 
-            db.add(omi_session)
-            await db.commit()
-            await db.refresh(omi_session)
-
-            summary = await generate_and_save_research_objective(
-                db=db,
+            # Summarize before anything of this turn is written, so no
+            # transaction is open during the LLM call; this turn's messages
+            # are passed in memory. The objective is then committed
+            # together with the rest of the turn.
+            summary = await summarize_research_objective(
                 omi_session_id=omi_session.id,
+                final_objective=ro_ctx["final_objective"],
+                context_gathered=ro_ctx["information_gathered"],
+                pending_messages=turn.messages,
+            )
+            await turn.stage()
+            await save_research_objective(
+                turn.db,
                 exploration_id=exploration.id,
                 created_by=exploration.created_by,
-                final_objective=ro_ctx["final_objective"],
-                context_gathered = ro_ctx["information_gathered"],
+                summary=summary,
                 final_analysis=ro_ctx["final_analysis"],
                 confidence=ro_ctx["confidence_level"],
+                commit=False,
             )
 
             msg = (
@@ -610,8 +682,7 @@ async def chat_with_omi(
                 "I’ll carry this forward into personas."
             )
 
-            await add_message(
-                session_id=session_id,
+            turn.add_message(
                 role="omi",
                 content=msg,
                 message_type="chat",
@@ -636,24 +707,15 @@ async def chat_with_omi(
         ro_ctx["probe_round"] += 1
         ro_ctx["asked_components"].extend(missing)
 
-        await exp_service.increment_clarification_attempts(
-            exploration.id
-        )
+        turn.increment_clarification_attempts(exploration.id)
 
         session_context["research_objectives"] = ro_ctx
-        omi_session.context = session_context
-
-        flag_modified(omi_session, "context")
-
-        db.add(omi_session)
-        await db.commit()
-        await db.refresh(omi_session)
+        turn.update_context(session_context)
 
         # questions is now a single string paragraph, not an array
         question_text = questions
 
-        await add_message(
-            session_id=session_id,
+        turn.add_message(
             role="omi",
             content=question_text,
             message_type="chat",
@@ -989,10 +1051,9 @@ Return JSON only.
 
 import json
 from typing import Optional
-from openai import AsyncOpenAI
 
 # Use the same client everywhere
-client = AsyncOpenAI()
+client = async_openai_client()
 
 
 async def call_omi(
@@ -1,4 +1,6 @@
-from app.schemas.omi_workflow import OmiWorkflowResponse
+from typing import Callable, Dict, List, Optional
+
+from app.schemas.omi_workflow import OmiWorkflowEventIn, OmiWorkflowResponse
 from app.models.omi import OmiState, WorkflowStage
 
 
@@ -333,354 +335,267 @@ def omi_confirm_research_objective(payload: dict) -> OmiWorkflowResponse:
     )
 
 
-
-
-async def handle_omi_workflow_event(
-    event: str,
-    payload: dict
-) -> OmiWorkflowResponse:
-
-    if event == "WORKFLOW_LOADED":
-        return omi_explain_workflow()
-
-    # ------------------------------------
-
-    if event == "USER_TYPING":
-        return omi_user_typing()
-
-    if event == "USER_MESSAGE_SUBMITTED":
-        return omi_user_message_submitted()
-
-    # ------------------------------------------------
-    if event == "CREATE_PERSONA":
-        return omi_persona_create()
-
-    if event == "CREATE_PERSONA_OMI":
-        return omi_persona_create_omi()
-
-    if event == "PERSONA_SELECTED":
-        return omi_guide_persona_selection(payload)
-
-    if event == "SAMPLE_SIZE_FOCUS":
-        return omi_suggest_sample_size(payload)
-
-    if event == "SAMPLE_SIZE_ENTERED":
-        return omi_validate_sample_size(payload)
-
-    if event == "SAMPLE_SIZE_ACCEPTED":
-        return omi_ready_for_questionnaire(payload)
-
-    if event == "CREATE_QUESTIONNAIRE_CLICKED":
-        return omi_building_questionnaire()
-
-    if event == "QUESTIONNAIRE_RENDERED":
-        return omi_explain_questionnaire_format(payload)
-
-    if event == "QUESTION_EDITED":
-        return omi_ack_question_edited(payload)
-
-    if event == "QUESTION_REMOVED":
-        return omi_ack_question_removed(payload)
-
-    if event == "QUESTION_ADDED":
-        return omi_ack_question_added(payload)
-    if event == "ROLLOUT_CLICKED":
-        return omi_rollout_acknowledgement(payload)
-
-
-
-    if event == "INSIGHTS_PAGE_LOADED":
-        return omi_explain_insights_report()
-
-    if event == "INSIGHTS_GENERATION_STARTED":
-        return omi_insights_generation_started()
-
-    if event == "INSIGHTS_READY":
-        return omi_insights_ready(payload)
-
-    if event == "INSIGHTS_DOWNLOAD_CLICKED":
-        return omi_insights_downloaded()
-
-    if event == "SURVEY_REPORT_PAGE_LOADED":
-        return omi_explain_survey_quant_report(payload)
-
-    if event == "SURVEY_REPORT_READY":
-        return omi_survey_report_ready(payload)
-
-    if event == "SURVEY_REPORT_DOWNLOAD_PDF":
-        return omi_ack_pdf_download(payload)
-
-    if event == "SURVEY_REPORT_DOWNLOAD_DATA":
-        return omi_ack_data_download(payload)
-
-    if event == "REBUTTAL_MODE_SUGGESTED":
-        return omi_suggest_rebuttal_mode()
-
-    # ---------------------------------
-    if event == "REBUTTAL_PAGE_LOADED":
-        return omi_explain_rebuttal_generation(payload)
-
-    if event == "REBUTTAL_GENERATION_STARTED":
-        return omi_rebuttal_generation_started()
-
-    if event == "REBUTTAL_REPORT_READY":
-        return omi_rebuttal_report_ready(payload)
-
-    if event == "REBUTTAL_DOWNLOAD_PDF":
-        return omi_ack_rebuttal_pdf_download()
-
-
-    if event == "PERSONA_WORKFLOW_LOADED":
+def omi_trait_validation_result(payload: dict) -> OmiWorkflowResponse:
+    if not payload.get("valid"):
         return OmiWorkflowResponse(
             message=(
-                "Great, now that I understand your research objectives, "
-                "let’s start shaping your target personas—pixel by pixel.\n\n"
-                "We’ll walk through traits step by step to give each persona real depth."
+                "I noticed a clash in the traits you selected.\n"
+                f"{payload.get('issues', ['Some traits may conflict'])[0]}\n\n"
             ),
-            omi_state=OmiState.IDLE,
+            omi_state=OmiState.CONCERNED,
             visual_state="idle",
-            next_expected_event="TRAIT_SELECTION_STARTED"
+            warnings=payload.get("issues")
         )
 
-    if event == "TRAIT_SELECTION_STARTED":
-        return OmiWorkflowResponse(
-            message="Take a moment to paint the portrait of your persona with precise traits.",
-            omi_state=OmiState.LISTENING,
-            visual_state="notepad"
-        )
-
-    if event == "TRAIT_VALIDATION_RESULT":
-        if not payload.get("valid"):
-            return OmiWorkflowResponse(
-                message=(
-                    "I noticed a clash in the traits you selected.\n"
-                    f"{payload.get('issues', ['Some traits may conflict'])[0]}\n\n"
-                ),
-                omi_state=OmiState.CONCERNED,
-                visual_state="idle",
-                warnings=payload.get("issues")
-            )
+    return OmiWorkflowResponse(
+        message=(
+            "I like where this persona is going. "
+            "Let’s add more emotional rigor with the next set of traits."
+        ),
+        omi_state=OmiState.ENCOURAGING,
+        visual_state="idle",
+        next_expected_event="TRAIT_SELECTION_STARTED"
+    )
 
-        return OmiWorkflowResponse(
-            message=(
-                "I like where this persona is going. "
-                "Let’s add more emotional rigor with the next set of traits."
-            ),
-            omi_state=OmiState.ENCOURAGING,
-            visual_state="idle",
-            next_expected_event="TRAIT_SELECTION_STARTED"
-        )
 
-    if event == "BACKSTORY_STARTED":
+def omi_backstory_validation_result(payload: dict) -> OmiWorkflowResponse:
+    if not payload.get("valid"):
         return OmiWorkflowResponse(
             message=(
-                "We’re almost there — one final but most important step.Can you think of formative experiences that explain this persona’s worldview?"
+                "Something feels off in the backstory.\n"
+                f"{payload.get('issues', ['There may be a mismatch'])[0]}"
             ),
-            omi_state=OmiState.IDLE,
-            visual_state="idle"
-        )
-
-    if event == "BACKSTORY_VALIDATION_RESULT":
-        if not payload.get("valid"):
-            return OmiWorkflowResponse(
-                message=(
-                    "Something feels off in the backstory.\n"
-                    f"{payload.get('issues', ['There may be a mismatch'])[0]}"
-                ),
-                omi_state=OmiState.CONCERNED,
-                visual_state="idle",
-                warnings=payload.get("issues")
-            )
-
-        return OmiWorkflowResponse(
-            message="Excellent. Just sit back and let me bring this persona to life.",
-            omi_state=OmiState.WORKING,
-            visual_state="typing",
-            next_expected_event="PERSONA_CREATION_STARTED"
-        )
-
-    if event == "PERSONA_CREATION_STARTED":
-        return OmiWorkflowResponse(
-            message="Creating your persona…",
-            omi_state=OmiState.WORKING,
-            visual_state="typing"
-        )
-
-    if event == "PERSONA_CREATED":
-        return OmiWorkflowResponse(
-            message="Your persona is ready.",
-            omi_state=OmiState.IDLE,
-            visual_state="idle",
-            cta=["Add new persona", "Build discussion guide"]
-        )
-
-    if event == "ADD_NEW_PERSONA":
-        return OmiWorkflowResponse(
-            message="Let’s create another persona.",
-            omi_state=OmiState.IDLE,
+            omi_state=OmiState.CONCERNED,
             visual_state="idle",
-            next_expected_event="TRAIT_SELECTION_STARTED"
+            warnings=payload.get("issues")
         )
 
-    if event == "BUILD_DISCUSSION_GUIDE":
-        return OmiWorkflowResponse(
-            message="Great! Now let's build your discussion guide. I've started with some open-ended questions based on your research objective.",
-            omi_state=OmiState.WORKING,
-            visual_state="loading"
-        )
-
-    if event == "BUILD_DISCUSSION_GUIDE_LOAD":
-        return OmiWorkflowResponse(
-            message="Building your discussion guide now—this is where your research comes to life! I'm crafting open-ended questions that will spark genuine conversations with your personas. Just a moment..",
-            omi_state=OmiState.WORKING,
-            visual_state="loading"
-        )
-
-    if event == "BUILD_DISCUSSION_GUIDE_CREATED":
-        return OmiWorkflowResponse(
-            message="You can edit these, add new ones, or organize them into sections think of it as structuring the conversation flow with your persona",
-            omi_state=OmiState.WORKING,
-            visual_state="loading"
-        )
-
-    if event == "BUILD_DISCUSSION_GUIDE_C_QUES":
-        return OmiWorkflowResponse(
-            message="Nice! Question added. Your persona now has something thoughtful to respond to in this section.",
-            omi_state=OmiState.WORKING,
-            visual_state="loading"
-        )
-
-    if event == "BUILD_DISCUSSION_GUIDE_D_QUES":
-        return OmiWorkflowResponse(
-            message="Got it—question removed. Sharpening the focus like this helps your persona share more meaningful responses. Quality over quantity",
-            omi_state=OmiState.WORKING,
-            visual_state="loading"
-        )
-
-    if event == "BUILD_DISCUSSION_GUIDE_C_SECTION":
-        return OmiWorkflowResponse(
-            message="Perfect! New section created. This helps organize the conversation into clear themes—your persona will appreciate the structure.",
-            omi_state=OmiState.WORKING,
-            visual_state="loading"
-        )
-
-    if event == "BUILD_DISCUSSION_GUIDE_D_SECTION":
-        return OmiWorkflowResponse(
-            message="Noted—section removed. Sometimes fewer, sharper questions lead to richer insights. The conversation just got more focused.",
-            omi_state=OmiState.WORKING,
-            visual_state="loading"
-        )
-
-    if event == "ENTER_POPULATION":
-        return OmiWorkflowResponse(
-            message="Time to scale up! I'll create a diverse population based on your selected persona. Think of this as assembling a whole room of people who share your persona's core traits—each with their own unique perspectives.",
-            omi_state=OmiState.WORKING,
-            visual_state="loading"
-        )
-
-    if event == "BUILD_POPULATION":
-        return OmiWorkflowResponse(
-            message="Time to scale up! I'm creating a simulated population based on your personas—imagine a focus group that perfectly matches your target audience, ready to share their insights.",
-            omi_state=OmiState.WORKING,
-            visual_state="loading"
-        )
-
-    if event == "QUESTIONAIRE_BUILD":
-        return OmiWorkflowResponse(
-            message="Now for the quantitative side! I'm generating close-ended questions that directly test your research objective. Your persona—and the entire simulated population—will answer these, giving us measurable, actionable data.",
-            omi_state=OmiState.WORKING,
-            visual_state="loading"
-        )
-
-    if event == "SURVEY_SUCCESS":
-        return OmiWorkflowResponse(
-            message="Your insights are ready! Here's the complete survey report from your selected persona group. I've highlighted key patterns, notable responses, and actionable takeaways—everything you need to move forward with confidence.",
-            omi_state=OmiState.WORKING,
-            visual_state="loading"
-        )
-
-    if event == "SURVEY_LAUNCH":
-        return OmiWorkflowResponse(
-            message="Excellent! Your questionnaire is polished and ready to go. Think of this as your research rocket—all fueled up and waiting for your launch command. Ready to send it out to your simulated population?",
-            omi_state=OmiState.WORKING,
-            visual_state="loading"
-        )
-
-
-    if event == "RESEARCH_OBJECTIVE_INIT":
-        return OmiWorkflowResponse(
-            message="Share what’s on your mind. Big problem or fuzzy hunch. I’ll help turn it into a clear, ready-to-run research objective",
-            omi_state=OmiState.WORKING,
-            visual_state="Omi idle state motion"
-        )
-
-    if event == "USER_TYPING":
-        return OmiWorkflowResponse(
-            message="I’m listening closely…understanding what matters here, who this is for, and what we may need to sharpen",
-            omi_state=OmiState.WORKING,
-            visual_state="Omi’s pencil motion"
-        )
-
-    if event == "RESEARCH_OBJECTIVE_SUBMITTED":
-        return OmiWorkflowResponse(
-            message="Nice! That's a solid starting point. I’m breaking this down into research components and spotting what we may still want to clarify.",
-            omi_state=OmiState.WORKING,
-            visual_state="Omi’s keyboard motion"
-        )
-
-    if event == "RESEARCH_OBJECTIVE_FIRST_PROBE_AWAIT_RESPONSE":
-        return OmiWorkflowResponse(
-            message="This makes sense so far. I just want to clarify one piece to be sure I’m reading the underlying goal right",
-            omi_state=OmiState.WORKING,
-            visual_state="Omi’s pencil motion"
-        )
-
-    if event == "RESEARCH_OBJECTIVE_FIRST_PROBE_AFTER_RESPONSE":
-        return OmiWorkflowResponse(
-            message="Alright, this really helps! I’m piecing your inputs together now",
-            omi_state=OmiState.WORKING,
-            visual_state="Omi’s keyboard motion"
-        )
-
-    if event == "RESEARCH_OBJECTIVE_SECOND_PROBE_AWAIT_RESPONSE":
-        return OmiWorkflowResponse(
-            message="We’re almost there! Just a few quick clarifications and we’ll lock this in.",
-            omi_state=OmiState.WORKING,
-            visual_state="Omi’s pencil motion"
-        )
-
-    if event == "RESEARCH_OBJECTIVE_SECOND_PROBE_AFTER_RESPONSE":
-        return OmiWorkflowResponse(
-            message="Nice! I’ve got what I need. Pulling together a quick summary so we’re aligned.",
-            omi_state=OmiState.WORKING,
-            visual_state="Omi’s keyboard motion"
-        )
+    return OmiWorkflowResponse(
+        message="Excellent. Just sit back and let me bring this persona to life.",
+        omi_state=OmiState.WORKING,
+        visual_state="typing",
+        next_expected_event="PERSONA_CREATION_STARTED"
+    )
 
 
-    if event == "RESEARCH_OBJECTIVE_REFINING":
-        return OmiWorkflowResponse(
-            message="Good research starts with clarity. Help me understand key elements...",
-            omi_state=OmiState.WORKING,
-            visual_state="loading"
-        )
+# ============================================================================
+# EVENT REGISTRY
+# ============================================================================
+# Events whose response does not depend on the payload. They are built once at
+# import; OmiWorkflowResponse is frozen, so the same instance is safely shared.
+STATIC_RESPONSES: Dict[str, OmiWorkflowResponse] = {
+    "WORKFLOW_LOADED": omi_explain_workflow(),
+    "USER_TYPING": omi_user_typing(),
+    "USER_MESSAGE_SUBMITTED": omi_user_message_submitted(),
+    "CREATE_PERSONA": omi_persona_create(),
+    "CREATE_PERSONA_OMI": omi_persona_create_omi(),
+    "SAMPLE_SIZE_ACCEPTED": omi_ready_for_questionnaire({}),
+    "CREATE_QUESTIONNAIRE_CLICKED": omi_building_questionnaire(),
+    "QUESTIONNAIRE_RENDERED": omi_explain_questionnaire_format({}),
+    "ROLLOUT_CLICKED": omi_rollout_acknowledgement({}),
+    "INSIGHTS_PAGE_LOADED": omi_explain_insights_report(),
+    "INSIGHTS_GENERATION_STARTED": omi_insights_generation_started(),
+    "INSIGHTS_READY": omi_insights_ready({}),
+    "INSIGHTS_DOWNLOAD_CLICKED": omi_insights_downloaded(),
+    "SURVEY_REPORT_READY": omi_survey_report_ready({}),
+    "SURVEY_REPORT_DOWNLOAD_PDF": omi_ack_pdf_download({}),
+    "REBUTTAL_MODE_SUGGESTED": omi_suggest_rebuttal_mode(),
+    "REBUTTAL_PAGE_LOADED": omi_explain_rebuttal_generation({}),
+    "REBUTTAL_GENERATION_STARTED": omi_rebuttal_generation_started(),
+    "REBUTTAL_REPORT_READY": omi_rebuttal_report_ready({}),
+    "REBUTTAL_DOWNLOAD_PDF": omi_ack_rebuttal_pdf_download(),
+    "PERSONA_WORKFLOW_LOADED": OmiWorkflowResponse(
+        message=(
+            "Great, now that I understand your research objectives, "
+            "let’s start shaping your target personas—pixel by pixel.\n\n"
+            "We’ll walk through traits step by step to give each persona real depth."
+        ),
+        omi_state=OmiState.IDLE,
+        visual_state="idle",
+        next_expected_event="TRAIT_SELECTION_STARTED"
+    ),
+    "TRAIT_SELECTION_STARTED": OmiWorkflowResponse(
+        message="Take a moment to paint the portrait of your persona with precise traits.",
+        omi_state=OmiState.LISTENING,
+        visual_state="notepad"
+    ),
+    "BACKSTORY_STARTED": OmiWorkflowResponse(
+        message=(
+            "We’re almost there — one final but most important step.Can you think of formative experiences that explain this persona’s worldview?"
+        ),
+        omi_state=OmiState.IDLE,
+        visual_state="idle"
+    ),
+    "PERSONA_CREATION_STARTED": OmiWorkflowResponse(
+        message="Creating your persona…",
+        omi_state=OmiState.WORKING,
+        visual_state="typing"
+    ),
+    "PERSONA_CREATED": OmiWorkflowResponse(
+        message="Your persona is ready.",
+        omi_state=OmiState.IDLE,
+        visual_state="idle",
+        cta=["Add new persona", "Build discussion guide"]
+    ),
+    "ADD_NEW_PERSONA": OmiWorkflowResponse(
+        message="Let’s create another persona.",
+        omi_state=OmiState.IDLE,
+        visual_state="idle",
+        next_expected_event="TRAIT_SELECTION_STARTED"
+    ),
+    "BUILD_DISCUSSION_GUIDE": OmiWorkflowResponse(
+        message="Great! Now let's build your discussion guide. I've started with some open-ended questions based on your research objective.",
+        omi_state=OmiState.WORKING,
+        visual_state="loading"
+    ),
+    "BUILD_DISCUSSION_GUIDE_LOAD": OmiWorkflowResponse(
+        message="Building your discussion guide now—this is where your research comes to life! I'm crafting open-ended questions that will spark genuine conversations with your personas. Just a moment..",
+        omi_state=OmiState.WORKING,
+        visual_state="loading"
+    ),
+    "BUILD_DISCUSSION_GUIDE_CREATED": OmiWorkflowResponse(
+        message="You can edit these, add new ones, or organize them into sections think of it as structuring the conversation flow with your persona",
+        omi_state=OmiState.WORKING,
+        visual_state="loading"
+    ),
+    "BUILD_DISCUSSION_GUIDE_C_QUES": OmiWorkflowResponse(
+        message="Nice! Question added. Your persona now has something thoughtful to respond to in this section.",
+        omi_state=OmiState.WORKING,
+        visual_state="loading"
+    ),
+    "BUILD_DISCUSSION_GUIDE_D_QUES": OmiWorkflowResponse(
+        message="Got it—question removed. Sharpening the focus like this helps your persona share more meaningful responses. Quality over quantity",
+        omi_state=OmiState.WORKING,
+        visual_state="loading"
+    ),
+    "BUILD_DISCUSSION_GUIDE_C_SECTION": OmiWorkflowResponse(
+        message="Perfect! New section created. This helps organize the conversation into clear themes—your persona will appreciate the structure.",
+        omi_state=OmiState.WORKING,
+        visual_state="loading"
+    ),
+    "BUILD_DISCUSSION_GUIDE_D_SECTION": OmiWorkflowResponse(
+        message="Noted—section removed. Sometimes fewer, sharper questions lead to richer insights. The conversation just got more focused.",
+        omi_state=OmiState.WORKING,
+        visual_state="loading"
+    ),
+    "ENTER_POPULATION": OmiWorkflowResponse(
+        message="Time to scale up! I'll create a diverse population based on your selected persona. Think of this as assembling a whole room of people who share your persona's core traits—each with their own unique perspectives.",
+        omi_state=OmiState.WORKING,
+        visual_state="loading"
+    ),
+    "BUILD_POPULATION": OmiWorkflowResponse(
+        message="Time to scale up! I'm creating a simulated population based on your personas—imagine a focus group that perfectly matches your target audience, ready to share their insights.",
+        omi_state=OmiState.WORKING,
+        visual_state="loading"
+    ),
+    "QUESTIONAIRE_BUILD": OmiWorkflowResponse(
+        message="Now for the quantitative side! I'm generating close-ended questions that directly test your research objective. Your persona—and the entire simulated population—will answer these, giving us measurable, actionable data.",
+        omi_state=OmiState.WORKING,
+        visual_state="loading"
+    ),
+    "SURVEY_SUCCESS": OmiWorkflowResponse(
+        message="Your insights are ready! Here's the complete survey report from your selected persona group. I've highlighted key patterns, notable responses, and actionable takeaways—everything you need to move forward with confidence.",
+        omi_state=OmiState.WORKING,
+        visual_state="loading"
+    ),
+    "SURVEY_LAUNCH": OmiWorkflowResponse(
+        message="Excellent! Your questionnaire is polished and ready to go. Think of this as your research rocket—all fueled up and waiting for your launch command. Ready to send it out to your simulated population?",
+        omi_state=OmiState.WORKING,
+        visual_state="loading"
+    ),
+    "RESEARCH_OBJECTIVE_INIT": OmiWorkflowResponse(
+        message="Share what’s on your mind. Big problem or fuzzy hunch. I’ll help turn it into a clear, ready-to-run research objective",
+        omi_state=OmiState.WORKING,
+        visual_state="Omi idle state motion"
+    ),
+    "RESEARCH_OBJECTIVE_SUBMITTED": OmiWorkflowResponse(
+        message="Nice! That's a solid starting point. I’m breaking this down into research components and spotting what we may still want to clarify.",
+        omi_state=OmiState.WORKING,
+        visual_state="Omi’s keyboard motion"
+    ),
+    "RESEARCH_OBJECTIVE_FIRST_PROBE_AWAIT_RESPONSE": OmiWorkflowResponse(
+        message="This makes sense so far. I just want to clarify one piece to be sure I’m reading the underlying goal right",
+        omi_state=OmiState.WORKING,
+        visual_state="Omi’s pencil motion"
+    ),
+    "RESEARCH_OBJECTIVE_FIRST_PROBE_AFTER_RESPONSE": OmiWorkflowResponse(
+        message="Alright, this really helps! I’m piecing your inputs together now",
+        omi_state=OmiState.WORKING,
+        visual_state="Omi’s keyboard motion"
+    ),
+    "RESEARCH_OBJECTIVE_SECOND_PROBE_AWAIT_RESPONSE": OmiWorkflowResponse(
+        message="We’re almost there! Just a few quick clarifications and we’ll lock this in.",
+        omi_state=OmiState.WORKING,
+        visual_state="Omi’s pencil motion"
+    ),
+    "RESEARCH_OBJECTIVE_SECOND_PROBE_AFTER_RESPONSE": OmiWorkflowResponse(
+        message="Nice! I’ve got what I need. Pulling together a quick summary so we’re aligned.",
+        omi_state=OmiState.WORKING,
+        visual_state="Omi’s keyboard motion"
+    ),
+    "RESEARCH_OBJECTIVE_REFINING": OmiWorkflowResponse(
+        message="Good research starts with clarity. Help me understand key elements...",
+        omi_state=OmiState.WORKING,
+        visual_state="loading"
+    ),
+    "RESEARCH_OBJECTIVE_SUMMARY_SHOWCASE": OmiWorkflowResponse(
+        message="This is the summary of what we’ve shaped together.Next up: building personas that truly fit your research objective.",
+        omi_state=OmiState.WORKING,
+        visual_state="Micro celebration motion"
+    ),
+    "RESEARCH_OBJECTIVE_USER_CLICKS_ON_NEXT/PERSONA_BUILDER": OmiWorkflowResponse(
+        message="",
+        omi_state=OmiState.WORKING,
+        visual_state="OMI PAGE LOADING MOTION"
+    ),
+}
+
+# Events whose response is built from the payload.
+PAYLOAD_HANDLERS: Dict[str, Callable[[dict], OmiWorkflowResponse]] = {
+    "PERSONA_SELECTED": omi_guide_persona_selection,
+    "SAMPLE_SIZE_FOCUS": omi_suggest_sample_size,
+    "SAMPLE_SIZE_ENTERED": omi_validate_sample_size,
+    "QUESTION_EDITED": omi_ack_question_edited,
+    "QUESTION_REMOVED": omi_ack_question_removed,
+    "QUESTION_ADDED": omi_ack_question_added,
+    "SURVEY_REPORT_PAGE_LOADED": omi_explain_survey_quant_report,
+    "SURVEY_REPORT_DOWNLOAD_DATA": omi_ack_data_download,
+    "TRAIT_VALIDATION_RESULT": omi_trait_validation_result,
+    "BACKSTORY_VALIDATION_RESULT": omi_backstory_validation_result,
+}
+
+DEFAULT_RESPONSE = OmiWorkflowResponse(
+    message="Hi! I'm Omi. Let's go ahead and structure your research. What's your main question or idea?",
+    omi_state=OmiState.IDLE,
+    visual_state="idle"
+)
+
+
+def resolve_omi_workflow_event(event: str, payload: Optional[dict]) -> OmiWorkflowResponse:
+    """O(1) lookup: shared precomputed response, payload handler, or the default greeting."""
+    static = STATIC_RESPONSES.get(event)
+    if static is not None:
+        return static
+
+    handler = PAYLOAD_HANDLERS.get(event)
+    if handler is not None:
+        return handler(payload or {})
+
+    return DEFAULT_RESPONSE
 
-    if event == "RESEARCH_OBJECTIVE_SUMMARY_SHOWCASE":
-        return OmiWorkflowResponse(
-            message="This is the summary of what we’ve shaped together.Next up: building personas that truly fit your research objective.",
-            omi_state=OmiState.WORKING,
-            visual_state="Micro celebration motion"
-        )
 
-    if event == "RESEARCH_OBJECTIVE_USER_CLICKS_ON_NEXT/PERSONA_BUILDER":
-        return OmiWorkflowResponse(
-            message="",
-            omi_state=OmiState.WORKING,
-            visual_state="OMI PAGE LOADING MOTION"
-        )
+async def handle_omi_workflow_event(
+    event: str,
+    payload: dict
+) -> OmiWorkflowResponse:
+    return resolve_omi_workflow_event(event, payload)
 
 
-    return OmiWorkflowResponse(
-        message="Hi! I'm Omi. Let's go ahead and structure your research. What's your main question or idea?",
-        omi_state=OmiState.IDLE,
-        visual_state="idle"
-    )
+async def handle_omi_workflow_events(
+    events: List[OmiWorkflowEventIn]
+) -> List[OmiWorkflowResponse]:
+    """Resolves a batch of coalesced UI events, preserving their order."""
+    return [
+        resolve_omi_workflow_event(item.event, item.payload)
+        for item in events
+    ]
@@ -7,16 +7,19 @@ from typing import Optional, List, Dict
 from datetime import datetime
 from app.utils.id_generator import generate_id
 import json
-from openai import AsyncOpenAI
-from app.config import OPENAI_API_KEY
+from app.utils.llm_clients import async_openai_client
 from app.services.omi import build_persona_validation_prompt, PERSONA_VALIDATION_SYSTEM_PROMPT
 from app.services.omi import call_omi
+from app.services.persona_derivatives import schedule_persona_derivatives
+from app.services.persona_context import (
+    invalidate_persona_context, persona_prompt_block, refresh_persona_context
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.models.persona import Persona
 
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+client = async_openai_client()
 
     
 def to_list(value):
@@ -93,7 +96,16 @@ async def create_persona(workspace_id: str, user_id: str, data: PersonaCreate) -
         await session.commit()
         await session.refresh(p)
 
-        return persona_to_dict(p)
+    schedule_persona_derivatives(p.id)
+    return persona_to_dict(p)
+
+def _invalidate_persona_caches(persona_id: str) -> None:
+    # rebuttal imports this module; import it here to avoid the cycle
+    from app.services.rebuttal import invalidate_rebuttal_context
+
+    invalidate_persona_context(persona_id)
+    invalidate_rebuttal_context(persona_id=persona_id)
+
 
 def persona_to_dict(p: Persona) -> dict:
 
@@ -198,10 +210,15 @@ async def update_persona(persona_id: str, data: dict):
             persona_details[field] = value
 
         p.persona_details = persona_details
+        refresh_persona_context(p)
 
         await session.commit()
         await session.refresh(p)
-        return p
+
+    _invalidate_persona_caches(persona_id)
+    # Confidence / OCEAN are refreshed in the background only if their traits changed
+    schedule_persona_derivatives(persona_id)
+    return p
 
 
 async def delete_persona(persona_id: str) -> bool:
@@ -217,7 +234,8 @@ async def delete_persona(persona_id: str) -> bool:
         await session.delete(p)
         await session.commit()
 
-        return True
+    _invalidate_persona_caches(persona_id)
+    return True
 async def total_sample_size(workspace_id: str, exploration_id: str) -> int:
     async with AsyncSession(async_engine) as session:
 
@@ -232,7 +250,7 @@ async def total_sample_size(workspace_id: str, exploration_id: str) -> int:
         return sum(r.sample_size for r in rows)
 
 async def generate_persona_confidence(persona: dict, research_objective: str = "") -> dict:
-    persona_json = safe_json(persona)
+    persona_json = persona_prompt_block(persona)
 
     prompt = f"""
 You are a senior-level consumer insights & market research evaluator. 
@@ -305,17 +323,15 @@ NO text outside JSON. NO markdown. NO explanations.
 
     raw = res.choices[0].message.content
 
+    # Raised rather than returning a placeholder score: the result is stored,
+    # and a failure is recorded and retried by persona_derivatives.
     try:
-        return json.loads(raw)
-    except Exception:
-        return {
-            "score": "0%",
-            "stars": 1.0,
-            "reliability": "Low",
-            "strengths": [],
-            "weaknesses": ["Persona scoring failed due to formatting"],
-            "improvements": "Ensure persona fields are complete and formatting is correct."
-        }
+        scoring = json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"Persona confidence response is not valid JSON: {e}")
+    if not isinstance(scoring, dict):
+        raise ValueError("Persona confidence response is not a JSON object")
+    return scoring
 
 def persona_preview_from_dict(p, full_persona_info, confidence=None):
 
@@ -352,7 +368,7 @@ def persona_preview_from_dict(p, full_persona_info, confidence=None):
     confidence = confidence or "N/A"
 
     if full_persona_info:
-        full_persona_info.pop("confidence_scoring")
+        full_persona_info.pop("confidence_scoring", None)
         traits = full_persona_info
 
     else:
@@ -577,9 +593,11 @@ async def update_persona_backstory(
         raise ValueError("Persona not found")
 
     persona.backstory = backstory
+    refresh_persona_context(persona)
     session.add(persona)
     await session.commit()
     await session.refresh(persona)
+    _invalidate_persona_caches(persona_id)
 
     return persona
 
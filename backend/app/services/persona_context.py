@@ -0,0 +1,152 @@
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.db import async_engine
+from app.models.persona import Persona
+
+
+# Bump when the rendering below changes so persisted blocks are re-rendered.
+PROMPT_CONTEXT_VERSION = "v1"
+
+PERSONA_CONTEXT_CACHE_SIZE = 512
+# Bounds staleness across worker processes; same-process edits invalidate directly.
+PERSONA_CONTEXT_TTL_SECONDS = 300
+
+# Audit / bookkeeping fields that never belong in a prompt.
+EXCLUDED_FIELDS = {
+    "created_by", "created_at", "workspace_id", "exploration_id",
+    "auto_generated_persona", "persona_details",
+}
+# Generator output kept in persona_details that is noise for role-play prompts.
+EXCLUDED_DETAIL_FIELDS = {
+    "id", "reference_sites_with_usage", "researched_sites", "confidence_scoring",
+    "auto_generated_persona",
+}
+
+_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def _default(o):
+    if isinstance(o, datetime):
+        return o.isoformat()
+    return str(o)
+
+
+def compact_persona(persona: dict) -> dict:
+    """Canonical prompt view of a persona: traits first, then extra generated details."""
+    out = {k: v for k, v in persona.items() if k not in EXCLUDED_FIELDS and v not in (None, "", [], {})}
+    for k, v in (persona.get("persona_details") or {}).items():
+        if k in EXCLUDED_DETAIL_FIELDS or k in out or v in (None, "", [], {}):
+            continue
+        out[k] = v
+    return out
+
+
+def render_persona_full(persona: dict) -> str:
+    return json.dumps(compact_persona(persona), indent=2, default=_default)
+
+
+def render_persona_summary(persona: dict) -> str:
+    return (
+        f"Demographics: {persona.get('age_range', 'N/A')}, {persona.get('occupation', 'N/A')}\n"
+        f"Key Traits: {persona.get('lifestyle', 'N/A')}, Values: {persona.get('values', 'N/A')}"
+    )
+
+
+def build_prompt_context(persona: dict) -> Dict[str, Any]:
+    return {
+        "version": PROMPT_CONTEXT_VERSION,
+        "name": persona.get("name"),
+        "full": render_persona_full(persona),
+        "summary": render_persona_summary(persona),
+    }
+
+
+def _cache_get(persona_id: str) -> Optional[Dict[str, Any]]:
+    hit = _cache.get(persona_id)
+    if not hit or time.monotonic() - hit[0] > PERSONA_CONTEXT_TTL_SECONDS:
+        return None
+    _cache.move_to_end(persona_id)
+    return hit[1]
+
+
+def _cache_put(persona_id: str, context: Dict[str, Any]) -> None:
+    _cache[persona_id] = (time.monotonic(), context)
+    _cache.move_to_end(persona_id)
+    while len(_cache) > PERSONA_CONTEXT_CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
+def invalidate_persona_context(persona_id: Optional[str] = None) -> None:
+    if persona_id is None:
+        _cache.clear()
+    else:
+        _cache.pop(persona_id, None)
+
+
+def refresh_persona_context(p: Persona) -> None:
+    """
+    Re-renders the persisted block on a persona row that is about to be
+    committed. Call invalidate_persona_context once the commit went through.
+    """
+    from app.services.persona import persona_to_dict
+
+    p.prompt_context = build_prompt_context(persona_to_dict(p))
+
+
+def persona_prompt_block(persona: dict, variant: str = "full") -> str:
+    """
+    Prompt rendering for a persona dict the caller already holds. Stored
+    personas (with an id) go through the cache; ad-hoc dicts such as the
+    rebuttal "Combined Group" are rendered directly.
+    """
+    persona_id = persona.get("id")
+    if not persona_id or persona.get("personas") is not None:
+        return build_prompt_context(persona)[variant]
+
+    context = _cache_get(persona_id)
+    if context is None:
+        context = build_prompt_context(persona)
+        # Only full persona_to_dict() views are canonical enough to share.
+        if "persona_details" in persona:
+            _cache_put(persona_id, context)
+    return context[variant]
+
+
+async def get_persona_prompt_block(persona_id: Optional[str], variant: str = "full") -> Optional[str]:
+    """
+    Prompt rendering of a stored persona by id: in-process LRU first, then
+    the block persisted on the row, rendering (and persisting) it if missing.
+    """
+    if not persona_id:
+        return None
+
+    context = _cache_get(persona_id)
+    if context is not None:
+        return context[variant]
+
+    async with AsyncSession(async_engine) as session:
+        res = await session.execute(select(Persona).where(Persona.id == persona_id))
+        p = res.scalars().first()
+        if not p:
+            return None
+
+        context = p.prompt_context
+        if not context or context.get("version") != PROMPT_CONTEXT_VERSION:
+            from app.services.persona import persona_to_dict
+
+            context = build_prompt_context(persona_to_dict(p))
+            await session.execute(
+                update(Persona).where(Persona.id == persona_id).values(prompt_context=context)
+            )
+            await session.commit()
+
+    _cache_put(persona_id, context)
+    return context[variant]
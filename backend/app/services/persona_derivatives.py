@@ -0,0 +1,263 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import flag_modified
+from sqlmodel import select
+
+from app.db import async_engine
+from app.models.persona import Persona
+from app.utils.fingerprint import fingerprint
+
+
+# Bump when the confidence / OCEAN prompts change so stored values are recomputed.
+DERIVATIVES_VERSION = "v1"
+
+# After a failed refresh, previews wait this long before retrying, doubling
+# per consecutive failure up to the max.
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 3600
+
+# Traits each derivative depends on. A derivative is only recomputed when
+# one of its inputs changes (or the version above is bumped).
+CONFIDENCE_INPUT_FIELDS = (
+    "name", "age_range", "gender",
+    "location_country", "location_state", "education_level", "occupation",
+    "income_range", "family_size", "geography",
+    "lifestyle", "values", "personality", "interests", "motivations",
+    "brand_sensitivity", "price_sensitivity",
+    "mobility", "accommodation", "marital_status", "daily_rhythm",
+    "hobbies", "professional_traits", "digital_activity", "preferences",
+)
+
+OCEAN_INPUT_FIELDS = (
+    "age_range", "gender", "income_range", "geography", "location_country",
+    "occupation", "lifestyle", "values", "motivations",
+    "brand_sensitivity", "price_sensitivity", "digital_activity",
+)
+
+_running: Dict[str, asyncio.Task] = {}
+_rerun: Set[str] = set()
+
+
+def _inputs(p: Persona, fields) -> Dict[str, Any]:
+    return {f: getattr(p, f, None) for f in fields}
+
+
+def build_ocean_user_prompt(p: Persona) -> str:
+    return json.dumps({
+        "persona_data": {
+            "age_range": p.age_range,
+            "gender": p.gender,
+            "income_range": p.income_range,
+            "location": p.geography or p.location_country,
+            "occupation": p.occupation,
+            "lifestyle": p.lifestyle,
+            "values": p.values,
+            "motivations": p.motivations,
+            "brand_sensitivity": p.brand_sensitivity,
+            "price_sensitivity": p.price_sensitivity,
+            "digital_activity": p.digital_activity
+        }
+    })
+
+
+def input_fingerprints(p: Persona) -> Dict[str, str]:
+    return {
+        "confidence": fingerprint(_inputs(p, CONFIDENCE_INPUT_FIELDS)),
+        "ocean": fingerprint(_inputs(p, OCEAN_INPUT_FIELDS)),
+    }
+
+
+def stale_derivatives(p: Persona) -> List[str]:
+    """Derivatives that are missing, from an older version, or computed from different traits."""
+    meta = p.derivatives_meta or {}
+    fingerprints = input_fingerprints(p)
+    details = p.persona_details or {}
+    current = {
+        "confidence": bool(details.get("confidence_scoring")),
+        "ocean": bool(p.ocean_profile),
+    }
+
+    stale = []
+    for name, fp in fingerprints.items():
+        entry = meta.get(name) or {}
+        if not current[name]:
+            stale.append(name)
+        elif not entry:
+            # Value generated together with the persona and never stamped:
+            # trust it and record its inputs instead of paying for a recompute.
+            continue
+        elif entry.get("version") != DERIVATIVES_VERSION or entry.get("fingerprint") != fp:
+            stale.append(name)
+    return stale
+
+
+def retry_due(p: Persona, now: Optional[datetime] = None) -> bool:
+    """
+    False while every stale derivative failed recently for the same traits,
+    so a preview polled in a loop does not restart a failing refresh each time.
+    """
+    now = now or datetime.utcnow()
+    failures = (p.derivatives_meta or {}).get("failures") or {}
+    fingerprints = input_fingerprints(p)
+    for name in stale_derivatives(p):
+        failure = failures.get(name)
+        if not failure or failure.get("fingerprint") != fingerprints[name]:
+            return True
+        wait = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (failure.get("attempts", 1) - 1))
+        if (now - datetime.fromisoformat(failure["last_attempt_at"])).total_seconds() >= wait:
+            return True
+    return False
+
+
+async def _compute_confidence(p: Persona) -> Optional[dict]:
+    from app.services.persona import generate_persona_confidence, persona_to_dict
+
+    # the full persona is scored; CONFIDENCE_INPUT_FIELDS only decides when to rescore
+    try:
+        return await generate_persona_confidence(persona_to_dict(p))
+    except Exception as e:
+        print(f"Persona confidence generation failed for {p.id}: {e}")
+        return None
+
+
+async def _compute_ocean(p: Persona) -> Optional[dict]:
+    from app.services.omi import call_omi, load_persona_builder_prompt
+
+    ocean_profile = await call_omi(
+        system_prompt=load_persona_builder_prompt(),
+        user_prompt=build_ocean_user_prompt(p),
+        response_format="json"
+    )
+    if not isinstance(ocean_profile, dict) or ocean_profile.get("error"):
+        print(f"OCEAN profile generation failed for {p.id}: {ocean_profile}")
+        return None
+    return ocean_profile
+
+
+async def refresh_persona_derivatives(persona_id: str, force: bool = False) -> List[str]:
+    """
+    Recomputes the stale derivatives of a persona concurrently and persists
+    them with their version and input fingerprint. Failures are recorded in
+    derivatives_meta["failures"] for retry_due. Returns the names of the
+    derivatives that were written.
+    """
+    # No session is held across the LLM calls: read, compute, then write in
+    # a fresh session.
+    async with AsyncSession(async_engine) as session:
+        res = await session.execute(select(Persona).where(Persona.id == persona_id))
+        p = res.scalars().first()
+    if not p:
+        return []
+
+    fingerprints = input_fingerprints(p)
+    stale = list(fingerprints) if force else stale_derivatives(p)
+
+    computed: Dict[str, Optional[dict]] = {}
+    if stale:
+        jobs = {"confidence": _compute_confidence, "ocean": _compute_ocean}
+        results = await asyncio.gather(*(jobs[name](p) for name in stale), return_exceptions=True)
+        for name, result in zip(stale, results):
+            if isinstance(result, Exception):
+                print(f"Persona {name} generation failed for {persona_id}: {result}")
+                result = None
+            computed[name] = result
+
+    async with AsyncSession(async_engine) as session:
+        # Re-read so edits made while the LLM calls were running are not lost;
+        # results computed from outdated traits are dropped.
+        res = await session.execute(select(Persona).where(Persona.id == persona_id))
+        p = res.scalars().first()
+        if not p:
+            return []
+        latest = input_fingerprints(p)
+
+        meta = dict(p.derivatives_meta or {})
+        failures = dict(meta.get("failures") or {})
+        written = []
+        failed = []
+        now = datetime.utcnow().isoformat()
+        for name, fp in fingerprints.items():
+            if latest[name] != fp:
+                continue
+            value = computed.get(name)
+            if name in stale and value is None:
+                previous = failures.get(name) or {}
+                attempts = previous.get("attempts", 0) + 1 if previous.get("fingerprint") == fp else 1
+                failures[name] = {"fingerprint": fp, "attempts": attempts, "last_attempt_at": now}
+                failed.append(name)
+                continue
+            failures.pop(name, None)
+
+            if name == "confidence" and value is not None:
+                details = dict(p.persona_details or {})
+                details["confidence_scoring"] = value
+                p.persona_details = details
+                flag_modified(p, "persona_details")
+            elif name == "ocean" and value is not None:
+                p.ocean_profile = value
+                flag_modified(p, "ocean_profile")
+
+            if name in stale or not meta.get(name):
+                meta[name] = {"version": DERIVATIVES_VERSION, "fingerprint": fp, "computed_at": now}
+                written.append(name)
+
+        if written or failed:
+            if failures:
+                meta["failures"] = failures
+            else:
+                meta.pop("failures", None)
+            p.derivatives_meta = meta
+            flag_modified(p, "derivatives_meta")
+            session.add(p)
+            await session.commit()
+
+        return written
+
+
+def schedule_persona_derivatives(persona_id: str) -> None:
+    """
+    Starts a background refresh for the persona. Called after every
+    create/update so the preview never waits on an LLM. If a refresh is
+    already running it is re-run once it finishes, so an edit made mid-flight
+    is not missed.
+    """
+    task = _running.get(persona_id)
+    if task and not task.done():
+        _rerun.add(persona_id)
+        return
+
+    async def runner():
+        try:
+            while True:
+                _rerun.discard(persona_id)
+                try:
+                    await refresh_persona_derivatives(persona_id)
+                except Exception as e:
+                    print(f"Persona derivative refresh failed for {persona_id}: {e}")
+                if persona_id not in _rerun:
+                    break
+        finally:
+            _running.pop(persona_id, None)
+
+    _running[persona_id] = asyncio.create_task(runner())
+
+
+async def get_persona_with_derivatives(persona_id: str) -> Optional[dict]:
+    """Persona dict plus its stored OCEAN profile and derivative status; DB read only."""
+    from app.services.persona import persona_to_dict
+
+    async with AsyncSession(async_engine) as session:
+        res = await session.execute(select(Persona).where(Persona.id == persona_id))
+        p = res.scalars().first()
+        if not p:
+            return None
+
+        data = persona_to_dict(p)
+        data["ocean_profile"] = p.ocean_profile
+        data["derivatives_status"] = "pending" if stale_derivatives(p) else "ready"
+        data["derivatives_retry_due"] = data["derivatives_status"] == "pending" and retry_due(p)
+        return data
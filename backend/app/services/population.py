@@ -7,11 +7,10 @@ from app.models.population import PopulationSimulation
 from app.models.research_objectives import ResearchObjectives
 from app.services.persona import get_persona
 from app.utils.id_generator import generate_id
-from app.config import OPENAI_API_KEY
-from openai import AsyncOpenAI
+from app.utils.llm_clients import async_openai_client
 from datetime import datetime
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+client = async_openai_client()
 
 
 def _normalize_score(v):
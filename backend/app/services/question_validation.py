@@ -0,0 +1,316 @@
+"""
+Validation of interview guide edits (add / edit / delete question).
+
+Each section is turned into a small hashed TF-IDF index (theme description
+plus its questions) held in memory. Clear cases are decided locally:
+duplicates are rejected, on-theme open questions and edits that only touch
+stopwords or punctuation are accepted, and deleting a question that another one already covers is
+allowed. Only the ambiguous rest goes to the LLM validators in
+auto_generated_persona. Verdicts are cached by (section version, action,
+question text), where the version is a fingerprint of the section content,
+so repeated checks against an unchanged section never call the LLM twice.
+"""
+import re
+import time
+import zlib
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.config import (
+    QUESTION_VALIDATION_LOCAL,
+    QUESTION_THEME_ACCEPT_SIMILARITY,
+    QUESTION_DUPLICATE_SIMILARITY,
+)
+from app.db import async_engine
+from app.models.interview import InterviewSection, InterviewQuestion
+from app.services.auto_generated_persona import (
+    get_description,
+    llm_validate_new_question,
+    llm_validate_question_edit,
+    llm_validate_question_delete,
+)
+from app.utils.fingerprint import fingerprint
+
+
+N_FEATURES = 1 << 12
+# Above this a new question overlaps a sibling too much to accept without review.
+REDUNDANCY_REVIEW_SIMILARITY = 0.6
+
+SECTION_CACHE_SIZE = 256
+SECTION_CACHE_TTL_SECONDS = 300
+VERDICT_CACHE_SIZE = 2048
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "for", "with", "at", "by", "from",
+    "is", "are", "was", "were", "be", "been", "do", "does", "did", "you", "your", "yours", "i", "me",
+    "my", "we", "our", "it", "its", "this", "that", "these", "those", "as", "if", "so", "can", "could",
+    "would", "should", "will", "have", "has", "had", "any", "some", "about", "into", "than", "then",
+}
+_OPEN_STARTERS = (
+    "how", "what", "why", "describe", "tell", "walk", "share", "explain", "talk", "in what",
+)
+
+_sections: "OrderedDict[str, Tuple[float, SectionIndex]]" = OrderedDict()
+_question_sections: Dict[str, str] = {}
+_verdicts: "OrderedDict[tuple, Tuple[bool, str]]" = OrderedDict()
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_TOKEN_RE.findall((text or "").lower()))
+
+
+def _tokens(text: str) -> List[str]:
+    words = [w for w in _TOKEN_RE.findall((text or "").lower()) if w not in _STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _counts(text: str) -> np.ndarray:
+    vec = np.zeros(N_FEATURES, dtype=np.float32)
+    for token in _tokens(text):
+        vec[zlib.crc32(token.encode("utf-8")) & (N_FEATURES - 1)] += 1.0
+    return vec
+
+
+def _unit(vec: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+def _looks_open_ended(text: str) -> bool:
+    t = _normalize(text)
+    return t.startswith(_OPEN_STARTERS) and (text or "").count("?") <= 1
+
+
+class SectionIndex:
+    """Hashed TF-IDF vectors of one guide section (theme + questions)."""
+
+    def __init__(self, section_id: str, objective: str, theme: str, questions: List[Tuple[str, str]]):
+        self.section_id = section_id
+        self.objective = objective or ""
+        self.theme = theme or ""
+        self.questions = questions
+        self.version = fingerprint({"objective": self.objective, "theme": self.theme, "questions": questions})
+
+        docs = np.stack([_counts(self.theme)] + [_counts(text) for _, text in questions])
+        df = (docs > 0).sum(axis=0)
+        self.idf = (np.log((1.0 + len(docs)) / (1.0 + df)) + 1.0).astype(np.float32)
+
+        self.theme_vec = self.vector(self.theme)
+        self.question_matrix = (
+            np.stack([self.vector(text) for _, text in questions])
+            if questions else np.zeros((0, N_FEATURES), dtype=np.float32)
+        )
+        self.centroid = _unit(self.question_matrix.sum(axis=0)) if questions else self.theme_vec
+
+    def vector(self, text: str) -> np.ndarray:
+        return _unit(np.log1p(_counts(text)) * self.idf)
+
+    def question_text(self, question_id: str) -> Optional[str]:
+        for qid, text in self.questions:
+            if qid == question_id:
+                return text
+        return None
+
+    def theme_similarity(self, vec: np.ndarray) -> float:
+        return max(float(self.theme_vec @ vec), float(self.centroid @ vec))
+
+    def closest_sibling(self, vec: np.ndarray, exclude: Optional[str] = None) -> Tuple[float, Optional[str]]:
+        best, best_text = 0.0, None
+        if not self.questions:
+            return best, best_text
+        sims = self.question_matrix @ vec
+        for (qid, text), sim in zip(self.questions, sims):
+            if qid != exclude and float(sim) > best:
+                best, best_text = float(sim), text
+        return best, best_text
+
+
+# -----------------------------------------
+# Caches
+# -----------------------------------------
+
+def invalidate_section(section_id: Optional[str]) -> None:
+    """Drop the cached index of a section after its theme or questions changed."""
+    if not section_id:
+        return
+    hit = _sections.pop(section_id, None)
+    if hit:
+        for qid, _ in hit[1].questions:
+            _question_sections.pop(qid, None)
+
+
+async def _load_section(section_id: str, exploration_id: str) -> Optional[SectionIndex]:
+    hit = _sections.get(section_id)
+    if hit and time.monotonic() - hit[0] <= SECTION_CACHE_TTL_SECONDS:
+        _sections.move_to_end(section_id)
+        return hit[1]
+
+    async with AsyncSession(async_engine) as session:
+        theme = (await session.execute(
+            select(InterviewSection.description).where(InterviewSection.id == section_id)
+        )).scalar_one_or_none()
+        rows = (await session.execute(
+            select(InterviewQuestion.id, InterviewQuestion.text)
+            .where(InterviewQuestion.section_id == section_id)
+            .order_by(InterviewQuestion.id)
+        )).all()
+    objective = await get_description(exploration_id)
+
+    index = SectionIndex(section_id, objective, theme, [(r.id, r.text) for r in rows])
+    invalidate_section(section_id)
+    _sections[section_id] = (time.monotonic(), index)
+    for qid, _ in index.questions:
+        _question_sections[qid] = section_id
+    while len(_sections) > SECTION_CACHE_SIZE:
+        _, (_, old) = _sections.popitem(last=False)
+        for qid, _ in old.questions:
+            _question_sections.pop(qid, None)
+    return index
+
+
+async def _section_of_question(question_id: str) -> Optional[str]:
+    section_id = _question_sections.get(question_id)
+    if section_id:
+        return section_id
+    async with AsyncSession(async_engine) as session:
+        return (await session.execute(
+            select(InterviewQuestion.section_id).where(InterviewQuestion.id == question_id)
+        )).scalar_one_or_none()
+
+
+def _verdict_get(key: tuple) -> Optional[Tuple[bool, str]]:
+    hit = _verdicts.get(key)
+    if hit is not None:
+        _verdicts.move_to_end(key)
+    return hit
+
+
+def _verdict_put(key: tuple, verdict: Tuple[bool, str]) -> Tuple[bool, str]:
+    _verdicts[key] = verdict
+    _verdicts.move_to_end(key)
+    while len(_verdicts) > VERDICT_CACHE_SIZE:
+        _verdicts.popitem(last=False)
+    return verdict
+
+
+# -----------------------------------------
+# Local decisions (None = ambiguous, ask the LLM)
+# -----------------------------------------
+
+def _decide_new(index: SectionIndex, text: str) -> Optional[Tuple[bool, str]]:
+    norm = _normalize(text)
+    for _, existing in index.questions:
+        if _normalize(existing) == norm:
+            return False, f'This question already exists in the theme: "{existing}".'
+
+    vec = index.vector(text)
+    sibling_sim, sibling = index.closest_sibling(vec)
+    if sibling_sim >= QUESTION_DUPLICATE_SIMILARITY:
+        return False, f'This question duplicates an existing question in the theme: "{sibling}".'
+
+    if (
+        index.theme_similarity(vec) >= QUESTION_THEME_ACCEPT_SIMILARITY
+        and sibling_sim < REDUNDANCY_REVIEW_SIMILARITY
+        and _looks_open_ended(text)
+    ):
+        return True, "The question is open-ended, on-theme and adds a new angle to this section."
+    return None
+
+
+def _decide_edit(index: SectionIndex, original: str, modified: str) -> Optional[Tuple[bool, str]]:
+    # Only edits that provably keep the meaning are decided here. A single
+    # changed content word can invert a question (most -> least, trust ->
+    # don't trust) while the text stays almost identical, so those go to the LLM.
+    a, b = _normalize(original).split(), _normalize(modified).split()
+    if a == b:
+        return True, "The change only affects formatting; the question is unchanged."
+    changed = set()
+    for op, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if op != "equal":
+            changed.update(a[i1:i2], b[j1:j2])
+    if changed <= _STOPWORDS:
+        return True, "Minor wording edit; the question keeps its intent and theme alignment."
+    return None
+
+
+def _decide_delete(index: SectionIndex, question_id: str, text: str) -> Optional[Tuple[bool, str]]:
+    sibling_sim, sibling = index.closest_sibling(index.vector(text), exclude=question_id)
+    if sibling_sim >= QUESTION_DUPLICATE_SIMILARITY:
+        return True, f'Safe to delete: the theme is still covered by "{sibling}".'
+    return None
+
+
+# -----------------------------------------
+# Entry points (same contract as the LLM validators: (valid_or_not, reason))
+# -----------------------------------------
+
+async def validate_new_question(section_id: str, payload) -> Tuple[bool, str]:
+    index = await _load_section(section_id, payload.exploration_id)
+    key = (index.version, "add", _normalize(payload.text))
+    cached = _verdict_get(key)
+    if cached is not None:
+        return cached
+
+    if QUESTION_VALIDATION_LOCAL:
+        local = _decide_new(index, payload.text)
+        if local is not None:
+            return _verdict_put(key, local)
+
+    verdict = await llm_validate_new_question(
+        index.objective, index.theme, [text for _, text in index.questions], payload.text
+    )
+    return _verdict_put(key, verdict)
+
+
+async def validate_question_edit(question_id: str, payload) -> Tuple[bool, str]:
+    section_id = await _section_of_question(question_id)
+    if not section_id:
+        return True, ""
+    index = await _load_section(section_id, payload.exploration_id)
+    original = index.question_text(question_id)
+    if original is None:
+        return True, ""
+
+    key = (index.version, "edit", question_id, _normalize(payload.text))
+    cached = _verdict_get(key)
+    if cached is not None:
+        return cached
+
+    if QUESTION_VALIDATION_LOCAL:
+        local = _decide_edit(index, original, payload.text)
+        if local is not None:
+            return _verdict_put(key, local)
+
+    verdict = await llm_validate_question_edit(index.objective, index.theme, original, payload.text)
+    return _verdict_put(key, verdict)
+
+
+async def validate_question_delete(question_id: str, payload) -> Tuple[bool, str]:
+    section_id = await _section_of_question(question_id)
+    if not section_id:
+        return True, ""
+    index = await _load_section(section_id, payload.exploration_id)
+    text = index.question_text(question_id)
+    if text is None:
+        return True, ""
+
+    key = (index.version, "delete", question_id)
+    cached = _verdict_get(key)
+    if cached is not None:
+        return cached
+
+    if QUESTION_VALIDATION_LOCAL:
+        local = _decide_delete(index, question_id, text)
+        if local is not None:
+            return _verdict_put(key, local)
+
+    verdict = await llm_validate_question_delete(
+        index.objective, index.theme, [t for _, t in index.questions], text
+    )
+    return _verdict_put(key, verdict)
@@ -1,15 +1,17 @@
 import json
 from typing import Optional
-from openai import AsyncOpenAI
-from app.config import OPENAI_API_KEY
+from app.utils.llm_clients import async_openai_client
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from app.db import async_engine
 from app.models.questionnaire import QuestionnaireSection, QuestionnaireQuestion
 from datetime import datetime
 from app.utils.id_generator import generate_id
+from app.utils.json_stream import JsonArrayItemStream
+from app.services.survey_preview import bump_questionnaire_version
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+client = async_openai_client()
 
 
 async def build_questionnaire_prompt(objective, personas_list, population, exploration_id):
@@ -37,6 +39,7 @@ async def build_questionnaire_prompt(objective, personas_list, population, explo
         total_sample += int(sample_size) if sample_size else 0
         
         audience_summary.append(f"- {persona.get('name', 'Unknown')} ({sample_size} respondents)")
+        # demographics only; the shared persona summary also carries traits and values
         audience_summary.append(f"  Demographics: {persona.get('age_range', 'N/A')}, {persona.get('occupation', 'N/A')}")
     
     audience_text = "\n".join(audience_summary)
@@ -820,60 +823,121 @@ async def generate_questionnaire(objective, personas_list, population, explorati
         return None, "Invalid JSON from LLM"
 
 
-async def store_ai_generated_questionnaire(workspace_id: str, objective_id: str, data: dict, user_id: str, simulation_id: str = None):
+def _section_rows(workspace_id: str, objective_id: str, sections: list, user_id: str, simulation_id: str = None):
+    section_rows, question_rows, result = [], [], []
+    for sec in sections:
+        section_id = generate_id()
+        section_rows.append({
+            "id": section_id,
+            "workspace_id": workspace_id,
+            "exploration_id": objective_id,
+            "simulation_id": simulation_id,
+            "title": sec.get("title", "Untitled Section"),
+            "created_by": user_id,
+            "created_at": datetime.utcnow(),
+        })
+        questions = []
+        for q in sec.get("questions", []):
+            row = {
+                "id": generate_id(),
+                "section_id": section_id,
+                "text": q.get("text", ""),
+                "options": q.get("options", []),
+                "created_by": user_id,
+                "created_at": datetime.utcnow(),
+            }
+            question_rows.append(row)
+            questions.append({"id": row["id"], "text": row["text"], "options": row["options"]})
+        result.append({"id": section_id, "title": section_rows[-1]["title"], "questions": questions})
+    return section_rows, question_rows, result
+
+
+async def store_questionnaire_sections(workspace_id: str, objective_id: str, sections: list, user_id: str, simulation_id: str = None):
     """
-    Stores LLM generated questionnaire JSON into DB (sections + questions)
+    Bulk-inserts a batch of generated sections with their questions: one
+    INSERT per table and one commit, whatever the batch size.
     """
-    sections_out = []
+    section_rows, question_rows, result = _section_rows(workspace_id, objective_id, sections, user_id, simulation_id)
+    if not section_rows:
+        return []
 
     async with AsyncSession(async_engine) as session:
-        for sec in data.get("sections", []):
-            sec_obj = QuestionnaireSection(
-                id=generate_id(),
-                workspace_id=workspace_id,
-                exploration_id=objective_id,
-                simulation_id=simulation_id,
-                title=sec.get("title", "Untitled Section"),
-                created_by=user_id,
-                created_at=datetime.utcnow()
-            )
-            session.add(sec_obj)
-            await session.flush()
+        await session.execute(insert(QuestionnaireSection), section_rows)
+        if question_rows:
+            await session.execute(insert(QuestionnaireQuestion), question_rows)
+        await session.commit()
+    bump_questionnaire_version(objective_id)
 
-            qlist = []
-            for q in sec.get("questions", []):
-                q_obj = QuestionnaireQuestion(
-                    id=generate_id(),
-                    section_id=sec_obj.id,
-                    text=q.get("text", ""),
-                    options=q.get("options", []),
-                    created_by=user_id,
-                    created_at=datetime.utcnow()
-                )
-                session.add(q_obj)
-                qlist.append(q_obj)
+    return result
 
-            sections_out.append({"section": sec_obj, "questions": qlist})
 
-        await session.commit()
+async def store_ai_generated_questionnaire(workspace_id: str, objective_id: str, data: dict, user_id: str, simulation_id: str = None):
+    """
+    Stores LLM generated questionnaire JSON into DB (sections + questions)
+    """
+    return await store_questionnaire_sections(
+        workspace_id, objective_id, data.get("sections", []), user_id, simulation_id
+    )
 
-        for sec in sections_out:
-            await session.refresh(sec["section"])
-            for q in sec["questions"]:
-                await session.refresh(q)
-
-    result = []
-    for sec in sections_out:
-        result.append({
-            "id": sec["section"].id,
-            "title": sec["section"].title,
-            "questions": [
-                {"id": q.id, "text": q.text, "options": q.options}
-                for q in sec["questions"]
+
+async def stream_generate_questionnaire(workspace_id: str, objective, personas_list, population, exploration_id: str, user_id: str, simulation_id: str = None):
+    """
+    Streaming variant of generate_questionnaire + store_ai_generated_questionnaire.
+
+    Parses the model output as it arrives and yields ("section", stored_section)
+    for every section as soon as it is complete and persisted. Sections that
+    complete in the same chunk are written as one batch. Ends with
+    ("done", all_stored_sections) or ("error", message).
+    """
+    prompt = await build_questionnaire_prompt(objective, personas_list, population, exploration_id)
+    parser = JsonArrayItemStream("sections")
+    stored = []
+
+    try:
+        stream = await client.chat.completions.create(
+            model="gpt-4.1",
+            response_format={"type": "json_object"},
+            stream=True,
+            messages=[
+                {"role": "system", "content": "Generate survey questions in strict JSON only."},
+                {"role": "user", "content": prompt}
             ]
-        })
+        )
 
-    return result
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            completed = parser.feed(delta)
+            if not completed:
+                continue
+            batch = await store_questionnaire_sections(workspace_id, exploration_id, completed, user_id, simulation_id)
+            stored.extend(batch)
+            for sec in batch:
+                yield "section", sec
+    except Exception as e:
+        yield "error", f"LLM Error: {str(e)}"
+        return
+
+    # Anything the incremental parser could not pick up (unexpected layout)
+    # is recovered from the full document.
+    try:
+        data = json.loads(parser.buffer)
+    except ValueError:
+        if not stored:
+            yield "error", "Invalid JSON from LLM"
+            return
+        data = {}
+    remaining = (data.get("sections") or [])[parser.items_emitted:]
+    if remaining:
+        batch = await store_questionnaire_sections(workspace_id, exploration_id, remaining, user_id, simulation_id)
+        stored.extend(batch)
+        for sec in batch:
+            yield "section", sec
+
+    yield "done", stored
 
 async def create_section(workspace_id, exploration_id, title, user_id, simulation_id=None):
     async with AsyncSession(async_engine) as session:
@@ -888,6 +952,7 @@ async def create_section(workspace_id, exploration_id, title, user_id, simulatio
         session.add(sec)
         await session.commit()
         await session.refresh(sec)
+        bump_questionnaire_version(exploration_id)
         return sec
 
 
@@ -904,6 +969,7 @@ async def update_section(section_id: str, title: str):
         session.add(sec)
         await session.commit()
         await session.refresh(sec)
+        bump_questionnaire_version(sec.exploration_id)
         return sec
 
 
@@ -921,11 +987,20 @@ async def delete_section(section_id: str):
         for q in qrows:
             await session.delete(q)
 
+        exploration_id = sec.exploration_id
         await session.delete(sec)
         await session.commit()
+        bump_questionnaire_version(exploration_id)
         return True
 
 
+async def _exploration_of_section(session: AsyncSession, section_id: str) -> Optional[str]:
+    res = await session.execute(
+        select(QuestionnaireSection.exploration_id).where(QuestionnaireSection.id == section_id)
+    )
+    return res.scalar_one_or_none()
+
+
 async def create_question(section_id: str, text: str, options: list, user_id: str):
     async with AsyncSession(async_engine) as session:
         q = QuestionnaireQuestion(
@@ -938,6 +1013,7 @@ async def create_question(section_id: str, text: str, options: list, user_id: st
         session.add(q)
         await session.commit()
         await session.refresh(q)
+        bump_questionnaire_version(await _exploration_of_section(session, section_id))
         return q
 
 
@@ -955,6 +1031,7 @@ async def update_question(qid: str, text: str, options: list):
         session.add(q)
         await session.commit()
         await session.refresh(q)
+        bump_questionnaire_version(await _exploration_of_section(session, q.section_id))
         return q
 
 
@@ -967,8 +1044,10 @@ async def delete_question(qid: str):
         if not q:
             return False
 
+        section_id = q.section_id
         await session.delete(q)
         await session.commit()
+        bump_questionnaire_version(await _exploration_of_section(session, section_id))
         return True
 
 
@@ -1099,4 +1178,5 @@ async def store_parsed_json(workspace_id, objective_id, parsed, user_id, simulat
             })
 
         await session.commit()
+        bump_questionnaire_version(objective_id)
         return sections_saved
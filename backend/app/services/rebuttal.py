@@ -1,20 +1,24 @@
+import asyncio
 import json
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Tuple, Union
+from typing import Optional, List, Dict, Any, Set, Tuple, Union
 from app.utils.id_generator import generate_id
 from app.db import async_engine
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
+from app.models.persona import Persona
 from app.models.rebuttal import RebuttalSession
-from app.services.persona import get_persona
+from app.services.persona import persona_to_dict
+from app.services.persona_context import compact_persona, persona_prompt_block
 from app.services.population import get_simulation
 from app.services.exploration import get_exploration
 from app.services.questionnaire import get_full_questionnaire, get_questionnaire_by_simulation
-from app.config import OPENAI_API_KEY
-from openai import AsyncOpenAI
+from app.utils.llm_clients import async_openai_client
 
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+client = async_openai_client()
 
 
 async def list_questionnaire_sections(
@@ -85,7 +89,7 @@ def _build_starter_prompt(research_desc: str, persona: dict, question: Dict, sur
     """
     Build a prompt for the persona to introduce themselves and their answer in rebuttal mode.
     """
-    persona_text = json.dumps(persona, indent=2, default=str)
+    persona_text = persona_prompt_block(persona)
     q_text = question.get("text", "")
     opts = question.get("options") or []
 
@@ -176,7 +180,7 @@ async def _call_llm_for_starter(prompt: str) -> Tuple[Optional[str], Optional[st
             return None, "LLM returned non-JSON starter response"
 
 def _build_reply_prompt(research_desc: str, persona: dict, question: Dict, survey_result: List[Dict], starter_message: str, user_message: str) -> str:
-    persona_text = json.dumps(persona, indent=2, default=str)
+    persona_text = persona_prompt_block(persona)
     opts = question.get("options") or []
     q_text = question.get("text", "")
     
@@ -330,38 +334,13 @@ async def start_rebuttal_session(
     else:
         persona_ids = persona_id
     
-    personas = []
-    for pid in persona_ids:
-        persona = await get_persona(pid)
-        if persona:
-            personas.append(persona)
-    
+    personas = await _get_personas_by_ids(persona_ids)
+
     if not personas:
         raise ValueError("No valid personas found")
-    
-    if len(personas) == 1:
-        persona_dict = personas[0] if isinstance(personas[0], dict) else (personas[0].model_dump() if hasattr(personas[0], "model_dump") else {})
-    else:
-        persona_dict = {
-            "name": f"Combined Group ({len(personas)} personas)",
-            "personas": [p if isinstance(p, dict) else (p.model_dump() if hasattr(p, "model_dump") else {}) for p in personas]
-        }
-        all_values = []
-        all_motivations = []
-        all_interests = []
-        for p in personas:
-            p_dict = p if isinstance(p, dict) else (p.model_dump() if hasattr(p, "model_dump") else {})
-            if p_dict.get("values"):
-                all_values.append(str(p_dict.get("values")))
-            if p_dict.get("motivations"):
-                all_motivations.append(str(p_dict.get("motivations")))
-            if p_dict.get("interests"):
-                all_interests.append(str(p_dict.get("interests")))
-        
-        persona_dict["values"] = ", ".join(all_values) if all_values else "Various"
-        persona_dict["motivations"] = ", ".join(all_motivations) if all_motivations else "Various"
-        persona_dict["interests"] = ", ".join(all_interests) if all_interests else "Various"
-    
+
+    persona_dict = _combine_personas(personas)
+
     survey_simulation = None
     if simulation_id:
         try:
@@ -444,108 +423,179 @@ async def start_rebuttal_session(
         "question": found_question
     }
 
-async def reply_rebuttal_session(session_id: str, user_message: str, user_id: str) -> Dict[str, Any]:
-    """
-    Accepts session_id and a single user_message, calls LLM to generate a single rebuttal reply,
-    appends both messages to the conversation history and returns the LLM output.
-    """
-    from sqlalchemy.orm.attributes import flag_modified
-    
-    async with AsyncSession(async_engine) as db:
-        rebuttal = select(RebuttalSession).where(RebuttalSession.id == session_id)
-        res = await db.execute(rebuttal)
-        session = res.scalars().first()
-        if not session:
-            raise ValueError("Rebuttal session not found")
+# -----------------------------------------
+# Rebuttal context cache
+# -----------------------------------------
+# Question and survey context never changes during a rebuttal session, so
+# it is resolved once per session and reused for every reply. Persona edits
+# and deletes drop the sessions that include the persona.
+REBUTTAL_CONTEXT_TTL_SECONDS = 600
+REBUTTAL_CONTEXT_CACHE_SIZE = 256
+_rebuttal_context_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
 
-    async with AsyncSession(async_engine) as db_session:
-        research_obj = await get_exploration(db_session, session.exploration_id) if session.exploration_id else None
-    
+
+def _parse_persona_ids(raw: Optional[str]) -> List[str]:
     try:
-        persona_ids = json.loads(session.persona_id) if isinstance(session.persona_id, str) and session.persona_id.startswith('[') else [session.persona_id]
-    except:
-        persona_ids = [session.persona_id]
-    
-    personas = []
-    for pid in persona_ids:
-        persona = await get_persona(pid)
-        if persona:
-            personas.append(persona)
-    
+        return json.loads(raw) if isinstance(raw, str) and raw.startswith('[') else [raw]
+    except Exception:
+        return [raw]
+
+
+def _combine_personas(personas: List[dict]) -> dict:
+    """Single persona as-is, or a synthetic "Combined Group" persona for several."""
     if len(personas) == 1:
-        persona_dict = personas[0] if isinstance(personas[0], dict) else (personas[0].model_dump() if hasattr(personas[0], "model_dump") else {})
-    else:
-        persona_dict = {
-            "name": f"Combined Group ({len(personas)} personas)",
-            "personas": [p if isinstance(p, dict) else (p.model_dump() if hasattr(p, "model_dump") else {}) for p in personas]
-        }
-        all_values = []
-        all_motivations = []
-        all_interests = []
-        for p in personas:
-            p_dict = p if isinstance(p, dict) else (p.model_dump() if hasattr(p, "model_dump") else {})
-            if p_dict.get("values"):
-                all_values.append(str(p_dict.get("values")))
-            if p_dict.get("motivations"):
-                all_motivations.append(str(p_dict.get("motivations")))
-            if p_dict.get("interests"):
-                all_interests.append(str(p_dict.get("interests")))
-        
-        persona_dict["values"] = ", ".join(all_values) if all_values else "Various"
-        persona_dict["motivations"] = ", ".join(all_motivations) if all_motivations else "Various"
-        persona_dict["interests"] = ", ".join(all_interests) if all_interests else "Various"
-    
-    sections = await list_questionnaire_sections(session.workspace_id, session.exploration_id, session.simulation_id)
-    question_obj = None
+        return personas[0]
+
+    persona_dict = {
+        "name": f"Combined Group ({len(personas)} personas)",
+        "personas": [compact_persona(p) for p in personas]
+    }
+    all_values = [str(p.get("values")) for p in personas if p.get("values")]
+    all_motivations = [str(p.get("motivations")) for p in personas if p.get("motivations")]
+    all_interests = [str(p.get("interests")) for p in personas if p.get("interests")]
+
+    persona_dict["values"] = ", ".join(all_values) if all_values else "Various"
+    persona_dict["motivations"] = ", ".join(all_motivations) if all_motivations else "Various"
+    persona_dict["interests"] = ", ".join(all_interests) if all_interests else "Various"
+    return persona_dict
+
+
+async def _get_personas_by_ids(persona_ids: List[str]) -> List[dict]:
+    """Loads all personas in one query, preserving the requested order."""
+    async with AsyncSession(async_engine) as db:
+        res = await db.execute(select(Persona).where(Persona.id.in_(persona_ids)))
+        by_id = {p.id: persona_to_dict(p) for p in res.scalars().all()}
+    return [by_id[pid] for pid in persona_ids if pid in by_id]
+
+
+async def _get_exploration_description(exploration_id: Optional[str]) -> str:
+    if not exploration_id:
+        return ""
+    async with AsyncSession(async_engine) as db:
+        research_obj = await get_exploration(db, exploration_id)
+    return research_obj.description if research_obj else ""
+
+
+async def _get_survey_results_for_simulation(simulation_id: Optional[str]) -> Dict[str, Any]:
+    if not simulation_id:
+        return {}
+    try:
+        from app.services.survey_simulation import get_survey_simulation_by_id
+        from app.models.survey_simulation import SurveySimulation
+
+        survey_simulation = await get_survey_simulation_by_id(simulation_id)
+
+        if not survey_simulation:
+            async with AsyncSession(async_engine) as db:
+                stmt = select(SurveySimulation).where(
+                    SurveySimulation.simulation_source_id == simulation_id
+                ).order_by(SurveySimulation.created_at.desc())
+                result = await db.execute(stmt)
+                survey_simulation = result.scalars().first()
+
+        if survey_simulation and getattr(survey_simulation, 'results', None):
+            return survey_simulation.results
+    except Exception as e:
+        print(f"Error fetching survey simulation: {e}")
+    return {}
+
+
+async def _find_question(workspace_id: str, exploration_id: str, simulation_id: Optional[str], question_id: str) -> Optional[Dict]:
+    sections = await list_questionnaire_sections(workspace_id, exploration_id, simulation_id)
     for sec in sections:
         for q in sec["questions"]:
-            if q["id"] == session.question_id:
-                question_obj = q
-                break
-        if question_obj:
-            break
-    
-    survey_result = None
-    if session.simulation_id:
-        try:
-            from app.services.survey_simulation import get_survey_simulation_by_id
-            from app.models.survey_simulation import SurveySimulation
-            
-            survey_simulation = await get_survey_simulation_by_id(session.simulation_id)
-            
-            if not survey_simulation:
-                async with AsyncSession(async_engine) as db:
-                    stmt = select(SurveySimulation).where(
-                        SurveySimulation.simulation_source_id == session.simulation_id
-                    ).order_by(SurveySimulation.created_at.desc())
-                    result = await db.execute(stmt)
-                    survey_simulation = result.scalars().first()
-            
-            if survey_simulation and hasattr(survey_simulation, 'results') and survey_simulation.results:
-                survey_result = survey_simulation.results.get(question_obj["text"]) if question_obj else None
-        except Exception as e:
-            print(f"Error fetching survey simulation: {e}")
-            survey_result = None
+            if q["id"] == question_id:
+                return q
+    return None
 
-    sample_size = getattr(session, "sample_size", None) if hasattr(session, "sample_size") else 50
-    ro_desc = research_obj.description if research_obj else ""
 
-    starter_message = session.starter_message or ""
+async def _load_session_row(session_id: str) -> RebuttalSession:
+    async with AsyncSession(async_engine) as db:
+        res = await db.execute(select(RebuttalSession).where(RebuttalSession.id == session_id))
+        session = res.scalars().first()
+    if not session:
+        raise ValueError("Rebuttal session not found")
+    return session
+
+
+async def get_rebuttal_context(session_id: str) -> Dict[str, Any]:
+    """
+    Resolved context for a rebuttal session: research objective, personas,
+    question and survey result. Cached per session; the independent reads
+    run concurrently on a cache miss.
+    """
+    cached = _rebuttal_context_cache.get(session_id)
+    if cached and time.monotonic() - cached[0] < REBUTTAL_CONTEXT_TTL_SECONDS:
+        _rebuttal_context_cache.move_to_end(session_id)
+        return cached[1]
+
+    session = await _load_session_row(session_id)
+    persona_ids = _parse_persona_ids(session.persona_id)
+
+    ro_desc, personas, question_obj, survey_results = await asyncio.gather(
+        _get_exploration_description(session.exploration_id),
+        _get_personas_by_ids(persona_ids),
+        _find_question(session.workspace_id, session.exploration_id, session.simulation_id, session.question_id),
+        _get_survey_results_for_simulation(session.simulation_id),
+    )
+
     if not question_obj:
         raise ValueError("Question details not found in questionnaire")
 
-    reply_prompt = _build_reply_prompt(ro_desc, persona_dict, question_obj, survey_result, starter_message, user_message)
+    context = {
+        "ro_desc": ro_desc,
+        "personas": personas,
+        "question": question_obj,
+        "survey_result": survey_results.get(question_obj["text"]) or [],
+        "starter_message": session.starter_message or "",
+    }
+
+    _rebuttal_context_cache[session_id] = (time.monotonic(), context)
+    _rebuttal_context_cache.move_to_end(session_id)
+    while len(_rebuttal_context_cache) > REBUTTAL_CONTEXT_CACHE_SIZE:
+        _rebuttal_context_cache.popitem(last=False)
+    return context
+
+
+def invalidate_rebuttal_context(session_id: Optional[str] = None, persona_id: Optional[str] = None) -> None:
+    if session_id is not None:
+        _rebuttal_context_cache.pop(session_id, None)
+    elif persona_id is not None:
+        for key, (_, context) in list(_rebuttal_context_cache.items()):
+            if any(p.get("id") == persona_id for p in context["personas"]):
+                _rebuttal_context_cache.pop(key, None)
+    else:
+        _rebuttal_context_cache.clear()
+
+
+async def _generate_reply(context: Dict[str, Any], persona_dict: dict, user_message: str) -> Dict[str, Any]:
+    reply_prompt = _build_reply_prompt(
+        context["ro_desc"], persona_dict, context["question"],
+        context["survey_result"], context["starter_message"], user_message
+    )
     llm_out, err = await _call_llm_for_reply(reply_prompt)
     if err or not llm_out:
-        llm_response = f"Thanks — your response was noted: {user_message}"
-        explainers = ["fallback response due to LLM error"]
-        representing_option = None
-        response_sample_size = None
-    else:
-        llm_response = llm_out.get("llm_response") or llm_out.get("response") or ""
-        explainers = llm_out.get("explainers") or llm_out.get("reasons") or []
-        representing_option = llm_out.get("representing_option")
-        response_sample_size = llm_out.get("sample_size")
+        return {
+            "llm_response": f"Thanks — your response was noted: {user_message}",
+            "metadata": {
+                "explainers": ["fallback response due to LLM error"],
+                "representing_option": None,
+                "sample_size": None
+            }
+        }
+    return {
+        "llm_response": llm_out.get("llm_response") or llm_out.get("response") or "",
+        "metadata": {
+            "explainers": llm_out.get("explainers") or llm_out.get("reasons") or [],
+            "representing_option": llm_out.get("representing_option"),
+            "sample_size": llm_out.get("sample_size")
+        }
+    }
+
+
+async def _save_replies(session_id: str, user_message: str, replies: List[Dict[str, Any]]) -> None:
+    """Appends the user message and all assistant replies in one write."""
+    from sqlalchemy.orm.attributes import flag_modified
 
     async with AsyncSession(async_engine) as db:
         rebuttal = select(RebuttalSession).where(RebuttalSession.id == session_id)
@@ -553,51 +603,127 @@ async def reply_rebuttal_session(session_id: str, user_message: str, user_id: st
         s = res.scalars().first()
         if not s:
             raise ValueError("Rebuttal session not found (concurrent)")
-        
-        user_msg = {
-            "role": "user",
-            "text": user_message,
-            "ts": datetime.utcnow().isoformat()
-        }
-        s.messages.append(user_msg)
-        
-        llm_msg = {
-            "role": "assistant",
-            "text": llm_response,
-            "metadata": {
-                "explainers": explainers,
-                "representing_option": representing_option,
-                "sample_size": response_sample_size
-            },
-            "ts": datetime.utcnow().isoformat()
-        }
-        s.messages.append(llm_msg)
-        
+
+        now = datetime.utcnow().isoformat()
+        new_messages = [{"role": "user", "text": user_message, "ts": now}]
+        for reply in replies:
+            metadata = dict(reply["metadata"])
+            if reply.get("persona_id"):
+                metadata["persona_id"] = reply["persona_id"]
+                metadata["persona_name"] = reply.get("persona_name")
+            new_messages.append({
+                "role": "assistant",
+                "text": reply["llm_response"],
+                "metadata": metadata,
+                "ts": now
+            })
+        s.messages = [*(s.messages or []), *new_messages]
         flag_modified(s, "messages")
-        
+
         s.user_message = user_message
-        s.llm_response = llm_response
-        s.llm_metadata = {
-            "explainers": explainers,
-            "representing_option": representing_option,
-            "sample_size": response_sample_size
-        }
+        if len(replies) == 1:
+            s.llm_response = replies[0]["llm_response"]
+            s.llm_metadata = replies[0]["metadata"]
+        else:
+            s.llm_response = "\n\n".join(
+                f"{r.get('persona_name') or 'Persona'}: {r['llm_response']}" for r in replies
+            )
+            s.llm_metadata = {"replies": replies}
         s.responded_at = datetime.utcnow()
-        
+
         db.add(s)
         await db.commit()
-        await db.refresh(s)
+
+
+async def reply_rebuttal_session(session_id: str, user_message: str, user_id: str) -> Dict[str, Any]:
+    """
+    Accepts session_id and a single user_message, calls LLM to generate a single rebuttal reply,
+    appends both messages to the conversation history and returns the LLM output.
+    """
+    context = await get_rebuttal_context(session_id)
+    reply = await _generate_reply(context, _combine_personas(context["personas"]), user_message)
+    await _save_replies(session_id, user_message, [reply])
 
     return {
         "session_id": session_id,
-        "llm_response": llm_response,
-        "metadata": {
-            "explainers": explainers,
-            "representing_option": representing_option,
-            "sample_size": response_sample_size
-        }
+        "llm_response": reply["llm_response"],
+        "metadata": reply["metadata"]
+    }
+
+
+async def _iter_persona_replies(context: Dict[str, Any], user_message: str):
+    """Runs one reply per persona concurrently and yields each as soon as it finishes."""
+    async def answer_as(persona: dict) -> Dict[str, Any]:
+        reply = await _generate_reply(context, persona, user_message)
+        reply["persona_id"] = persona.get("id")
+        reply["persona_name"] = persona.get("name")
+        return reply
+
+    tasks = [asyncio.create_task(answer_as(p)) for p in context["personas"]]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+# rounds keep running (and are saved) after their client disconnects; the
+# loop only keeps weak references to tasks, so hold them until they finish
+_round_tasks: Set[asyncio.Task] = set()
+_ROUND_DONE = object()
+
+
+async def _run_persona_round(context: Dict[str, Any], session_id: str, user_message: str, queue: asyncio.Queue) -> None:
+    try:
+        replies = []
+        async for reply in _iter_persona_replies(context, user_message):
+            replies.append(reply)
+            queue.put_nowait(reply)
+
+        # keep the stored order stable regardless of completion order
+        order = {p.get("id"): i for i, p in enumerate(context["personas"])}
+        replies.sort(key=lambda r: order.get(r.get("persona_id"), 0))
+        await _save_replies(session_id, user_message, replies)
+    except Exception as e:
+        queue.put_nowait(e)
+    finally:
+        queue.put_nowait(_ROUND_DONE)
+
+
+async def stream_rebuttal_persona_replies(session_id: str, user_message: str, user_id: str):
+    """
+    Answers as each persona of the session individually, in parallel, yielding
+    every reply as soon as it is ready, so a debate costs about one reply's
+    wall-clock time. The round runs in its own task and is persisted once all
+    personas have answered, even if the caller stops listening part-way.
+    """
+    context = await get_rebuttal_context(session_id)
+    if not context["personas"]:
+        raise ValueError("No valid personas found")
+
+    queue: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(_run_persona_round(context, session_id, user_message, queue))
+    _round_tasks.add(task)
+    task.add_done_callback(_round_tasks.discard)
+
+    while True:
+        item = await queue.get()
+        if item is _ROUND_DONE:
+            break
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+async def reply_rebuttal_session_per_persona(session_id: str, user_message: str, user_id: str) -> Dict[str, Any]:
+    replies = [r async for r in stream_rebuttal_persona_replies(session_id, user_message, user_id)]
+    return {
+        "session_id": session_id,
+        "replies": replies
     }
 
+
 async def get_rebuttal_session(session_id: str) -> Optional[Dict[str, Any]]:
     async with AsyncSession(async_engine) as db:
         rebuttal = select(RebuttalSession).where(RebuttalSession.id == session_id)
@@ -8,9 +8,11 @@ from datetime import datetime
 from typing import List, Optional, Dict, Any
 
 from dotenv import load_dotenv
-from openai import OpenAI
 from pydantic import BaseModel, Field, ConfigDict
 
+from app.utils.llm_clients import openai_client
+from app.utils.llm_usage import llm_call_site
+from app.utils.request_timing import timed
 from app.services.auto_generated_persona import (
     get_description,
     get_interviews_by_exploration_id,
@@ -40,9 +42,8 @@ class InterviewOut(BaseModel):
 # --------------------------------------------------
 
 load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+client = openai_client()
 UPLOAD_DIR = "uploads/research"
 
 
@@ -677,6 +678,7 @@ async def build_llm_payload(
 # --------------------------------------------------
 
 
+@llm_call_site
 async def generate_report_html(
     objective_id: str,
     interview_id: Optional[str] = None,
@@ -687,7 +689,9 @@ async def generate_report_html(
         interview_id=interview_id,
     )
 
-    response = client.responses.create(
+    # sync client: keep the call (and its limiter wait) off the event loop
+    response = await asyncio.to_thread(
+        client.responses.create,
         model="gpt-4o-mini",
         input=[
             {"role": "system", "content": BIG_BEHAVIORAL_PROMPT},
@@ -718,6 +722,7 @@ async def generate_report_html(
 from playwright.async_api import async_playwright
 
 
+@timed("render")
 async def html_to_pdf(html: str, out_path: str) -> str:
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)  # headless=True everywhere
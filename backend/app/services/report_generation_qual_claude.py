@@ -3,22 +3,24 @@ import json
 import os
 import uuid
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Optional, Dict, Any
 
 import markdown
 import pdfkit
-from anthropic import Anthropic
 from dotenv import load_dotenv
 
+from app.utils.llm_clients import anthropic_client
+from app.utils.llm_usage import llm_call_site
+from app.utils.request_timing import timed
 from app.services.auto_generated_persona import (
     get_description,
-    get_interviews_by_exploration_id,
     get_persona_details,
 )
+from app.services.interview_answer_index import get_exploration_answers_by_interview
 
 load_dotenv()
 
-client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+client = anthropic_client()
 
 
 UPLOAD_DIR = "uploads/research"
@@ -497,54 +499,7 @@ def generate_pdf_path(prefix: str = "report") -> str:
     filename = f"{prefix}_{uuid.uuid4().hex}.pdf"
     return os.path.join(UPLOAD_DIR, filename)
 
-def extract_interview_qa(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """
-    Supports BOTH:
-    1. Structured persona output (all_info / all_info_raw)
-    2. Plain interview logs (role=persona + meta.question)
-    """
-
-    results = []
-
-    for msg in messages:
-        if msg.get("role") != "persona":
-            continue
-
-        # 🔹 CASE 1: Structured persona output
-        if isinstance(msg.get("all_info"), dict):
-            answers = msg["all_info"].get("answers", [])
-            raw_answers = msg.get("all_info_raw", {}).get("answers", [])
-
-            for idx, ans in enumerate(answers):
-                raw = raw_answers[idx] if idx < len(raw_answers) else {}
-                results.append(
-                    {
-                        "question": ans.get("question"),
-                        "answer": ans.get("revised_persona_answer"),
-                        "metadata": {
-                            k: v
-                            for k, v in raw.items()
-                            if k not in ("question", "persona_answer")
-                        },
-                    }
-                )
-
-        # 🔹 CASE 2: Plain interview logs
-        elif msg.get("meta", {}).get("question"):
-            answer_text = msg.get("text", "").strip()
-            if not answer_text:
-                continue
-
-            results.append(
-                {
-                    "question": msg["meta"]["question"],
-                    "answer": answer_text,
-                    "metadata": {"section": msg["meta"].get("section")},
-                }
-            )
-
-    return results
-
+@llm_call_site
 async def call_anthropic(
     payload: dict,
     system_prompt: str,
@@ -574,7 +529,9 @@ async def build_llm_payload(
 
     research_objective = await get_description(objective_id)
 
-    interview_results = await get_interviews_by_exploration_id(objective_id)
+    # Q&A comes from the exploration answer index instead of re-parsing
+    # every transcript (see services.interview_answer_index).
+    interview_results = await get_exploration_answers_by_interview(objective_id)
 
     if interview_id:
         interview_results = [
@@ -590,7 +547,7 @@ async def build_llm_payload(
 
     for interview in interview_results:
         persona_id = interview.get("persona_id")
-        qa_data = extract_interview_qa(interview.get("messages", []))
+        qa_data = interview.get("questions_and_answers", [])
 
         if not qa_data:
             continue
@@ -600,7 +557,7 @@ async def build_llm_payload(
         personas_payload.append(
             {
                 "persona_id": persona_id,
-                "interview_id": interview.get("id"),
+                "interview_id": interview.get("interview_id"),
                 "persona_details": persona_details,
                 "interview": {"questions_and_answers": qa_data},
             }
@@ -642,6 +599,7 @@ async def generate_report_markdown(
     return md
 
 
+@timed("render")
 def llm_md_to_pdf(md_content: str, output_pdf_path: str, css_path: str) -> str:
     """
     Converts LLM-generated Markdown content into a branded PDF.
@@ -7,12 +7,14 @@ from typing import List, Optional, Dict, Any
 
 import markdown
 import pdfkit
-from anthropic import Anthropic
 from dotenv import load_dotenv
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy import Column, Integer, String, select
 
+from app.utils.llm_clients import anthropic_client
+from app.utils.llm_usage import llm_call_site
+
 from dotenv import load_dotenv
 
 
@@ -24,7 +26,7 @@ from app.services.report_generation_qual_claude import llm_md_to_pdf
 
 load_dotenv()
 
-client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+client = anthropic_client()
 
 engine = create_async_engine(os.getenv("DATABASE_URL"), echo=False)
 
@@ -40,6 +42,7 @@ def generate_pdf_path(prefix: str = "report") -> str:
     filename = f"{prefix}_{uuid.uuid4().hex}.pdf"
     return os.path.join(upload_dir, filename)
 
+@llm_call_site
 async def call_anthropic(
     system_prompt: str,
     model: str = "claude-sonnet-4-5",
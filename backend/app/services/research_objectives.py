@@ -11,14 +11,13 @@ from app.schemas.research_objectives import (ResearchObjectivesCreate, ResearchO
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
-from openai import AsyncOpenAI
+import asyncio
 import json
-from app.config import OPENAI_API_KEY
-from sqlalchemy import update
+from app.utils.llm_clients import async_openai_client
 from app.services import omi as omi_service
 
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+client = async_openai_client()
 
 
 def map_to_exploration_out(exp: ResearchObjectives, files: List[ResearchObjectivesFile]):
@@ -41,24 +40,24 @@ def map_to_exploration_out(exp: ResearchObjectives, files: List[ResearchObjectiv
         ],
     )
 
-async def generate_and_save_research_objective(
-    db: AsyncSession,
+async def summarize_research_objective(
     *,
     omi_session_id: str,
-    exploration_id: str,
-    created_by: str,
     final_objective: str,
     context_gathered: str,
-    final_analysis: dict,
-    confidence: int,
+    pending_messages: Optional[List[OmiMessage]] = None,
 ) -> str:
-    # -----------------------------------------
-    # BUILD SUMMARY FROM CONVERSATION
-    # -----------------------------------------
+    """
+    The objective summary for a finished research-objective chat.
+    pending_messages are messages of the current chat turn that are not
+    committed yet. Holds no DB transaction across the LLM call, so callers
+    summarize first and write afterwards.
+    """
     messages = await omi_service.get_conversation_history(
         omi_session_id,
         limit=50
     )
+    messages = list(messages) + list(pending_messages or [])
 
     if not messages:
         raise ValueError("No conversation found to summarize")
@@ -71,7 +70,24 @@ async def generate_and_save_research_objective(
             final_objective,
             context_gathered
         )
+    return summary
 
+
+async def save_research_objective(
+    db: AsyncSession,
+    *,
+    exploration_id: str,
+    created_by: str,
+    summary: str,
+    final_analysis: dict,
+    confidence: int,
+    commit: bool = True,
+) -> None:
+    """
+    Stores the summarized objective unless the exploration already has one.
+    With commit=False it is only flushed, so the caller can commit it
+    together with the rest of the turn.
+    """
     # -----------------------------------------
     # PREVENT DUPLICATE SAVE
     # -----------------------------------------
@@ -81,7 +97,7 @@ async def generate_and_save_research_objective(
         )
     )
     if existing.scalars().first():
-        return summary  # already saved, just return summary
+        return  # already saved
 
     # -----------------------------------------
     # SAVE TO DB
@@ -100,10 +116,11 @@ async def generate_and_save_research_objective(
     )
 
     db.add(research_objective)
-    await db.commit()
-    await db.refresh(research_objective)
-
-    return summary
+    if commit:
+        await db.commit()
+        await db.refresh(research_objective)
+    else:
+        await db.flush()
 
 
 
@@ -224,19 +241,6 @@ async def get_clarification_attempts(
     )
     return result.scalar_one_or_none() or 0
 
-async def increment_clarification_attempts(exploration_id: str) -> None:
-    async with AsyncSession(async_engine) as session:
-        stmt = (
-            update(Exploration)
-            .where(Exploration.id == exploration_id)
-            .values(
-                clarification_attempts=Exploration.clarification_attempts + 1
-            )
-        )
-
-        await session.execute(stmt)
-        await session.commit()
-
 
 
 def build_conversation_text(messages: list[OmiMessage]) -> str:
@@ -328,15 +332,8 @@ You are a research strategist. Your task is to create a detailed and clear resea
 
 
 
-async def validate_description_with_llm(description: str, conversation: list[str] | None = None) -> dict:
-    """
-    Validates:
-    1. Feasibility (scientific, physical, economic) — no hallucination.
-    2. Structural completeness (context, hypothesis, audience, etc.)
-    """
-    probe_round = len(conversation)
-
-    feasibility_prompt = f"""
+def build_feasibility_prompt(description: str) -> str:
+    return f"""
 You are a strict feasibility evaluator. 
 You DO NOT hallucinate. You must respond only using real-world constraints.
 
@@ -362,30 +359,9 @@ Return STRICT JSON:
 }}
 """
 
-    feas_res = await client.chat.completions.create(
-        model="gpt-4o-mini",
-        response_format={"type": "json_object"},
-        messages=[
-            {"role": "system", "content": "You evaluate feasibility using strict real-world logic. Do not hallucinate."},
-            {"role": "user", "content": feasibility_prompt},
-        ]
-    )
-    feas_raw = feas_res.choices[0].message.content
-    try:
-        feas_data = json.loads(feas_raw)
-    except:
-        feas_data = {"feasible": True, "reason": "Parsing error"}
-
-    if not feas_data.get("feasible", True):
-        return {
-            "valid": False,
-            "missing": ["feasibility"],
-            "suggestions": f"Research objective is impossible: {feas_data.get('reason')}"
-        }
-
-    # detailed_input = await create_detailed_version(description)
 
-    structure_prompt = f"""
+def build_structure_prompt(description: str, conversation) -> str:
+    return f"""
 Your Identity: Omi, Research Co-Pilot
 
 You are **Omi**, the research companion for the Synthetic-People platform. You embody warmth, expertise, and playful seriousness. Your mission: transform messy user inputs into sharp, professional research objectives through natural conversation—making users feel heard, supported, and connected.
@@ -856,13 +832,34 @@ Output should be in the **JSON** Format:
 </CONVERSATION HISTORY>
 """
 
+
+async def check_feasibility_with_llm(description: str) -> dict:
+    """Feasibility (scientific, physical, economic) — gpt-4o-mini, no hallucination."""
+    feas_res = await client.chat.completions.create(
+        model="gpt-4o-mini",
+        response_format={"type": "json_object"},
+        messages=[
+            {"role": "system", "content": "You evaluate feasibility using strict real-world logic. Do not hallucinate."},
+            {"role": "user", "content": build_feasibility_prompt(description)},
+        ]
+    )
+    feas_raw = feas_res.choices[0].message.content
+    try:
+        feas_data = json.loads(feas_raw)
+    except:
+        feas_data = {"feasible": True, "reason": "Parsing error"}
+    return feas_data
+
+
+async def structure_description_with_llm(description: str, conversation) -> tuple[str, dict]:
+    """Structural completeness (context, hypothesis, audience, etc.) — gpt-4.1."""
     struct_res = await client.chat.completions.create(
         model="gpt-4.1",
         response_format={"type": "json_object"},
 		temperature=0.5,
         messages=[
             {"role": "system", "content": ""},
-            {"role": "user", "content": structure_prompt},
+            {"role": "user", "content": build_structure_prompt(description, conversation)},
         ]
     )
 
@@ -877,6 +874,33 @@ Output should be in the **JSON** Format:
             "questions": "I'm curious - could you tell me a bit more about your hypothesis? Also, I'd love to understand who your target audience is.",
             "final_objective": "",
         }
+    return struct_raw, struct_data
+
+
+def _infeasible_result(feas_data: dict, conversation: list) -> dict:
+    suggestion = f"Research objective is impossible: {feas_data.get('reason')}"
+    return {
+        "valid": False,
+        "missing": ["feasibility"],
+        "suggestions": suggestion,
+        "questions": suggestion,
+        "conversation": conversation,
+    }
+
+
+async def validate_description_with_llm(description: str, conversation: list[str] | None = None) -> dict:
+    """
+    Validates:
+    1. Feasibility (scientific, physical, economic) — no hallucination.
+    2. Structural completeness (context, hypothesis, audience, etc.)
+    """
+    conversation = list(conversation or [])
+
+    feas_data = await check_feasibility_with_llm(description)
+    if not feas_data.get("feasible", True):
+        return _infeasible_result(feas_data, conversation)
+
+    struct_raw, struct_data = await structure_description_with_llm(description, conversation)
 
     current_conversation = f"'USER': {description}\n\n'ASSISTANT RESPONSE': {struct_raw}"
     conversation.append(current_conversation)
@@ -889,6 +913,102 @@ Output should be in the **JSON** Format:
         "information_gathered": struct_data.get("content_gathered_reason", ""),
     }
 
+
+# Research components the feasibility check actually judges. If the user's
+# latest reply can only be filling in other components, the cached verdict holds.
+FEASIBILITY_COMPONENTS = (
+    "business context",
+    "decision problem",
+    "primary hypothesis",
+    "target audience",
+    "category",
+    "geography",
+)
+
+
+def _pending_feasibility_components(missing_components) -> bool:
+    if isinstance(missing_components, str):
+        missing_components = [missing_components]
+    pending = " ".join(str(c) for c in (missing_components or [])).lower()
+    return any(component in pending for component in FEASIBILITY_COMPONENTS)
+
+
+def _compact_analysis_state(components: dict, conversation: list[str]) -> list[str]:
+    """The running state sent in place of the full transcript of prior LLM outputs."""
+    if not components:
+        return list(conversation)
+    return list(conversation) + [
+        "KNOWN RESEARCH COMPONENTS: "
+        + json.dumps(components.get("content_gathered", []), ensure_ascii=False),
+        "WHAT WAS GATHERED: " + str(components.get("information_gathered", "")),
+        "STILL MISSING: "
+        + json.dumps(components.get("missing_components", []), ensure_ascii=False),
+        "CURRENT OBJECTIVE DRAFT: " + str(components.get("final_objective", "")),
+    ]
+
+
+async def analyze_research_objective_incrementally(ro_ctx: dict) -> dict:
+    """
+    Incremental variant of validate_description_with_llm for the OMI chat.
+
+    The extracted research components are kept in ``ro_ctx["components"]`` and
+    only the user inputs added since the last analysis (the delta) are sent,
+    together with that compact state, instead of the whole accumulated
+    conversation. The feasibility check is skipped while the components it
+    covers are settled, and runs concurrently with structuring when needed.
+    Returns the same shape as validate_description_with_llm and updates ro_ctx.
+    """
+    raw_inputs = ro_ctx.get("raw_inputs") or []
+    analyzed = ro_ctx.get("analyzed_inputs", 0)
+    delta = "\n\n".join(raw_inputs[analyzed:])
+
+    components = ro_ctx.get("components") or {}
+    conversation = list(ro_ctx.get("conversation") or [])
+    state = _compact_analysis_state(components, conversation)
+
+    needs_feasibility = (
+        not ro_ctx.get("feasibility")
+        or _pending_feasibility_components(components.get("missing_components"))
+    )
+
+    if needs_feasibility:
+        feasibility_text = "\n\n".join(
+            part for part in (components.get("final_objective"), delta) if part
+        )
+        feas_data, (struct_raw, struct_data) = await asyncio.gather(
+            check_feasibility_with_llm(feasibility_text),
+            structure_description_with_llm(delta, state),
+        )
+        if not feas_data.get("feasible", True):
+            ro_ctx["feasibility"] = None
+            ro_ctx["analyzed_inputs"] = len(raw_inputs)
+            return _infeasible_result(feas_data, conversation)
+        ro_ctx["feasibility"] = feas_data
+    else:
+        struct_raw, struct_data = await structure_description_with_llm(delta, state)
+
+    questions = struct_data.get("questions", "")
+    ro_ctx["components"] = {
+        "content_gathered": struct_data.get("content_gathered", []),
+        "information_gathered": struct_data.get("content_gathered_reason", ""),
+        "missing_components": struct_data.get("missing_components", []),
+        "final_objective": struct_data.get("final_objective", ""),
+    }
+    ro_ctx["analyzed_inputs"] = len(raw_inputs)
+
+    # Only the user delta and the probes asked are kept as history; the
+    # structured state above replaces the raw JSON of earlier turns.
+    conversation.append(f"'USER': {delta}\n\n'ASSISTANT PROBES': {questions}")
+
+    return {
+        "valid": bool(struct_data.get("valid")),
+        "missing": struct_data.get("missing_components", []),
+        "questions": questions,
+        "conversation": conversation,
+        "final_objective": struct_data.get("final_objective", ""),
+        "information_gathered": struct_data.get("content_gathered_reason", ""),
+    }
+
 async def get_objective_by_id(objective_id):
     async with AsyncSession(async_engine) as session:
         objective = select(ResearchObjectives).where(ResearchObjectives.id == objective_id)
@@ -0,0 +1,136 @@
+"""
+Materialized survey report previews.
+
+The preview of a simulation only changes when the exploration's
+questionnaire is edited or a simulation is (re-)run, so it is built once
+and kept per (simulation id, questionnaire version) with a strong ETag; the
+router answers polls with 304 while the ETag matches. Questionnaire and
+simulation writes bump the exploration's version in this process; the TTL
+bounds staleness for edits made by other worker processes.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.db import async_engine
+from app.models.persona import Persona
+from app.services.exploration import get_exploration
+from app.services.survey_results import simulation_results_view, group_results_by_section
+from app.services.survey_simulation import get_survey_simulation_by_id
+from app.utils.fingerprint import fingerprint
+
+
+SURVEY_PREVIEW_CACHE_SIZE = 256
+SURVEY_PREVIEW_TTL_SECONDS = 60
+
+_questionnaire_versions: Dict[str, int] = {}
+# simulation_id -> (built_at, exploration_id, questionnaire_version, etag, data)
+_previews: "OrderedDict[str, Tuple[float, str, int, str, Dict[str, Any]]]" = OrderedDict()
+
+
+def questionnaire_version(exploration_id: str) -> int:
+    return _questionnaire_versions.get(exploration_id, 0)
+
+
+def bump_questionnaire_version(exploration_id: Optional[str]) -> None:
+    """Call after any questionnaire or simulation write for the exploration."""
+    if not exploration_id:
+        return
+    _questionnaire_versions[exploration_id] = questionnaire_version(exploration_id) + 1
+    for sim_id in [k for k, v in _previews.items() if v[1] == exploration_id]:
+        _previews.pop(sim_id, None)
+
+
+def _cached(simulation_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    hit = _previews.get(simulation_id)
+    if not hit:
+        return None
+    built_at, exploration_id, version, etag, data = hit
+    if time.monotonic() - built_at > SURVEY_PREVIEW_TTL_SECONDS or version != questionnaire_version(exploration_id):
+        _previews.pop(simulation_id, None)
+        return None
+    _previews.move_to_end(simulation_id)
+    return etag, data
+
+
+async def _build_preview(sim) -> Dict[str, Any]:
+    persona_ids = sim.persona_id if isinstance(sim.persona_id, list) else [sim.persona_id] if sim.persona_id else []
+
+    async with AsyncSession(async_engine) as session:
+        objective = await get_exploration(session, sim.exploration_id)
+        rows = []
+        if persona_ids:
+            res = await session.execute(
+                select(Persona.id, Persona.name, Persona.age_range, Persona.occupation)
+                .where(Persona.id.in_(persona_ids))
+            )
+            rows = res.all()
+    by_id = {r.id: r for r in rows}
+
+    personas_data = []
+    for pid in persona_ids:
+        persona = by_id.get(pid)
+        if persona:
+            personas_data.append({
+                "persona_id": pid,
+                "name": persona.name or "Unknown",
+                "age_range": persona.age_range,
+                "occupation": persona.occupation,
+                "sample_size": sim.persona_sample_sizes.get(pid) if sim.persona_sample_sizes else None
+            })
+
+    from app.services.questionnaire import get_full_questionnaire
+
+    sections = await get_full_questionnaire(sim.workspace_id, sim.exploration_id)
+    grouped = group_results_by_section(simulation_results_view(sim), sections)
+
+    return {
+        "simulation_id": sim.id,
+        "workspace_id": sim.workspace_id,
+        "exploration_id": sim.exploration_id,
+        "total_sample_size": sim.total_sample_size if hasattr(sim, 'total_sample_size') else sim.sample_size if hasattr(sim, 'sample_size') else 0,
+        "created_at": sim.created_at.isoformat() if sim.created_at else None,
+        "personas": personas_data,
+        "persona_sample_sizes": sim.persona_sample_sizes if hasattr(sim, 'persona_sample_sizes') else {},
+        "research_objective": objective.description if objective and hasattr(objective, 'description') else "",
+        "narrative": sim.narrative or {},
+        "sections": grouped,
+        "summary": {
+            "total_questions": sum(len(sec["questions"]) for sec in grouped),
+            "total_sections": len(grouped),
+            "total_personas": len(personas_data)
+        }
+    }
+
+
+async def get_survey_preview(simulation_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """(strong ETag, preview data) for a simulation, or None if it does not exist."""
+    cached = _cached(simulation_id)
+    if cached:
+        return cached
+
+    sim = await get_survey_simulation_by_id(simulation_id)
+    if not sim:
+        return None
+
+    version = questionnaire_version(sim.exploration_id)
+    data = await _build_preview(sim)
+    etag = f'"{fingerprint(data)}"'
+
+    # only store if nothing was edited while the preview was being built
+    if version == questionnaire_version(sim.exploration_id):
+        _previews[simulation_id] = (time.monotonic(), sim.exploration_id, version, etag, data)
+        _previews.move_to_end(simulation_id)
+        while len(_previews) > SURVEY_PREVIEW_CACHE_SIZE:
+            _previews.popitem(last=False)
+    return etag, data
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
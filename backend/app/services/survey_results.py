@@ -0,0 +1,169 @@
+"""
+Compact, question-id keyed storage for survey simulation results.
+
+SurveySimulation.results keeps the historical {question_text: [{option,
+count, pct}]} layout for the readers that still use it. Next to it,
+packed_results stores the same counts columnar:
+
+    {
+      "v": 1,
+      "total": 500,
+      "questions": [{"id": "<question id or null>", "text": "...", "options": [...]}, ...],
+      "offsets": [0, 4, 9, ...],          # len(questions) + 1
+      "counts": "<base64 little-endian int32 array>"
+    }
+
+Preview/export decode the buffer once and compute every percentage in one
+vectorized pass; questions are matched by id, falling back to text for
+questions that were simulated without one.
+"""
+import base64
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+PACKED_RESULTS_VERSION = 1
+_DTYPE = np.dtype("<i4")
+
+DECODED_CACHE_SIZE = 128
+_decoded: "OrderedDict[str, PackedResults]" = OrderedDict()
+
+
+def pack_results(
+    results: Dict[str, List[Dict[str, Any]]],
+    total: int,
+    question_ids: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Packs a text-keyed results map; question_ids maps question text -> id."""
+    question_ids = question_ids or {}
+    questions, offsets, counts = [], [0], []
+    for text, opts in (results or {}).items():
+        opts = opts or []
+        questions.append({
+            "id": question_ids.get(text),
+            "text": text,
+            "options": [o.get("option", "") for o in opts],
+        })
+        counts.extend(int(o.get("count", 0) or 0) for o in opts)
+        offsets.append(len(counts))
+
+    return {
+        "v": PACKED_RESULTS_VERSION,
+        "total": int(total or 0),
+        "questions": questions,
+        "offsets": offsets,
+        "counts": base64.b64encode(np.asarray(counts, dtype=_DTYPE).tobytes()).decode("ascii"),
+    }
+
+
+def _percent_labels(pct: np.ndarray) -> List[str]:
+    # same output as survey_simulation._to_percent_string: "35%", "35.5%"
+    return [f"{v:g}%" for v in pct.tolist()]
+
+
+class PackedResults:
+    """Decoded view: one counts array, one pct array, id/text -> slice lookups."""
+
+    def __init__(self, packed: Dict[str, Any]):
+        self.total = int(packed.get("total") or 0)
+        self.questions = packed.get("questions") or []
+        self.offsets = np.asarray(packed.get("offsets") or [0], dtype=np.int64)
+        self.counts = np.frombuffer(base64.b64decode(packed.get("counts") or ""), dtype=_DTYPE)
+        if self.total > 0:
+            self.pct = np.round(self.counts.astype(np.float64) * 100.0 / self.total, 1)
+        else:
+            self.pct = np.zeros(len(self.counts), dtype=np.float64)
+        self.labels = _percent_labels(self.pct)
+
+        self._by_id = {q["id"]: i for i, q in enumerate(self.questions) if q.get("id")}
+        self._by_text = {}
+        for i, q in enumerate(self.questions):
+            self._by_text.setdefault(q.get("text"), i)
+
+    def index_of(self, question_id: Optional[str], text: Optional[str]) -> Optional[int]:
+        if question_id and question_id in self._by_id:
+            return self._by_id[question_id]
+        return self._by_text.get(text)
+
+    def formatted(self, i: int) -> List[Dict[str, Any]]:
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        options = self.questions[i].get("options") or []
+        counts = self.counts[start:end].tolist()
+        return [
+            {"option": options[k] if k < len(options) else "", "count": counts[k], "percentage": self.labels[start + k]}
+            for k in range(end - start)
+        ]
+
+    def counts_of(self, question_id: Optional[str], text: Optional[str]) -> Optional[np.ndarray]:
+        i = self.index_of(question_id, text)
+        if i is None:
+            return None
+        return self.counts[int(self.offsets[i]):int(self.offsets[i + 1])]
+
+
+def decode_packed(packed: Dict[str, Any], cache_key: Optional[str] = None) -> PackedResults:
+    """Decoded results; simulations are immutable once stored, so decodes are cached by id."""
+    if cache_key:
+        hit = _decoded.get(cache_key)
+        if hit is not None:
+            _decoded.move_to_end(cache_key)
+            return hit
+    view = PackedResults(packed)
+    if cache_key:
+        _decoded[cache_key] = view
+        while len(_decoded) > DECODED_CACHE_SIZE:
+            _decoded.popitem(last=False)
+    return view
+
+
+def simulation_results_view(sim) -> PackedResults:
+    """Packed view of a SurveySimulation row, packing legacy text-keyed results on the fly."""
+    packed = getattr(sim, "packed_results", None)
+    if not packed:
+        packed = pack_results(sim.results or {}, getattr(sim, "total_sample_size", 0) or 0)
+    return decode_packed(packed, cache_key=sim.id)
+
+
+def group_results_by_section(view: PackedResults, sections: List[Dict]) -> List[Dict]:
+    """
+    sections: get_full_questionnaire() output ({title, questions: [{id, text, options}]})
+    Returns [{title, questions: [{question, results: [{option, count, percentage}]}]}];
+    questions without simulated results get an empty result list.
+    """
+    grouped = []
+    for sec in sections:
+        qs = []
+        for q in sec.get("questions", []):
+            i = view.index_of(q.get("id"), q.get("text"))
+            qs.append({
+                "question": q.get("text"),
+                "results": view.formatted(i) if i is not None else [],
+            })
+        grouped.append({"title": sec.get("title"), "questions": qs})
+    return grouped
+
+
+def compare_results(a: PackedResults, b: PackedResults) -> List[Dict[str, Any]]:
+    """
+    Per-question percentage-point shift from simulation `a` to `b` for the
+    questions both contain with the same number of options.
+    """
+    out = []
+    for i, q in enumerate(a.questions):
+        j = b.index_of(q.get("id"), q.get("text"))
+        if j is None:
+            continue
+        a_pct = a.pct[int(a.offsets[i]):int(a.offsets[i + 1])]
+        b_pct = b.pct[int(b.offsets[j]):int(b.offsets[j + 1])]
+        if len(a_pct) != len(b_pct):
+            continue
+        delta = np.round(b_pct - a_pct, 1)
+        out.append({
+            "question_id": q.get("id"),
+            "question": q.get("text"),
+            "options": q.get("options") or [],
+            "delta_pct": delta.tolist(),
+            "max_shift": float(np.abs(delta).max()) if len(delta) else 0.0,
+        })
+    return out
@@ -5,13 +5,13 @@ from datetime import datetime
 from math import isfinite
 from app.models.survey_simulation import SurveySimulation
 from app.utils.id_generator import generate_id
+from app.services.persona_context import persona_prompt_block
 from app.db import async_engine
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from app.config import OPENAI_API_KEY
-from openai import AsyncOpenAI
+from app.utils.llm_clients import async_openai_client
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+client = async_openai_client()
 
 
 def _to_percent_string(value: float) -> str:
@@ -60,7 +60,7 @@ You are an expert market-research statistician. Simulate how a population of exa
 who match the PERSONA below would answer the questionnaire.
 
 PERSONA:
-{json.dumps(persona, indent=2, default=str)}
+{persona_prompt_block(persona)}
 
 RESEARCH OBJECTIVE:
 {research_desc}
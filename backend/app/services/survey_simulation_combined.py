@@ -1,15 +1,19 @@
 import json
+import textwrap
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from app.models.survey_simulation import SurveySimulation
 from app.utils.id_generator import generate_id
+from app.services.persona_context import persona_prompt_block
 from app.db import async_engine
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.config import OPENAI_API_KEY
-from openai import AsyncOpenAI
+from app.utils.llm_clients import async_openai_client
+from app.utils.tracing import traced
 from app.services.survey_simulation import _ensure_int, _group_results_by_section, _fallback_simulation
+from app.services.survey_results import pack_results
+from app.services.survey_preview import bump_questionnaire_version
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+client = async_openai_client()
 
 
 def _build_combined_simulation_prompt(research_desc: str, personas_list: List[Dict], persona_samples: Dict[str, int], questions: List[Dict]) -> str:
@@ -24,8 +28,7 @@ def _build_combined_simulation_prompt(research_desc: str, personas_list: List[Di
         persona_id = persona.get('id', 'unknown')
         sample_size = persona_samples.get(persona_id, 0)
         personas_summary.append(f"- {persona.get('name', 'Unknown')} ({sample_size} respondents)")
-        personas_summary.append(f"  Demographics: {persona.get('age_range', 'N/A')}, {persona.get('occupation', 'N/A')}")
-        personas_summary.append(f"  Key Traits: {persona.get('lifestyle', 'N/A')}, Values: {persona.get('values', 'N/A')}")
+        personas_summary.append(textwrap.indent(persona_prompt_block(persona, "summary"), "  "))
         personas_summary.append("")
     
     personas_text = "\n".join(personas_summary)
@@ -358,6 +361,7 @@ Statistical Summary Report
     return prompt
 
 
+@traced()
 async def simulate_combined_and_store(
     workspace_id: str,
     research_objective: Any,
@@ -375,11 +379,14 @@ async def simulate_combined_and_store(
     """
     # Flatten questions
     flat_questions = []
+    question_ids: Dict[str, str] = {}
     for sec in questions_sections:
         for q in sec.get("questions", []):
             text = q.get("text") or ""
             opts = q.get("options") or []
             flat_questions.append({"text": text, "options": opts})
+            if q.get("id"):
+                question_ids.setdefault(text, q["id"])
     
     if not flat_questions:
         raise ValueError("No questions provided to simulate")
@@ -550,6 +557,8 @@ You should provide the output based on that in a JSON format including Statistic
         
         normalized_results[text] = processed
     
+    packed_results = pack_results(normalized_results, total_sample_size, question_ids)
+
     # Group by sections
     grouped_output = _group_results_by_section(questions_sections, normalized_results)
     
@@ -582,6 +591,7 @@ You should provide the output based on that in a JSON format including Statistic
         total_sample_size=total_sample_size,  # Sum of all sample sizes
         simulation_source_id=simulation_id,
         results=normalized_results,
+        packed_results=packed_results,
         narrative=narrative,
         created_by=user_id,
         created_at=datetime.utcnow(),
@@ -592,6 +602,7 @@ You should provide the output based on that in a JSON format including Statistic
         session.add(sim_obj)
         await session.commit()
         await session.refresh(sim_obj)
+    bump_questionnaire_version(ro_id)
     
     return {
         "id": sim_obj.id,
@@ -1,14 +1,15 @@
+import asyncio
 import json
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from openai import AsyncOpenAI
 from app.db import async_engine
-from app.config import OPENAI_API_KEY
+from app.utils.llm_clients import async_openai_client
 from app.models.traceability import TraceabilityRecord
 from app.schemas.traceability import TraceabilityOut
 from app.utils.id_generator import generate_id
+from app.utils.fingerprint import fingerprint
 from app.models.persona import Persona
 from app.models.interview import Interview, InterviewSection, InterviewQuestion
 from app.models.survey_simulation import SurveySimulation
@@ -16,7 +17,7 @@ from app.models.rebuttal import RebuttalSession
 from app.models.exploration import Exploration
 
 
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+client = async_openai_client()
 
 
 def _to_primitive(obj: Any):
@@ -47,68 +48,150 @@ def _json_dumps_safe(o: Any) -> str:
     return json.dumps(_to_primitive(o), indent=2)
 
 
-async def fetch_all_context(workspace_id: str, exploration_id: str) -> Dict[str, Any]:
-    """
-    Fetches and returns:
-      - exploration (research objective)
-      - all personas for workspace+exploration
-      - all in-depth interviews for workspace+exploration
-      - all survey simulations for workspace+exploration
-      - all rebuttal sessions for workspace+exploration
-      - discussion guides (optional)
-    """
+# Columns that the traceability prompt actually serializes. Audit metadata
+# (created_by/created_at, owning ids) and the large derived JSON blobs
+# (persona_details, simulation_result) are never read, so they are not loaded.
+PERSONA_CONTEXT_COLUMNS = (
+    Persona.id,
+    Persona.name,
+    Persona.age_range,
+    Persona.gender,
+    Persona.location_country,
+    Persona.location_state,
+    Persona.education_level,
+    Persona.occupation,
+    Persona.income_range,
+    Persona.family_size,
+    Persona.geography,
+    Persona.lifestyle,
+    Persona.values,
+    Persona.personality,
+    Persona.interests,
+    Persona.motivations,
+    Persona.brand_sensitivity,
+    Persona.price_sensitivity,
+    Persona.mobility,
+    Persona.accommodation,
+    Persona.marital_status,
+    Persona.daily_rhythm,
+    Persona.hobbies,
+    Persona.professional_traits,
+    Persona.digital_activity,
+    Persona.preferences,
+    Persona.backstory,
+    Persona.ocean_profile,
+)
+
+INTERVIEW_CONTEXT_COLUMNS = (
+    Interview.id,
+    Interview.persona_id,
+    Interview.messages,
+    Interview.generated_answers,
+)
+
+SURVEY_CONTEXT_COLUMNS = (
+    SurveySimulation.id,
+    SurveySimulation.persona_id,
+    SurveySimulation.persona_sample_sizes,
+    SurveySimulation.total_sample_size,
+    SurveySimulation.results,
+    SurveySimulation.narrative,
+)
+
+REBUTTAL_CONTEXT_COLUMNS = (
+    RebuttalSession.id,
+    RebuttalSession.persona_id,
+    RebuttalSession.question_id,
+    RebuttalSession.starter_message,
+    RebuttalSession.messages,
+)
+
+
+async def _fetch_rows(stmt) -> List[Dict[str, Any]]:
+    """Runs a projected SELECT on its own pooled connection and returns plain dicts."""
     async with AsyncSession(async_engine) as session:
-        stmt = select(Exploration).where(Exploration.id == exploration_id)
         res = await session.execute(stmt)
-        exploration = res.scalars().first()
+        return [dict(row._mapping) for row in res.all()]
 
-        p_stmt = select(Persona).where(
-            Persona.workspace_id == workspace_id,
-            Persona.exploration_id == exploration_id
-        )
-        p_res = await session.execute(p_stmt)
-        personas = p_res.scalars().all()
 
-        i_stmt = select(Interview).where(
-            Interview.workspace_id == workspace_id,
-            Interview.exploration_id == exploration_id
-        )
-        i_res = await session.execute(i_stmt)
-        interviews = i_res.scalars().all()
+async def _fetch_exploration(exploration_id: str) -> Optional[Dict[str, Any]]:
+    rows = await _fetch_rows(
+        select(Exploration.id, Exploration.title, Exploration.description)
+        .where(Exploration.id == exploration_id)
+    )
+    return rows[0] if rows else None
 
-        s_stmt = select(SurveySimulation).where(
-            SurveySimulation.workspace_id == workspace_id,
-            SurveySimulation.exploration_id == exploration_id
-        )
-        s_res = await session.execute(s_stmt)
-        surveys = s_res.scalars().all()
 
-        r_stmt = select(RebuttalSession).where(
-            RebuttalSession.workspace_id == workspace_id,
-            RebuttalSession.exploration_id == exploration_id
+async def _fetch_interview_guide(workspace_id: str, exploration_id: str) -> List[Dict[str, Any]]:
+    """Loads every guide section with its questions in a single outer-joined query."""
+    stmt = (
+        select(
+            InterviewSection.id.label("section_id"),
+            InterviewSection.title,
+            InterviewQuestion.text,
         )
-        r_res = await session.execute(r_stmt)
-        rebuttals = r_res.scalars().all()
-
-        section_stmt = select(InterviewSection).where(
+        .outerjoin(InterviewQuestion, InterviewQuestion.section_id == InterviewSection.id)
+        .where(
             InterviewSection.workspace_id == workspace_id,
             InterviewSection.exploration_id == exploration_id
         )
-        section_res = await session.execute(section_stmt)
-        sections = section_res.scalars().all()
-        
-        interview_guide = []
-        for section in sections:
-            question_stmt = select(InterviewQuestion).where(
-                InterviewQuestion.section_id == section.id
+        .order_by(InterviewSection.created_at, InterviewQuestion.created_at)
+    )
+    rows = await _fetch_rows(stmt)
+
+    guide: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        section = guide.setdefault(row["section_id"], {
+            "section_id": row["section_id"],
+            "title": row["title"],
+            "questions": []
+        })
+        if row["text"] is not None:
+            section["questions"].append(row["text"])
+    return list(guide.values())
+
+
+async def fetch_all_context(workspace_id: str, exploration_id: str) -> Dict[str, Any]:
+    """
+    Fetches and returns:
+      - exploration (research objective)
+      - all personas for workspace+exploration
+      - all in-depth interviews for workspace+exploration
+      - all survey simulations for workspace+exploration
+      - all rebuttal sessions for workspace+exploration
+      - discussion guides (optional)
+
+    The reads are independent, so each one runs concurrently on its own pooled
+    connection and only projects the columns used by the traceability prompt.
+    """
+    exploration, personas, interviews, surveys, rebuttals, interview_guide = await asyncio.gather(
+        _fetch_exploration(exploration_id),
+        _fetch_rows(
+            select(*PERSONA_CONTEXT_COLUMNS).where(
+                Persona.workspace_id == workspace_id,
+                Persona.exploration_id == exploration_id
             )
-            question_res = await session.execute(question_stmt)
-            questions = question_res.scalars().all()
-            interview_guide.append({
-                "section_id": section.id,
-                "title": section.title,
-                "questions": [q.text for q in questions]
-            })
+        ),
+        _fetch_rows(
+            select(*INTERVIEW_CONTEXT_COLUMNS).where(
+                Interview.workspace_id == workspace_id,
+                Interview.exploration_id == exploration_id
+            )
+        ),
+        _fetch_rows(
+            select(*SURVEY_CONTEXT_COLUMNS).where(
+                SurveySimulation.workspace_id == workspace_id,
+                SurveySimulation.exploration_id == exploration_id
+            )
+        ),
+        _fetch_rows(
+            select(*REBUTTAL_CONTEXT_COLUMNS).where(
+                RebuttalSession.workspace_id == workspace_id,
+                RebuttalSession.exploration_id == exploration_id
+            )
+        ),
+        _fetch_interview_guide(workspace_id, exploration_id),
+    )
 
     return {
         "exploration": exploration,
@@ -126,7 +209,7 @@ async def generate_traceability_layers_from_context(context: Dict[str, Any], cus
     Returns dict with foundation_layer, generation_process, validation_layer, narrative_summary.
     """
     exploration = context.get("exploration")
-    research_desc = exploration.description if exploration else "Not provided"
+    research_desc = exploration["description"] if exploration else "Not provided"
 
     personas_json = _json_dumps_safe(context.get("personas", []))
     interviews_json = _json_dumps_safe(context.get("interviews", []))
@@ -213,6 +296,45 @@ REQUIRED JSON STRUCTURE:
         }
 
 
+def _context_fingerprint(
+    context: Dict[str, Any],
+    custom_notes: Optional[str],
+    logs: Dict[str, Any]
+) -> Optional[str]:
+    """Fingerprint of the evidence a record was generated from; None for failed generations so they are retried."""
+    if logs.get("foundation_layer", {}).get("source_mapping") == "error":
+        return None
+    return fingerprint([_to_primitive(context), custom_notes or ""])
+
+
+async def _refresh_record(
+    session: AsyncSession,
+    rec: TraceabilityRecord,
+    custom_notes: Optional[str]
+) -> TraceabilityOut:
+    """
+    Re-runs the layer generation only when the evidence (or the custom notes)
+    changed since the record was last generated; otherwise the stored layers
+    are returned as-is without an LLM call.
+    """
+    context = await fetch_all_context(rec.workspace_id, rec.exploration_id)
+    if rec.input_fingerprint and rec.input_fingerprint == _context_fingerprint(context, custom_notes, {}):
+        return TraceabilityOut.model_validate(rec)
+
+    logs = await generate_traceability_layers_from_context(context, custom_notes or "")
+
+    rec.foundation_layer = logs.get("foundation_layer", {})
+    rec.generation_process = logs.get("generation_process", {})
+    rec.validation_layer = logs.get("validation_layer", {})
+    rec.narrative_summary = logs.get("narrative_summary", {})
+    rec.input_fingerprint = _context_fingerprint(context, custom_notes, logs)
+
+    session.add(rec)
+    await session.commit()
+    await session.refresh(rec)
+    return TraceabilityOut.model_validate(rec)
+
+
 async def create_traceability(
     workspace_id: str,
     exploration_id: str,
@@ -235,6 +357,7 @@ async def create_traceability(
             generation_process=logs.get("generation_process", {}),
             validation_layer=logs.get("validation_layer", {}),
             narrative_summary=logs.get("narrative_summary", {}),
+            input_fingerprint=_context_fingerprint(context, custom_notes, logs),
             created_by=created_by
         )
         session.add(rec)
@@ -245,7 +368,8 @@ async def create_traceability(
 
 async def regenerate_traceability(record_id: str, custom_notes: Optional[str] = "") -> Optional[TraceabilityOut]:
     """
-    Regenerates traceability for an existing record (overwrites layers).
+    Regenerates traceability for an existing record (overwrites layers when the
+    underlying evidence changed, otherwise returns the stored layers).
     """
     async with AsyncSession(async_engine) as session:
         stmt = select(TraceabilityRecord).where(TraceabilityRecord.id == record_id)
@@ -254,18 +378,7 @@ async def regenerate_traceability(record_id: str, custom_notes: Optional[str] =
         if not rec:
             return None
 
-        context = await fetch_all_context(rec.workspace_id, rec.exploration_id)
-        logs = await generate_traceability_layers_from_context(context, custom_notes or "")
-
-        rec.foundation_layer = logs.get("foundation_layer", {})
-        rec.generation_process = logs.get("generation_process", {})
-        rec.validation_layer = logs.get("validation_layer", {})
-        rec.narrative_summary = logs.get("narrative_summary", {})
-
-        session.add(rec)
-        await session.commit()
-        await session.refresh(rec)
-        return TraceabilityOut.model_validate(rec)
+        return await _refresh_record(session, rec, custom_notes)
 
 
 async def get_traceability(record_id: str) -> Optional[TraceabilityOut]:
@@ -284,15 +397,4 @@ async def get_traceability_layer(payload: Dict):
         if not rec:
             return None
 
-        context = await fetch_all_context(rec.workspace_id, rec.exploration_id)
-        logs = await generate_traceability_layers_from_context(context, payload.custom_notes or "")
-
-        rec.foundation_layer = logs.get("foundation_layer", {})
-        rec.generation_process = logs.get("generation_process", {})
-        rec.validation_layer = logs.get("validation_layer", {})
-        rec.narrative_summary = logs.get("narrative_summary", {})
-
-        session.add(rec)
-        await session.commit()
-        await session.refresh(rec)
-        return TraceabilityOut.model_validate(rec)
\ No newline at end of file
+        return await _refresh_record(session, rec, payload.custom_notes)
\ No newline at end of file
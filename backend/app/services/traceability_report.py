@@ -1,14 +1,15 @@
+import asyncio
 import json
 import os
+import time
 from datetime import datetime
 from typing import Tuple, Optional, List, Any, Dict, Set
 
-from openai import AsyncOpenAI
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
-from app.config import OPENAI_API_KEY
+from app.utils.llm_clients import async_openai_client
 from app.models.exploration import Exploration
 from app.models.interview import Interview
 from app.models.omi import OmiSession
@@ -18,11 +19,13 @@ from app.models.traceability import TraceabilityReport
 from app.services.auto_generated_persona import get_description
 from app.services.omi import get_conversation_history
 from app.services.research_objectives import build_conversation_text
+from app.utils.fingerprint import fingerprint
+from app.utils.tracing import span, traced
 
 # -------------------------------------------------------------------
 # OpenAI Client (async-safe, single instance per process)
 # -------------------------------------------------------------------
-client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+client = async_openai_client()
 
 # -------------------------------------------------------------------
 # Database Engine & Session (DEFINED ONCE)
@@ -108,7 +111,9 @@ async def upsert_traceability_report(
     ro: dict | None = None,
     persona: dict | None = None,
     quant: dict | None = None,
-    qual: dict | None = None
+    qual: dict | None = None,
+    stage_timings: dict | None = None,
+    fingerprints: dict | None = None
 ):
     async with AsyncSessionLocal() as session:
         stmt = select(TraceabilityReport).where(
@@ -126,6 +131,13 @@ async def upsert_traceability_report(
                 existing.quant_traceability = quant
             if qual is not None:
                 existing.qual_traceability = qual
+            if stage_timings is not None:
+                existing.stage_timings = stage_timings
+            if fingerprints is not None:
+                existing.input_fingerprints = {
+                    **(existing.input_fingerprints or {}),
+                    **fingerprints,
+                }
 
             existing.updated_at = datetime.utcnow()
 
@@ -137,6 +149,8 @@ async def upsert_traceability_report(
                     persona_traceability=persona or {},
                     quant_traceability=quant or {},
                     qual_traceability=qual or {},
+                    stage_timings=stage_timings or {},
+                    input_fingerprints=fingerprints or {},
                 )
             )
 
@@ -389,29 +403,67 @@ async def build_qualitative_prompt_inputs(exploration_id: str) -> dict:
 
 
 # -------------------------------------------------------------------
-# MAIN SERVICE FUNCTION
+# Pipeline inputs (all DB reads, gathered once up front)
 # -------------------------------------------------------------------
-async def get_traceability_reports(
-    exploration_id: str,
-    is_quant: bool,
-    is_qual: bool
-) -> dict:
+async def get_ro_conversation_inputs(exploration_id: str) -> Tuple[str, Optional[str]]:
     """
-    Generates Research Objective traceability + RO score.
+    Returns:
+      conversation_text, information_gathered
     """
-
-    # 1. Research Objective Traceability
-    research_objective_summary = await get_description(exploration_id)
-
     omi_session_id, information_gathered = await get_session_id_and_info(exploration_id)
     if not omi_session_id:
         raise ValueError("No OMI session found for exploration_id")
 
     messages = await get_conversation_history(omi_session_id)
-    conversation_text = build_conversation_text(messages)
+    return build_conversation_text(messages), information_gathered
 
-    # ---RO Report Prompt ---
-    ro_prompt = f"""
+
+async def gather_traceability_inputs(exploration_id: str) -> dict:
+    """
+    Runs every DB read the RO / persona / quant / qual stages need concurrently,
+    so the LLM stages below never wait on the database.
+    """
+    (
+        research_objective_summary,
+        (conversation_text, information_gathered),
+        personas_grouped,
+        (results, response_result),
+        qualitative_input,
+    ) = await asyncio.gather(
+        get_description(exploration_id),
+        get_ro_conversation_inputs(exploration_id),
+        get_personas_grouped_by_generation(exploration_id),
+        get_results_and_simulation_results(exploration_id),
+        build_qualitative_prompt_inputs(exploration_id),
+    )
+
+    results, response_result = prepare_quant_inputs(
+        results=results,
+        response_result=response_result,
+        max_items=1
+    )
+    omi_personas = prepare_omi_personas_quant(
+        personas_grouped=personas_grouped,
+        max_items=1
+    )
+
+    return {
+        "research_objective_summary": research_objective_summary,
+        "conversation_text": conversation_text,
+        "information_gathered": information_gathered,
+        "personas_grouped": personas_grouped,
+        "results": results,
+        "response_result": response_result,
+        "omi_personas": omi_personas,
+        "qualitative_input": qualitative_input,
+    }
+
+
+# -------------------------------------------------------------------
+# Prompt builders
+# -------------------------------------------------------------------
+def build_ro_prompt(inputs: dict) -> str:
+    return f"""
 <ROLE>
 You are a senior research strategist and research quality auditor.
 Your task is to extract, evaluate, and validate research components based strictly on the provided inputs.
@@ -495,13 +547,13 @@ Think of each value as something that can be directly shown in a table cell with
 
 <INPUTS>
 Conversation:
-{conversation_text}
+{inputs["conversation_text"]}
 
 Information Gathered:
-{information_gathered}
+{inputs["information_gathered"]}
 
 Research Objective Summary:
-{research_objective_summary}
+{inputs["research_objective_summary"]}
 </INPUTS>
 
 <INSTRUCTIONS>
@@ -573,40 +625,10 @@ Never skip any component and ro_score should be greater then 75
 }}
 </OUTPUT FORMAT>
     """
-    ro_response = await client.responses.create(
-        model="gpt-4.1",
-        input=[{"role": "user", "content": ro_prompt}],
-    )
-
-    ro_result =  json.loads(ro_response.output_text)
-    ro_result["summary"] = research_objective_summary
-
-    # 2. Persona Traceability
-
-    personas_grouped = await get_personas_grouped_by_generation(exploration_id)
-    unique_count = count_unique_reference_sites(personas_grouped)
-    persona_result = {
-        "data":{
-            "persona_details": personas_grouped,
-            "number_of_sites_researched":unique_count,
-        }
-    }
 
-    # 4. Quantitative Traceability
-    results, response_result = await get_results_and_simulation_results(
-        exploration_id
-    )
-    results, response_result = prepare_quant_inputs(
-        results=results,
-        response_result=response_result,
-        max_items=1
-    )
-    omi_personas = prepare_omi_personas_quant(
-        personas_grouped=personas_grouped,
-        max_items=1
-    )
 
-    quant_prompt = f"""
+def build_quant_prompt(inputs: dict) -> str:
+    return f"""
 <ROLE>
 You are a senior quantitative research methodologist and quality auditor.
 Your task is to evaluate the methodological quality of a quantitative research study
@@ -640,19 +662,19 @@ Assess the study across the following six quality dimensions:
 <INPUTS>
 
 <RESEARCH OBJECTIVE>
-{research_objective_summary}
+{inputs["research_objective_summary"]}
 </RESEARCH OBJECTIVE>
 
 <PERSONA DETAILS>
-{omi_personas}
+{inputs["omi_personas"]}
 </PERSONA DETAILS>
 
 <SURVEY ANSWERS>
-{results}
+{inputs["results"]}
 </SURVEY ANSWERS>
 
 <DATASET SUMMARY & STATISTICAL METHODS & OUTPUTS>
-{response_result}
+{inputs["response_result"]}
 </DATASET SUMMARY & STATISTICAL METHODS & OUTPUTS>
 
 </INPUTS>
@@ -701,19 +723,10 @@ Return STRICT JSON only and score can be 0 to 100.
 }}
 </OUTPUT FORMAT>
 """
-    if is_quant:
-        quant_response = await client.responses.create(
-                model="gpt-4.1",
-                input=[{"role": "user", "content": quant_prompt}],
-            )
 
-        quant_result =  json.loads(quant_response.output_text)
-    else:
-        quant_result = None
 
-    # 3. Qualitative
-    qualitative_input = await build_qualitative_prompt_inputs(exploration_id)
-    qual_prompt = f"""
+def build_qual_prompt(inputs: dict) -> str:
+    return f"""
 <ROLE>
 You are a senior qualitative research methodologist and discussion-guide quality auditor.
 Your task is to evaluate the methodological quality of a qualitative discussion guide
@@ -747,19 +760,19 @@ Assess the discussion guide across the following six quality dimensions:
 <INPUTS>
 
 <RESEARCH OBJECTIVE>
-{research_objective_summary}
+{inputs["research_objective_summary"]}
 </RESEARCH OBJECTIVE>
 
 <PERSONA CONTEXT>
-{omi_personas}
+{inputs["omi_personas"]}
 </PERSONA CONTEXT>
 
 <DISCUSSION GUIDE EVIDENCE>
-{qualitative_input["discussion_guide_evidence"]}
+{inputs["qualitative_input"]["discussion_guide_evidence"]}
 </DISCUSSION GUIDE EVIDENCE>
 
 <PERSONA RESPONSE EVIDENCE>
-{qualitative_input["persona_response_evidence"]}
+{inputs["qualitative_input"]["persona_response_evidence"]}
 </PERSONA RESPONSE EVIDENCE>
 
 </INPUTS>
@@ -808,21 +821,206 @@ Return STRICT JSON only. **Never miss any dimension**
 }}
 </OUTPUT FORMAT>
 """
+
+
+# -------------------------------------------------------------------
+# Stages
+# -------------------------------------------------------------------
+async def _run_audit(prompt: str) -> dict:
+    response = await client.responses.create(
+        model="gpt-4.1",
+        input=[{"role": "user", "content": prompt}],
+    )
+    return json.loads(response.output_text)
+
+
+async def run_ro_stage(inputs: dict) -> dict:
+    ro_result = await _run_audit(build_ro_prompt(inputs))
+    ro_result["summary"] = inputs["research_objective_summary"]
+    return ro_result
+
+
+def build_persona_traceability(inputs: dict) -> dict:
+    personas_grouped = inputs["personas_grouped"]
+    return {
+        "data": {
+            "persona_details": personas_grouped,
+            "number_of_sites_researched": count_unique_reference_sites(personas_grouped),
+        }
+    }
+
+
+async def run_quant_stage(inputs: dict) -> dict:
+    return await _run_audit(build_quant_prompt(inputs))
+
+
+async def run_qual_stage(inputs: dict) -> dict:
+    return await _run_audit(build_qual_prompt(inputs))
+
+
+async def _timed(name: str, timings: Dict[str, float], coro):
+    started = time.perf_counter()
+    try:
+        with span(f"traceability.{name}"):
+            return await coro
+    finally:
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+
+async def _skipped():
+    return None
+
+
+# -------------------------------------------------------------------
+# Input fingerprints (incremental regeneration)
+# -------------------------------------------------------------------
+LAYER_COLUMNS = {
+    "ro": "ro_traceability",
+    "persona": "persona_traceability",
+    "quant": "quant_traceability",
+    "qual": "qual_traceability",
+}
+
+
+def compute_layer_fingerprints(inputs: dict) -> Dict[str, str]:
+    """
+    Hashes exactly what each layer is derived from, so a layer is only
+    regenerated when its own inputs change.
+    """
+    summary = inputs["research_objective_summary"]
+    return {
+        "ro": fingerprint([
+            summary,
+            inputs["conversation_text"],
+            inputs["information_gathered"],
+        ]),
+        "persona": fingerprint(inputs["personas_grouped"]),
+        "quant": fingerprint([
+            summary,
+            inputs["omi_personas"],
+            inputs["results"],
+            inputs["response_result"],
+        ]),
+        "qual": fingerprint([
+            summary,
+            inputs["omi_personas"],
+            inputs["qualitative_input"],
+        ]),
+    }
+
+
+def get_stale_layers(
+    existing: Optional[TraceabilityReport],
+    fingerprints: Dict[str, str],
+    layers: List[str]
+) -> Set[str]:
+    """
+    A layer is stale when it has never been generated or its stored input
+    fingerprint differs. Reports written before fingerprints existed have no
+    stored hash; their layers are treated as current and the hash is backfilled.
+    """
+    if not existing:
+        return set(layers)
+
+    stored = existing.input_fingerprints or {}
+    stale = set()
+    for layer in layers:
+        if not getattr(existing, LAYER_COLUMNS[layer]):
+            stale.add(layer)
+        elif layer in stored and stored[layer] != fingerprints[layer]:
+            stale.add(layer)
+    return stale
+
+
+# -------------------------------------------------------------------
+# MAIN SERVICE FUNCTION
+# -------------------------------------------------------------------
+async def run_traceability_stages(
+    inputs: dict,
+    timings: Dict[str, float],
+    is_ro: bool,
+    is_quant: bool,
+    is_qual: bool
+) -> Tuple[Optional[dict], Optional[dict], Optional[dict]]:
+    """Runs the requested gpt-4.1 audits concurrently."""
+    return await asyncio.gather(
+        _timed("ro", timings, run_ro_stage(inputs)) if is_ro else _skipped(),
+        _timed("quant", timings, run_quant_stage(inputs)) if is_quant else _skipped(),
+        _timed("qual", timings, run_qual_stage(inputs)) if is_qual else _skipped(),
+    )
+
+
+@traced()
+async def generate_traceability_reports(
+    exploration_id: str,
+    is_quant: bool,
+    is_qual: bool
+) -> dict:
+    """
+    Incrementally refreshes the traceability_report row for an exploration.
+
+    Inputs are fingerprinted per layer; only stale layers are re-run (the
+    LLM audits concurrently) and cached layers are returned as stored. The row
+    is upserted once, and not at all when nothing changed.
+    """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    existing, inputs = await asyncio.gather(
+        get_existing_traceability_report(exploration_id),
+        _timed("inputs", timings, gather_traceability_inputs(exploration_id)),
+    )
+
+    layers = ["ro", "persona"]
+    if is_quant:
+        layers.append("quant")
     if is_qual:
-        qual_response = await client.responses.create(
-                model="gpt-4.1",
-                input=[{"role": "user", "content": qual_prompt}],
-            )
+        layers.append("qual")
 
-        qual_result =  json.loads(qual_response.output_text)
-    else:
-        qual_result = None
+    fingerprints = compute_layer_fingerprints(inputs)
+    stale = get_stale_layers(existing, fingerprints, layers)
 
-    final_result_traceability = {
-        "ro_traceability": ro_result,
-        "persona_traceability": persona_result,
-        "qual_traceability": qual_result,
-        "quant_traceability": quant_result,
+    ro_result, quant_result, qual_result = await run_traceability_stages(
+        inputs,
+        timings,
+        is_ro="ro" in stale,
+        is_quant="quant" in stale,
+        is_qual="qual" in stale,
+    )
+    persona_result = build_persona_traceability(inputs) if "persona" in stale else None
+    timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+
+    fresh = {
+        "ro": ro_result,
+        "persona": persona_result,
+        "quant": quant_result,
+        "qual": qual_result,
     }
 
-    return final_result_traceability
\ No newline at end of file
+    stored_fingerprints = (existing.input_fingerprints or {}) if existing else {}
+    current_fingerprints = {layer: fingerprints[layer] for layer in layers}
+    fingerprints_changed = any(
+        stored_fingerprints.get(layer) != value
+        for layer, value in current_fingerprints.items()
+    )
+    if stale or fingerprints_changed:
+        await upsert_traceability_report(
+            exploration_id=exploration_id,
+            ro=fresh["ro"],
+            persona=fresh["persona"],
+            quant=fresh["quant"],
+            qual=fresh["qual"],
+            stage_timings=timings if stale else None,
+            fingerprints=current_fingerprints,
+        )
+
+    data = {}
+    for layer, column in LAYER_COLUMNS.items():
+        if layer in stale:
+            data[column] = fresh[layer]
+        else:
+            data[column] = getattr(existing, column) if existing else None
+
+    data["stale_layers"] = sorted(stale)
+    data["stage_timings"] = timings
+    return data
@@ -0,0 +1,9 @@
+import hashlib
+import json
+from typing import Any
+
+
+def fingerprint(payload: Any) -> str:
+    """Stable SHA-256 of any JSON-like payload (key order independent)."""
+    canonical = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,71 @@
+import json
+from typing import Any, List, Optional
+
+
+class JsonArrayItemStream:
+    """
+    Incremental reader for a streamed JSON object of the form
+    {"<key>": [{...}, {...}, ...], ...}.
+
+    feed() takes raw text chunks as they arrive and returns the objects of the
+    `key` array that became complete with that chunk, so callers can act on
+    each item before the rest of the document has been generated.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start: Optional[int] = None
+        self._last_string: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self.items_emitted = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        self.buffer += chunk
+        done = []
+        buf = self.buffer
+        i = self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._item_start is None:
+                        self._last_string = buf[self._string_start + 1:i]
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if (
+                    ch == "["
+                    and self._array_depth is None
+                    and self._depth == 1
+                    and self._last_string == self.key
+                ):
+                    self._array_depth = self._depth + 1
+                elif ch == "{" and self._array_depth is not None and self._depth == self._array_depth:
+                    self._item_start = i
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if ch == "}" and self._item_start is not None and self._depth == self._array_depth:
+                    self.items_emitted += 1
+                    try:
+                        done.append(json.loads(buf[self._item_start:i + 1]))
+                    except ValueError:
+                        pass
+                    self._item_start = None
+                elif ch == "]" and self._array_depth is not None and self._depth == self._array_depth - 1:
+                    self._array_depth = -1  # array closed; ignore anything after it
+            i += 1
+        self._pos = i
+        return done
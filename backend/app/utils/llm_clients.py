@@ -0,0 +1,301 @@
+"""
+Constructors for the OpenAI / Anthropic SDK clients used across services.
+
+Every client is built on an instrumented httpx transport, so each LLM HTTP
+call (whatever the call site or SDK method) passes one place where it is
+admitted by the per-model limiter, timed, traced and written to the usage
+ledger, with the model from the request body and the token usage from the
+response body. A call counts as finished when its response body is fully
+read or the stream is closed, so streamed completions are measured (and
+hold their limiter slot) end to end.
+
+Passing a transport makes httpx skip its own transport setup, so the inner
+transports are given the SDK's connection limits and the HTTP(S)_PROXY /
+NO_PROXY environment is mounted explicitly, as the SDK's default client
+would have done.
+"""
+import json
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from httpx._utils import get_environment_proxies
+from anthropic import (
+    Anthropic,
+    DefaultHttpxClient as AnthropicHttpxClient,
+    DEFAULT_CONNECTION_LIMITS as ANTHROPIC_CONNECTION_LIMITS,
+)
+from openai import (
+    AsyncOpenAI,
+    OpenAI,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    DEFAULT_CONNECTION_LIMITS as OPENAI_CONNECTION_LIMITS,
+)
+
+from app.config import (
+    OPENAI_API_KEY,
+    OPENAI_BASE_URL,
+    ANTHROPIC_API_KEY,
+    ANTHROPIC_BASE_URL,
+    LLM_LIMITER_ENABLED,
+    LLM_MAX_RETRIES,
+)
+from app.utils.llm_limiter import llm_limiter, estimate_tokens, SHARED_CALLER
+from app.utils.request_timing import record
+from app.utils.tracing import start_llm_span, end_llm_span
+from app.utils.llm_usage import usage_ledger, call_site, current_ids
+
+
+def _request_json(request: httpx.Request) -> Dict[str, Any]:
+    if request.method != "POST":
+        return {}
+    try:
+        body = json.loads(request.content or b"{}")
+    except (ValueError, httpx.RequestNotRead):
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+def _usage_from(payload: Any) -> Dict[str, int]:
+    """Normalizes OpenAI chat / responses and Anthropic usage objects."""
+    usage = payload.get("usage") if isinstance(payload, dict) else None
+    if not isinstance(usage, dict):
+        # streamed Responses API / Anthropic events nest usage one level down
+        for key in ("response", "message"):
+            inner = payload.get(key) if isinstance(payload, dict) else None
+            if isinstance(inner, dict) and isinstance(inner.get("usage"), dict):
+                usage = inner["usage"]
+                break
+    if not isinstance(usage, dict):
+        return {}
+    prompt = usage.get("prompt_tokens", usage.get("input_tokens")) or 0
+    completion = usage.get("completion_tokens", usage.get("output_tokens")) or 0
+    details = usage.get("prompt_tokens_details") or usage.get("input_tokens_details") or {}
+    cached = (details.get("cached_tokens") if isinstance(details, dict) else 0) or usage.get("cache_read_input_tokens") or 0
+    return {"prompt_tokens": int(prompt), "completion_tokens": int(completion), "cached_tokens": int(cached)}
+
+
+def _parse_usage(body: bytes, streamed: bool) -> Dict[str, int]:
+    if not body:
+        return {}
+    if not streamed:
+        try:
+            return _usage_from(json.loads(body))
+        except ValueError:
+            return {}
+    # SSE: usage is split across events (Anthropic sends input tokens first,
+    # output tokens last); take the largest value seen for each field
+    usage: Dict[str, int] = {}
+    for line in body.split(b"\n"):
+        if not line.startswith(b"data:") or b'"usage"' not in line:
+            continue
+        try:
+            found = _usage_from(json.loads(line[5:]))
+        except ValueError:
+            continue
+        for key, value in found.items():
+            usage[key] = max(usage.get(key, 0), value)
+    return usage
+
+
+class LLMCall:
+    """One LLM HTTP request, from send until the response body is consumed."""
+
+    def __init__(self, provider: str, request: httpx.Request):
+        body = _request_json(request)
+        self.provider = provider
+        self.path = request.url.path
+        self.model = body.get("model")
+        self.stream = bool(body.get("stream"))
+        self.status: Optional[int] = None
+        self.tokens = estimate_tokens(body, len(request.content or b""))
+        self.lane = llm_limiter.lane(self.model) if LLM_LIMITER_ENABLED else None
+        self._acquired = False
+        self.call_site = call_site(2)
+        self.ids = current_ids()
+        # limiter queues are per workspace, served round-robin
+        self.caller = self.ids.get("workspace_id") or SHARED_CALLER
+        # the SDKs number their own retry attempts
+        self.retries = int(request.headers.get("x-stainless-retry-count") or 0)
+        self.start = self.sent = time.perf_counter()
+        self._body = bytearray()
+        self._done = False
+        self._span = start_llm_span(provider, self.path, self.model, self.stream)
+
+    def _admitted(self, waited: float) -> None:
+        self._acquired = True
+        self.sent = time.perf_counter()
+        self._span.set_attribute("llm.queue_ms", round(waited * 1000, 1))
+
+    async def acquire(self) -> None:
+        if self.lane is not None:
+            self._admitted(await self.lane.acquire(self.tokens, self.caller))
+
+    def acquire_sync(self) -> None:
+        if self.lane is not None:
+            self._admitted(self.lane.acquire_sync(self.tokens, self.caller))
+
+    def responded(self, response: httpx.Response) -> None:
+        self.status = response.status_code
+        if self.lane is not None:
+            ttft = time.perf_counter() - self.sent if self.stream else None
+            self.lane.on_response(response.status_code, response.headers, ttft)
+
+    def feed(self, chunk: bytes) -> None:
+        self._body.extend(chunk)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        if self._done:
+            return
+        self._done = True
+        elapsed = time.perf_counter() - self.start
+        record("llm", elapsed)
+        usage = _parse_usage(bytes(self._body), self.stream) if self.status and self.status < 400 else {}
+        end_llm_span(self._span, self.status, usage, error)
+        if self._acquired:
+            if self.status is None or self.status >= 400:
+                used = 0
+            else:
+                used = usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0) if usage else None
+            self.lane.release(self.tokens, used)
+        usage_ledger.record(
+            call_site=self.call_site,
+            provider=self.provider,
+            model=self.model,
+            endpoint=self.path,
+            streamed=self.stream,
+            latency_ms=round(elapsed * 1000, 1),
+            retries=self.retries,
+            status=self.status,
+            error=type(error).__name__ if error is not None else None,
+            **usage,
+            **self.ids,
+        )
+
+
+class _ObservedAsyncStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, call: LLMCall):
+        self._stream = stream
+        self._call = call
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._call.feed(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._call.finish()
+
+
+class _ObservedSyncStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, call: LLMCall):
+        self._stream = stream
+        self._call = call
+
+    def __iter__(self):
+        for chunk in self._stream:
+            self._call.feed(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._call.finish()
+
+
+class InstrumentedAsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self, provider: str, limits: httpx.Limits, proxy: Optional[str] = None):
+        self.provider = provider
+        self._inner = httpx.AsyncHTTPTransport(limits=limits, proxy=proxy)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        call = LLMCall(self.provider, request)
+        try:
+            await call.acquire()
+            response = await self._inner.handle_async_request(request)
+        except BaseException as e:
+            call.finish(e)
+            raise
+        call.responded(response)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ObservedAsyncStream(response.stream, call),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class InstrumentedSyncTransport(httpx.BaseTransport):
+    def __init__(self, provider: str, limits: httpx.Limits, proxy: Optional[str] = None):
+        self.provider = provider
+        self._inner = httpx.HTTPTransport(limits=limits, proxy=proxy)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        call = LLMCall(self.provider, request)
+        try:
+            call.acquire_sync()
+            response = self._inner.handle_request(request)
+        except BaseException as e:
+            call.finish(e)
+            raise
+        call.responded(response)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ObservedSyncStream(response.stream, call),
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+def _transports(make: Callable[[Optional[str]], Any]) -> Dict[str, Any]:
+    """transport= and mounts= for an SDK http client: direct, plus one per env proxy."""
+    mounts = {
+        # NO_PROXY patterns map to None, i.e. the direct transport
+        pattern: make(proxy) if proxy else None
+        for pattern, proxy in get_environment_proxies().items()
+    }
+    return {"transport": make(None), "mounts": mounts}
+
+
+def async_openai_client() -> AsyncOpenAI:
+    return AsyncOpenAI(
+        api_key=OPENAI_API_KEY,
+        base_url=OPENAI_BASE_URL,
+        max_retries=LLM_MAX_RETRIES,
+        http_client=DefaultAsyncHttpxClient(**_transports(
+            lambda proxy: InstrumentedAsyncTransport("openai", OPENAI_CONNECTION_LIMITS, proxy)
+        )),
+    )
+
+
+def openai_client() -> OpenAI:
+    return OpenAI(
+        api_key=OPENAI_API_KEY,
+        base_url=OPENAI_BASE_URL,
+        max_retries=LLM_MAX_RETRIES,
+        http_client=DefaultHttpxClient(**_transports(
+            lambda proxy: InstrumentedSyncTransport("openai", OPENAI_CONNECTION_LIMITS, proxy)
+        )),
+    )
+
+
+def anthropic_client() -> Anthropic:
+    return Anthropic(
+        api_key=ANTHROPIC_API_KEY,
+        base_url=ANTHROPIC_BASE_URL,
+        max_retries=LLM_MAX_RETRIES,
+        http_client=AnthropicHttpxClient(**_transports(
+            lambda proxy: InstrumentedSyncTransport("anthropic", ANTHROPIC_CONNECTION_LIMITS, proxy)
+        )),
+    )
@@ -0,0 +1,398 @@
+"""
+Shared adaptive limiter for LLM calls, one lane per model.
+
+Every request made through the clients in app.utils.llm_clients waits for a
+slot in its model's lane before it is sent. A lane enforces:
+
+  - a request budget (requests / minute) and a token budget (tokens /
+    minute) as token buckets. A request is charged its estimated prompt
+    tokens plus max output tokens up front, and corrected to the real usage
+    once the response is read.
+  - an adaptive concurrency limit (AIMD). It grows by one per `limit`
+    successful calls and halves on a 429. It shrinks gently when the time
+    to first token of streamed calls goes above the lane's latency target,
+    since a provider-side queue builds up before it starts rejecting.
+    Non-streamed responses only arrive once generation is done, so their
+    latency says little about queueing and is not used.
+  - Retry-After: a 429 pauses the whole lane until the provider's retry
+    time has passed. The SDK's own retry then waits in the queue rather than
+    hitting the provider again straight away.
+
+Waiters are queued per caller (the workspace of the request, see
+app.utils.llm_usage.current_ids) and the callers are served round-robin,
+first-in, first-out within each caller. A workspace firing hundreds of
+parallel calls therefore gets one slot in turn with every other waiting
+workspace instead of holding the lane. A waiter that is still queued after
+LLM_LIMITER_MAX_QUEUE_WAIT_S fails with LLMQueueTimeout. Async and sync
+(threaded) SDK clients share the same lanes; the sync path must not be
+used on an event loop thread, where its wait would block the loop.
+
+Budgets come from LLM_LIMITS (JSON keyed by model name or model prefix) over
+the LLM_DEFAULT_* settings; the live state is on /admin/metrics/llm-limiter.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, Optional
+
+import httpx
+
+from app.config import (
+    LLM_LIMITER_ENABLED,
+    LLM_LIMITER_MAX_QUEUE_WAIT_S,
+    LLM_LIMITS,
+    LLM_DEFAULT_RPM,
+    LLM_DEFAULT_TPM,
+    LLM_DEFAULT_MAX_CONCURRENCY,
+    LLM_INITIAL_CONCURRENCY,
+    LLM_MIN_CONCURRENCY,
+    LLM_LATENCY_TARGET_MS,
+    LLM_DEFAULT_OUTPUT_TOKENS,
+)
+
+
+# with no Retry-After header, pause a rate-limited lane this long
+DEFAULT_BACKOFF_S = 1.0
+MAX_BACKOFF_S = 60.0
+# only one decrease per window, so a burst of 429s from calls that were all
+# already in flight counts as one congestion signal
+DECREASE_WINDOW_S = 1.0
+LATENCY_DECREASE = 0.9
+RATE_LIMIT_DECREASE = 0.5
+# queue key for calls made outside any workspace (startup jobs, scripts)
+SHARED_CALLER = "-"
+
+
+class LLMQueueTimeout(httpx.PoolTimeout):
+    """No limiter slot within LLM_LIMITER_MAX_QUEUE_WAIT_S; the SDKs treat it as a timeout."""
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """Seconds from retry-after-ms / retry-after (delta seconds or HTTP date)."""
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(body: Dict[str, Any], body_bytes: int) -> int:
+    """Prompt estimate (~4 bytes / token of JSON) plus the requested output cap."""
+    output = (
+        body.get("max_completion_tokens")
+        or body.get("max_output_tokens")
+        or body.get("max_tokens")
+        or LLM_DEFAULT_OUTPUT_TOKENS
+    )
+    try:
+        output = int(output)
+    except (TypeError, ValueError):
+        output = LLM_DEFAULT_OUTPUT_TOKENS
+    return body_bytes // 4 + output
+
+
+class _Bucket:
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        # requests larger than the whole budget go through once the bucket is full
+        needed = min(amount, self.capacity) - self.level
+        return 0.0 if needed <= 0 else needed / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def give_back(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _Waiter:
+    __slots__ = ("tokens", "caller", "loop", "event")
+
+    def __init__(self, tokens: int, caller: str, loop: Optional[asyncio.AbstractEventLoop]):
+        self.tokens = tokens
+        self.caller = caller
+        self.loop = loop
+        self.event = asyncio.Event() if loop is not None else threading.Event()
+
+    def wake(self) -> None:
+        if self.loop is None:
+            self.event.set()
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.event.set)
+
+
+class Lane:
+    def __init__(self, name: str, rpm: float, tpm: float, max_concurrency: int,
+                 initial_concurrency: int, min_concurrency: int, latency_target_ms: float,
+                 max_queue_wait_s: float = LLM_LIMITER_MAX_QUEUE_WAIT_S):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+        self.latency_target_s = latency_target_ms / 1000
+        self.max_queue_wait_s = max_queue_wait_s
+        self.requests = _Bucket(rpm)
+        self.tokens = _Bucket(tpm)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        # one FIFO per caller; the first caller in the dict is served next and
+        # moves to the end after each grant
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._queued = 0
+        self.stats = {"granted": 0, "rate_limited": 0, "decreases": 0, "queue_wait_s": 0.0, "max_queue": 0,
+                      "queue_timeouts": 0}
+
+    # -- admission --
+
+    def _grant_delay(self, waiter: _Waiter, now: float) -> Optional[float]:
+        """0 when granted, seconds to wait for a budget, or None to wait for a wake-up."""
+        if self._head() is not waiter:
+            return None
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= int(self.limit):
+            return None
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        delay = max(self.requests.wait_for(1), self.tokens.wait_for(waiter.tokens))
+        if delay > 0:
+            return delay
+        self.requests.take(1)
+        self.tokens.take(waiter.tokens)
+        self.in_flight += 1
+        self.stats["granted"] += 1
+        queue = self._queues[waiter.caller]
+        queue.popleft()
+        self._queued -= 1
+        if queue:
+            # this caller's next call waits until every other caller had a turn
+            self._queues.move_to_end(waiter.caller)
+        else:
+            del self._queues[waiter.caller]
+        self._wake_head()
+        return 0.0
+
+    def _head(self) -> Optional[_Waiter]:
+        for queue in self._queues.values():
+            return queue[0]
+        return None
+
+    def _wake_head(self) -> None:
+        head = self._head()
+        if head is not None:
+            head.wake()
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        with self._lock:
+            self._queues.setdefault(waiter.caller, deque()).append(waiter)
+            self._queued += 1
+            self.stats["max_queue"] = max(self.stats["max_queue"], self._queued)
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        with self._lock:
+            queue = self._queues.get(waiter.caller)
+            if queue is not None and waiter in queue:
+                was_head = self._head() is waiter
+                queue.remove(waiter)
+                self._queued -= 1
+                if not queue:
+                    del self._queues[waiter.caller]
+                if was_head:
+                    self._wake_head()
+
+    def _next_wait(self, waiter: _Waiter, started: float) -> Optional[float]:
+        """0 when granted, else how long to sleep; raises once the max queue wait is over."""
+        now = time.monotonic()
+        with self._lock:
+            waiter.event.clear()
+            delay = self._grant_delay(waiter, now)
+            if delay == 0:
+                return 0.0
+            if self.max_queue_wait_s <= 0:
+                return delay
+            remaining = started + self.max_queue_wait_s - now
+            if remaining <= 0:
+                self.stats["queue_timeouts"] += 1
+                raise LLMQueueTimeout(
+                    f"No {self.name} slot after {self.max_queue_wait_s:g}s in the LLM limiter queue"
+                )
+            return remaining if delay is None else min(delay, remaining)
+
+    async def acquire(self, tokens: int, caller: str = SHARED_CALLER) -> float:
+        waiter = _Waiter(tokens, caller, asyncio.get_running_loop())
+        started = time.monotonic()
+        self._enqueue(waiter)
+        try:
+            while True:
+                delay = self._next_wait(waiter, started)
+                if delay == 0:
+                    break
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        return self._waited(started)
+
+    def acquire_sync(self, tokens: int, caller: str = SHARED_CALLER) -> float:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "Sync LLM client used on an event loop thread; its limiter wait would block the loop. "
+                "Use the async client or run the call in asyncio.to_thread."
+            )
+        waiter = _Waiter(tokens, caller, None)
+        started = time.monotonic()
+        self._enqueue(waiter)
+        try:
+            while True:
+                delay = self._next_wait(waiter, started)
+                if delay == 0:
+                    break
+                waiter.event.wait(timeout=delay)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        return self._waited(started)
+
+    def _waited(self, started: float) -> float:
+        waited = time.monotonic() - started
+        with self._lock:
+            self.stats["queue_wait_s"] += waited
+        return waited
+
+    # -- feedback --
+
+    def _decrease(self, factor: float, now: float) -> None:
+        if now - self._last_decrease < DECREASE_WINDOW_S:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_concurrency), self.limit * factor)
+        self.stats["decreases"] += 1
+
+    def on_response(self, status: Optional[int], headers, ttft_s: Optional[float] = None) -> None:
+        """Called when the response headers arrive (or the request failed)."""
+        now = time.monotonic()
+        with self._lock:
+            if status == 429:
+                self.stats["rate_limited"] += 1
+                retry_after = parse_retry_after(headers) if headers is not None else None
+                pause = min(MAX_BACKOFF_S, retry_after if retry_after is not None else DEFAULT_BACKOFF_S)
+                self.paused_until = max(self.paused_until, now + pause)
+                self._decrease(RATE_LIMIT_DECREASE, now)
+            elif status is not None and status < 400:
+                if ttft_s is not None and ttft_s > self.latency_target_s:
+                    self._decrease(LATENCY_DECREASE, now)
+                else:
+                    self.limit = min(float(self.max_concurrency), self.limit + 1.0 / max(self.limit, 1.0))
+
+    def release(self, charged_tokens: int, used_tokens: Optional[int]) -> None:
+        """Called once the response body is consumed; frees the slot and settles the token charge."""
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            if used_tokens is not None:
+                self.tokens.refill(time.monotonic())
+                self.tokens.give_back(charged_tokens - used_tokens)
+            self._wake_head()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            return {
+                "concurrency_limit": round(self.limit, 2),
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self.in_flight,
+                "queued": self._queued,
+                "queued_callers": len(self._queues),
+                "paused_for_s": round(max(0.0, self.paused_until - now), 2),
+                "requests_available": round(self.requests.level, 1),
+                "tokens_available": round(self.tokens.level),
+                "rpm": self.requests.capacity,
+                "tpm": self.tokens.capacity,
+                **{k: round(v, 2) if isinstance(v, float) else v for k, v in self.stats.items()},
+            }
+
+
+class LLMLimiter:
+    def __init__(self, limits: Dict[str, Dict[str, Any]]):
+        self._limits = limits
+        self._lanes: Dict[str, Lane] = {}
+        self._lock = threading.Lock()
+
+    def _config_for(self, model: str) -> Dict[str, Any]:
+        # exact model name first, then the longest configured prefix
+        if model in self._limits:
+            return self._limits[model]
+        matches = [key for key in self._limits if model.startswith(key)]
+        return self._limits[max(matches, key=len)] if matches else {}
+
+    def lane(self, model: Optional[str]) -> Lane:
+        name = model or "unknown"
+        lane = self._lanes.get(name)
+        if lane is not None:
+            return lane
+        with self._lock:
+            if name not in self._lanes:
+                cfg = self._config_for(name)
+                self._lanes[name] = Lane(
+                    name,
+                    rpm=cfg.get("rpm", LLM_DEFAULT_RPM),
+                    tpm=cfg.get("tpm", LLM_DEFAULT_TPM),
+                    max_concurrency=cfg.get("max_concurrency", LLM_DEFAULT_MAX_CONCURRENCY),
+                    initial_concurrency=cfg.get("initial_concurrency", LLM_INITIAL_CONCURRENCY),
+                    min_concurrency=cfg.get("min_concurrency", LLM_MIN_CONCURRENCY),
+                    latency_target_ms=cfg.get("latency_target_ms", LLM_LATENCY_TARGET_MS),
+                )
+            return self._lanes[name]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": LLM_LIMITER_ENABLED,
+            "lanes": {name: lane.snapshot() for name, lane in list(self._lanes.items())},
+        }
+
+
+def _load_limits() -> Dict[str, Dict[str, Any]]:
+    try:
+        limits = json.loads(LLM_LIMITS) if LLM_LIMITS else {}
+    except ValueError:
+        print("LLM_LIMITS is not valid JSON; using the default budgets for every model")
+        return {}
+    return limits if isinstance(limits, dict) else {}
+
+
+llm_limiter = LLMLimiter(_load_limits())
@@ -0,0 +1,218 @@
+"""
+LLM usage ledger.
+
+The instrumented transport in app.utils.llm_clients reports every LLM HTTP
+request here (call site, model, prompt / completion / cached tokens, latency,
+retry attempt, status). Entries are only appended to an in-memory buffer on
+the hot path; a background task inserts them into the llm_usage table in
+batches, so the ledger never adds a DB round trip to the request that made
+the call. The admin endpoint /admin/metrics/llm-usage aggregates the table.
+
+Workspace / exploration attribution comes from the current HTTP request
+(path or query parameters, picked up by UsageScopeMiddleware) or from an
+explicit `with usage_scope(workspace_id=..., exploration_id=...)` around
+code whose ids arrive in the request body.
+
+The call site is taken from the stack of the thread sending the request. A
+call made from a worker thread (`asyncio.to_thread(client.messages.create,
+...)`) has no app frames on that stack, so such helpers are marked with
+@llm_call_site (or `usage_scope(call_site=...)`); the name travels in a
+context variable, which to_thread copies into the worker.
+"""
+import asyncio
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from threading import Lock
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import (
+    LLM_USAGE_LEDGER_ENABLED,
+    LLM_USAGE_FLUSH_SECONDS,
+    LLM_USAGE_BATCH_SIZE,
+    LLM_USAGE_MAX_BUFFER,
+)
+from app.db import async_engine
+from app.models.llm_usage import LLMUsage
+
+
+# -----------------------------------------
+# Attribution
+# -----------------------------------------
+
+_request_scope: ContextVar[Optional[dict]] = ContextVar("llm_usage_request_scope", default=None)
+_explicit_ids: ContextVar[Dict[str, Optional[str]]] = ContextVar("llm_usage_ids", default={})
+_call_site: ContextVar[Optional[str]] = ContextVar("llm_usage_call_site", default=None)
+
+# frames in these modules are plumbing, never the call site
+_SKIP_MODULES = ("app.utils.llm_clients", "app.utils.llm_usage", "app.utils.tracing", "app.utils.request_timing")
+
+
+@contextmanager
+def usage_scope(
+    workspace_id: Optional[str] = None,
+    exploration_id: Optional[str] = None,
+    call_site: Optional[str] = None,
+):
+    ids = {**_explicit_ids.get()}
+    if workspace_id:
+        ids["workspace_id"] = str(workspace_id)
+    if exploration_id:
+        ids["exploration_id"] = str(exploration_id)
+    token = _explicit_ids.set(ids)
+    site_token = _call_site.set(call_site) if call_site else None
+    try:
+        yield
+    finally:
+        if site_token is not None:
+            _call_site.reset(site_token)
+        _explicit_ids.reset(token)
+
+
+def llm_call_site(fn):
+    """Names LLM calls made inside fn after it (`services.x:fn`), including those sent from worker threads."""
+    module = fn.__module__[4:] if fn.__module__.startswith("app.") else fn.__module__
+    name = f"{module}:{fn.__name__}"
+    if asyncio.iscoroutinefunction(fn):
+        @wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            with usage_scope(call_site=name):
+                return await fn(*args, **kwargs)
+        return async_wrapper
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with usage_scope(call_site=name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def current_ids() -> Dict[str, Optional[str]]:
+    ids: Dict[str, Optional[str]] = {"workspace_id": None, "exploration_id": None}
+    scope = _request_scope.get()
+    if scope is not None:
+        # the router fills path_params into this same scope dict after matching
+        path_params = scope.get("path_params") or {}
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        for key in ids:
+            value = path_params.get(key) or (query.get(key) or [None])[0]
+            if value:
+                ids[key] = str(value)
+    ids.update(_explicit_ids.get())
+    return ids
+
+
+def call_site(depth: int = 1) -> str:
+    """
+    The explicitly set call site if any, else the first frame in the app
+    package outside the LLM plumbing, as `services.omi:call_omi`.
+    """
+    explicit = _call_site.get()
+    if explicit:
+        return explicit
+    frame = sys._getframe(depth)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.") and not module.startswith(_SKIP_MODULES):
+            return f"{module[4:]}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class UsageScopeMiddleware:
+    """Pure ASGI middleware exposing the request scope to the ledger."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+
+# -----------------------------------------
+# Buffered writer
+# -----------------------------------------
+
+class UsageLedger:
+    def __init__(self):
+        self._lock = Lock()
+        self._buffer: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+        self.written = 0
+
+    def record(self, **entry: Any) -> None:
+        """Thread-safe and non-blocking; called from sync SDK clients as well."""
+        if not LLM_USAGE_LEDGER_ENABLED:
+            return
+        entry.setdefault("created_at", datetime.utcnow())
+        with self._lock:
+            if len(self._buffer) >= LLM_USAGE_MAX_BUFFER:
+                # DB unavailable for a while: keep the newest entries
+                self._buffer.pop(0)
+                self.dropped += 1
+            self._buffer.append(entry)
+
+    def _take(self, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            batch, self._buffer = self._buffer[:limit], self._buffer[limit:]
+        return batch
+
+    async def flush(self) -> int:
+        written = 0
+        while True:
+            batch = self._take(LLM_USAGE_BATCH_SIZE)
+            if not batch:
+                return written
+            rows = [LLMUsage(**entry).model_dump() for entry in batch]
+            try:
+                async with AsyncSession(async_engine) as session:
+                    await session.execute(insert(LLMUsage), rows)
+                    await session.commit()
+            except Exception as e:
+                print(f"LLM usage ledger flush failed ({len(rows)} rows kept): {e}")
+                with self._lock:
+                    self._buffer[:0] = batch
+                return written
+            written += len(rows)
+            self.written += len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(LLM_USAGE_FLUSH_SECONDS)
+            await self.flush()
+
+    def start(self) -> None:
+        """Starts the flusher; call from startup so the task does not inherit a request context."""
+        if LLM_USAGE_LEDGER_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {"buffered": len(self._buffer), "written": self.written, "dropped": self.dropped}
+
+
+usage_ledger = UsageLedger()
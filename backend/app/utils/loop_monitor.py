@@ -0,0 +1,224 @@
+"""
+Event-loop lag sampler and blocking-call detector.
+
+A task on the loop sleeps LOOP_LAG_SAMPLE_MS at a time and records how late
+it wakes up; that lateness is the time other callbacks held the loop, i.e.
+how long every concurrent request on the worker was stalled. Percentiles over
+the recent samples are exposed on /admin/metrics/event-loop.
+
+Wake-ups later than LOOP_BLOCK_THRESHOLD_MS count as stalls. With
+LOOP_BLOCK_DEBUG on, a watchdog thread also notices the stall while it is
+still happening and captures the loop thread's stack, so the log line names
+the blocking call (a sync SDK client, pdfkit, reportlab, pandas, ...), not
+just the fact that something blocked.
+
+In tests, wrap the code under test in `blocking_guard()` (the
+run_without_blocking fixture in tests/conftest.py does this):
+
+    async with blocking_guard(threshold_ms=50):
+        await client.post(...)
+
+which raises LoopBlockedError (with the blocking stack) if any callback
+held the loop longer than the threshold.
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from app.config import (
+    LOOP_MONITOR_ENABLED,
+    LOOP_LAG_SAMPLE_MS,
+    LOOP_BLOCK_THRESHOLD_MS,
+    LOOP_BLOCK_DEBUG,
+)
+
+
+STACK_LIMIT = 40
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+class LoopBlockedError(AssertionError):
+    def __init__(self, stalls: List[Dict[str, Any]], threshold_ms: float):
+        self.stalls = stalls
+        worst = max(stalls, key=lambda s: s["duration_ms"])
+        message = (
+            f"event loop blocked {len(stalls)} time(s) for more than {threshold_ms:.0f} ms "
+            f"(worst {worst['duration_ms']:.0f} ms)"
+        )
+        if worst.get("stack"):
+            message += "\n" + worst["stack"]
+        super().__init__(message)
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        sample_ms: float = LOOP_LAG_SAMPLE_MS,
+        block_threshold_ms: float = LOOP_BLOCK_THRESHOLD_MS,
+        capture_stacks: bool = LOOP_BLOCK_DEBUG,
+        log: bool = True,
+        max_samples: int = 5000,
+        keep_stalls: int = 20,
+    ):
+        self.sample_s = sample_ms / 1000
+        self.block_threshold_ms = block_threshold_ms
+        self.capture_stacks = capture_stacks
+        self.log = log
+        self._lock = threading.Lock()
+        self._lags: Deque[float] = deque(maxlen=max_samples)
+        self.recent_stalls: Deque[Dict[str, Any]] = deque(maxlen=keep_stalls)
+        self.stalls = 0
+        self._window_max_ms = 0.0
+        self._window_stalls: List[Dict[str, Any]] = []
+
+        self._task: Optional[asyncio.Task] = None
+        self._loop_thread_id: Optional[int] = None
+        self._beat = 0.0
+        self._pending_stack: Optional[str] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # -- sampler (on the loop) --
+
+    async def _sample(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.sample_s
+            await asyncio.sleep(self.sample_s)
+            now = time.perf_counter()
+            lag_ms = max(0.0, now - expected) * 1000
+            with self._lock:
+                self._beat = now
+                stack, self._pending_stack = self._pending_stack, None
+                self._lags.append(lag_ms)
+                self._window_max_ms = max(self._window_max_ms, lag_ms)
+            if lag_ms >= self.block_threshold_ms:
+                self._stalled(lag_ms, stack)
+
+    def _stalled(self, lag_ms: float, stack: Optional[str]) -> None:
+        stall = {"ts": datetime.utcnow().isoformat(), "duration_ms": round(lag_ms, 1), "stack": stack}
+        with self._lock:
+            self.stalls += 1
+            self.recent_stalls.append(stall)
+            self._window_stalls.append(stall)
+        if self.log:
+            print(json.dumps({"event": "loop_blocked", **stall}), flush=True)
+
+    # -- watchdog (own thread, debug mode) --
+
+    def _watch(self) -> None:
+        threshold_s = self.block_threshold_ms / 1000
+        poll_s = max(0.005, min(self.sample_s, threshold_s) / 4)
+        while not self._stop.wait(poll_s):
+            with self._lock:
+                overdue = time.perf_counter() - self._beat - self.sample_s
+                if overdue < threshold_s or self._pending_stack is not None:
+                    continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame)[-STACK_LIMIT:])
+            with self._lock:
+                # only if the loop is still stuck in the same stall
+                if time.perf_counter() - self._beat - self.sample_s >= threshold_s:
+                    self._pending_stack = stack
+
+    # -- lifecycle --
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._task = asyncio.create_task(self._sample())
+        if self.capture_stacks:
+            self._stop.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-monitor-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    # -- reporting --
+
+    def take_window(self) -> Dict[str, Any]:
+        """Max lag and stalls since the previous call (per benchmark step / test)."""
+        with self._lock:
+            window = {"max_lag_ms": round(self._window_max_ms, 1), "stalls": self._window_stalls}
+            self._window_max_ms, self._window_stalls = 0.0, []
+        return window
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lags = list(self._lags)
+            recent = list(self.recent_stalls)
+            stalls = self.stalls
+        return {
+            "running": self._task is not None,
+            "sample_ms": self.sample_s * 1000,
+            "block_threshold_ms": self.block_threshold_ms,
+            "stack_capture": self.capture_stacks,
+            "samples": len(lags),
+            "lag_ms": {
+                "p50": round(_percentile(lags, 0.50), 2),
+                "p90": round(_percentile(lags, 0.90), 2),
+                "p99": round(_percentile(lags, 0.99), 2),
+                "max": round(max(lags), 2) if lags else 0.0,
+                "mean": round(sum(lags) / len(lags), 2) if lags else 0.0,
+            },
+            "stalls": stalls,
+            "recent_stalls": recent,
+        }
+
+
+loop_monitor = LoopMonitor()
+
+
+def start_loop_monitor() -> None:
+    if LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+
+
+@asynccontextmanager
+async def blocking_guard(threshold_ms: float = 50, sample_ms: float = 5):
+    """Raises LoopBlockedError if the loop was held longer than threshold_ms inside the block."""
+    monitor = LoopMonitor(
+        sample_ms=sample_ms,
+        block_threshold_ms=threshold_ms,
+        capture_stacks=True,
+        log=False,
+    )
+    monitor.start()
+    # let the sampler take its first timestamp before the code under test runs
+    await asyncio.sleep(0)
+    try:
+        yield monitor
+        # let the sampler observe a stall that ended with the block
+        await asyncio.sleep(monitor.sample_s * 2)
+    finally:
+        await monitor.stop()
+    stalls = monitor.take_window()["stalls"]
+    if stalls:
+        raise LoopBlockedError(stalls, threshold_ms)
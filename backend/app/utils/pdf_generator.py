@@ -7,6 +7,8 @@ from reportlab.lib import colors
 import io
 from datetime import datetime
 
+from app.utils.request_timing import timed
+
 
 def _safe_str(value):
     """Convert value to string safely, handling lists and other types."""
@@ -20,6 +22,7 @@ def _safe_str(value):
         return str(value)
 
 
+@timed("render")
 def generate_survey_pdf(simulation, sections, personas, research_objective):
     """
     simulation: SurveySimulation ORM object
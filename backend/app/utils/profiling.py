@@ -0,0 +1,185 @@
+"""
+On-demand profiling of a live worker (super-admin endpoints in routers/admin.py).
+
+- Sampling profiler: a background thread reads every thread's current stack
+  via sys._current_frames() at a fixed interval for N seconds and counts
+  identical stacks. Nothing is hooked into the interpreter, so the overhead
+  is one stack walk per thread per tick. The
+  output is the collapsed-stack format read by flamegraph.pl, speedscope
+  and inferno:  `thread;outer (file:line);...;inner (file:line) <count>`
+
+- tracemalloc: start tracing, take top-allocation snapshots (kept in memory
+  by id) and diff two snapshots to see what grew between them, e.g. before
+  and after a batch of report generations.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app.utils.id_generator import generate_id
+
+
+MAX_PROFILE_SECONDS = 120
+MIN_INTERVAL_MS = 1
+MAX_SNAPSHOTS = 10
+# tracemalloc's own bookkeeping and the import system are noise in the tops
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+# -----------------------------------------
+# Sampling profiler
+# -----------------------------------------
+
+_profile_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+def _sample_stacks(seconds: float, interval_s: float, include_idle: bool) -> Dict[str, Any]:
+    own_id = threading.get_ident()
+    names = {t.ident: t.name for t in threading.enumerate()}
+    stacks: Counter = Counter()
+    samples = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if not include_idle and labels and _is_idle(labels[0]):
+                continue
+            thread_name = names.get(thread_id) or str(thread_id)
+            stacks[";".join([thread_name.replace(";", ","), *reversed(labels)])] += 1
+        samples += 1
+        time.sleep(interval_s)
+    return {"stacks": stacks, "samples": samples}
+
+
+def _is_idle(innermost: str) -> bool:
+    # threads parked in select / lock waits (the idle event loop, idle pool workers)
+    return innermost.startswith(("select (", "poll (", "wait (", "_worker (", "get (queue.py"))
+
+
+async def run_sampling_profile(seconds: float, interval_ms: float, include_idle: bool = False) -> Dict[str, Any]:
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be between 0 and {MAX_PROFILE_SECONDS}")
+    if not _profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running on this worker")
+    try:
+        started = datetime.utcnow()
+        result = await asyncio.to_thread(
+            _sample_stacks, seconds, max(interval_ms, MIN_INTERVAL_MS) / 1000, include_idle
+        )
+    finally:
+        _profile_lock.release()
+
+    collapsed = "\n".join(f"{stack} {count}" for stack, count in result["stacks"].most_common())
+    return {
+        "started_at": started.isoformat(),
+        "seconds": seconds,
+        "interval_ms": interval_ms,
+        "samples": result["samples"],
+        "pid": os.getpid(),
+        "collapsed": collapsed + "\n" if collapsed else "",
+    }
+
+
+# -----------------------------------------
+# tracemalloc snapshots
+# -----------------------------------------
+
+_snapshots: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def start_tracemalloc(frames: int) -> Dict[str, Any]:
+    if tracemalloc.is_tracing():
+        return {"tracing": True, "frames": tracemalloc.get_traceback_limit(), "already_running": True}
+    tracemalloc.start(max(1, frames))
+    return {"tracing": True, "frames": tracemalloc.get_traceback_limit(), "already_running": False}
+
+
+def stop_tracemalloc() -> Dict[str, Any]:
+    tracemalloc.stop()
+    dropped = len(_snapshots)
+    _snapshots.clear()
+    return {"tracing": False, "snapshots_dropped": dropped}
+
+
+def _stat_row(stat, key_type: str) -> Dict[str, Any]:
+    frames = [f"{f.filename}:{f.lineno}" for f in stat.traceback]
+    row = {
+        # frames run oldest to most recent; the last one is the allocation site
+        "location": frames[-1],
+        "size_kb": round(stat.size / 1024, 1),
+        "count": stat.count,
+    }
+    if key_type == "traceback":
+        row["traceback"] = frames
+    if hasattr(stat, "size_diff"):
+        row["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+        row["count_diff"] = stat.count_diff
+    return row
+
+
+def _take_snapshot():
+    return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+
+async def take_tracemalloc_snapshot(limit: int, key_type: str) -> Dict[str, Any]:
+    if not tracemalloc.is_tracing():
+        raise HTTPException(status_code=400, detail="tracemalloc is not running; start it first")
+
+    # snapshotting walks every live allocation; keep it off the event loop
+    snapshot = await asyncio.to_thread(_take_snapshot)
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot_id = generate_id()
+    _snapshots[snapshot_id] = {"snapshot": snapshot, "taken_at": datetime.utcnow().isoformat()}
+    while len(_snapshots) > MAX_SNAPSHOTS:
+        _snapshots.popitem(last=False)
+
+    stats = await asyncio.to_thread(snapshot.statistics, key_type)
+    return {
+        "snapshot_id": snapshot_id,
+        "taken_at": _snapshots[snapshot_id]["taken_at"],
+        "traced_current_mb": round(current / 1024 / 1024, 2),
+        "traced_peak_mb": round(peak / 1024 / 1024, 2),
+        "top": [_stat_row(s, key_type) for s in stats[:limit]],
+    }
+
+
+async def diff_tracemalloc_snapshots(from_id: str, to_id: str, limit: int, key_type: str) -> Dict[str, Any]:
+    missing = [i for i in (from_id, to_id) if i not in _snapshots]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Unknown snapshot id(s): {', '.join(missing)}")
+
+    older, newer = _snapshots[from_id], _snapshots[to_id]
+    stats = await asyncio.to_thread(newer["snapshot"].compare_to, older["snapshot"], key_type)
+    return {
+        "from": {"snapshot_id": from_id, "taken_at": older["taken_at"]},
+        "to": {"snapshot_id": to_id, "taken_at": newer["taken_at"]},
+        "total_diff_kb": round(sum(s.size_diff for s in stats) / 1024, 1),
+        "top": [_stat_row(s, key_type) for s in stats[:limit]],
+    }
+
+
+def list_tracemalloc_snapshots() -> List[Dict[str, Optional[str]]]:
+    return [{"snapshot_id": i, "taken_at": s["taken_at"]} for i, s in _snapshots.items()]
@@ -0,0 +1,179 @@
+"""
+Per-request time accounting by category (db / llm / render).
+
+ServerTimingMiddleware puts a fresh accumulator in a context variable for
+every HTTP request; code anywhere below it (including tasks spawned with
+gather / create_task and work pushed to asyncio.to_thread, which copy the
+context) adds to it through record() or timed(). The middleware then emits
+a Server-Timing header and one JSON log line per request.
+
+Hooks:
+  - DB: cursor execute events on every SQLAlchemy Engine (install_db_timing)
+  - LLM: the instrumented HTTP transport in app.utils.llm_clients
+  - render: @timed("render") on the PDF / HTML renderers
+
+Concurrent awaits inside one request overlap, so per-category totals can
+add up to more than the wall time; "python" is the wall time not covered
+by any category (floored at zero).
+"""
+import asyncio
+import json
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.config import REQUEST_TIMING_ENABLED, REQUEST_TIMING_LOG, REQUEST_TIMING_LOG_MIN_MS
+from app.utils.tracing import current_trace_id
+
+
+CATEGORIES = ("db", "llm", "render")
+
+# category -> [seconds, count]
+_timings: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("request_timings", default=None)
+
+
+def record(category: str, seconds: float) -> None:
+    timings = _timings.get()
+    if timings is None:
+        return
+    entry = timings.get(category)
+    if entry is None:
+        timings[category] = [seconds, 1]
+    else:
+        entry[0] += seconds
+        entry[1] += 1
+
+
+class timed:
+    """`with timed("render"): ...` or `@timed("render")` on a sync or async function."""
+
+    def __init__(self, category: str):
+        self.category = category
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.category, time.perf_counter() - self._start)
+        return False
+
+    def __call__(self, fn):
+        category = self.category
+        if asyncio.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with timed(category):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(category):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+# -----------------------------------------
+# DB hook
+# -----------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("request_timing_starts", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("request_timing_starts")
+    if starts:
+        record("db", time.perf_counter() - starts.pop())
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    starts = conn.info.get("request_timing_starts") if conn is not None else None
+    if starts:
+        record("db", time.perf_counter() - starts.pop())
+
+
+def install_db_timing() -> None:
+    """Listens on the Engine class, so engines created by individual services are covered too."""
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+
+
+# -----------------------------------------
+# Middleware
+# -----------------------------------------
+
+def server_timing_header(timings: Dict[str, List[float]], total: float) -> str:
+    parts = []
+    covered = 0.0
+    for category in CATEGORIES:
+        seconds, count = timings.get(category, (0.0, 0))
+        covered += seconds
+        parts.append(f'{category};dur={seconds * 1000:.1f};desc="{int(count)} calls"')
+    parts.append(f"python;dur={max(0.0, total - covered) * 1000:.1f}")
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware), so streaming responses pass through untouched."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not REQUEST_TIMING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, List[float]] = {}
+        token = _timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+        first_byte: Optional[float] = None
+
+        async def send_with_timing(message):
+            nonlocal status, first_byte
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                first_byte = time.perf_counter() - start
+                MutableHeaders(scope=message).append("Server-Timing", server_timing_header(timings, first_byte))
+            await send(message)
+
+        trace_id = current_trace_id()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _timings.reset(token)
+            total = time.perf_counter() - start
+            if REQUEST_TIMING_LOG and total * 1000 >= REQUEST_TIMING_LOG_MIN_MS:
+                covered = sum(timings.get(c, (0.0, 0))[0] for c in CATEGORIES)
+                line = {
+                    "event": "request_timing",
+                    "ts": datetime.utcnow().isoformat(),
+                    "method": scope.get("method"),
+                    "path": scope.get("path"),
+                    "route": getattr(scope.get("route"), "path", None),
+                    "status": status,
+                    "total_ms": round(total * 1000, 1),
+                    "ttfb_ms": round(first_byte * 1000, 1) if first_byte is not None else None,
+                    "python_ms": round(max(0.0, total - covered) * 1000, 1),
+                    "trace_id": trace_id,
+                }
+                for category in CATEGORIES:
+                    seconds, count = timings.get(category, (0.0, 0))
+                    line[f"{category}_ms"] = round(seconds * 1000, 1)
+                    line[f"{category}_calls"] = int(count)
+                print(json.dumps(line), flush=True)
@@ -0,0 +1,266 @@
+"""
+OpenTelemetry tracing.
+
+Spans come from:
+  - FastAPI routes (opentelemetry-instrumentation-fastapi)
+  - every SQL statement, via cursor events on the Engine class, so engines
+    created inside individual services are covered too
+  - every LLM HTTP call, from the instrumented transport in
+    app.utils.llm_clients (model, prompt / completion / cached tokens,
+    cache hit, status)
+  - pipeline stages, through span() / @traced()
+
+With TRACING_ENABLED unset, only the no-op API tracer is used and the hooks
+cost next to nothing. Finished spans are written as JSON lines to
+TRACING_FILE (no collector needed) and, when TRACING_OTLP_ENDPOINT is set,
+also exported over OTLP/HTTP to Jaeger, Tempo or an OTel collector.
+
+Print a single trace as a waterfall:
+
+    python -m app.utils.tracing traces/spans.jsonl                 # slowest trace
+    python -m app.utils.tracing traces/spans.jsonl --trace <trace_id>
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.trace import Status, StatusCode
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import (
+    TRACING_ENABLED,
+    TRACING_FILE,
+    TRACING_OTLP_ENDPOINT,
+    TRACING_SAMPLE_RATIO,
+    TRACING_SERVICE_NAME,
+)
+
+
+tracer = trace.get_tracer("syntera")
+
+MAX_STATEMENT_CHARS = 2000
+
+
+@contextmanager
+def span(name: str, **attributes: Any):
+    """Manual span for a pipeline stage; attributes with None values are dropped."""
+    with tracer.start_as_current_span(name, attributes={k: v for k, v in attributes.items() if v is not None}) as s:
+        yield s
+
+
+def traced(name: Optional[str] = None):
+    """Decorator form of span() for sync or async functions."""
+    def decorator(fn):
+        span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+        if asyncio.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_as_current_span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_trace_id() -> Optional[str]:
+    ctx = trace.get_current_span().get_span_context()
+    return format(ctx.trace_id, "032x") if ctx.is_valid else None
+
+
+# -----------------------------------------
+# DB spans
+# -----------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    operation = statement.lstrip().split(" ", 1)[0].upper() if statement else "SQL"
+    s = tracer.start_span(f"db {operation}", kind=trace.SpanKind.CLIENT, attributes={
+        "db.system": conn.engine.dialect.name,
+        "db.operation": operation,
+        "db.statement": statement[:MAX_STATEMENT_CHARS],
+        "db.executemany": bool(executemany),
+    })
+    conn.info.setdefault("tracing_spans", []).append(s)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("tracing_spans")
+    if spans:
+        s = spans.pop()
+        if cursor is not None and cursor.rowcount is not None and cursor.rowcount >= 0:
+            s.set_attribute("db.rowcount", cursor.rowcount)
+        s.end()
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    spans = conn.info.get("tracing_spans") if conn is not None else None
+    if spans:
+        s = spans.pop()
+        s.record_exception(exception_context.original_exception)
+        s.set_status(Status(StatusCode.ERROR))
+        s.end()
+
+
+# -----------------------------------------
+# LLM spans (driven by app.utils.llm_clients)
+# -----------------------------------------
+
+def start_llm_span(provider: str, path: str, model: Optional[str], stream: bool):
+    return tracer.start_span(f"llm {provider} {model or ''}".strip(), kind=trace.SpanKind.CLIENT, attributes={
+        "gen_ai.system": provider,
+        "gen_ai.request.model": model or "",
+        "gen_ai.operation.name": path.rsplit("/", 1)[-1],
+        "llm.stream": stream,
+    })
+
+
+def end_llm_span(s, status: Optional[int], usage: Dict[str, int], error: Optional[BaseException] = None) -> None:
+    if status is not None:
+        s.set_attribute("http.response.status_code", status)
+    s.set_attribute("gen_ai.usage.input_tokens", usage.get("prompt_tokens", 0))
+    s.set_attribute("gen_ai.usage.output_tokens", usage.get("completion_tokens", 0))
+    s.set_attribute("gen_ai.usage.cached_tokens", usage.get("cached_tokens", 0))
+    s.set_attribute("llm.cache_hit", usage.get("cached_tokens", 0) > 0)
+    if error is not None:
+        s.record_exception(error)
+    if error is not None or (status is not None and status >= 400):
+        s.set_status(Status(StatusCode.ERROR))
+    s.end()
+
+
+# -----------------------------------------
+# Exporters / setup
+# -----------------------------------------
+
+class JsonLinesSpanExporter(SpanExporter):
+    """SpanExporter writing one JSON object per finished span to a local file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def export(self, spans: Sequence) -> SpanExportResult:
+        lines = []
+        for s in spans:
+            ctx = s.get_span_context()
+            lines.append(json.dumps({
+                "trace_id": format(ctx.trace_id, "032x"),
+                "span_id": format(ctx.span_id, "016x"),
+                "parent_id": format(s.parent.span_id, "016x") if s.parent else None,
+                "name": s.name,
+                "kind": s.kind.name,
+                "start_ns": s.start_time,
+                "end_ns": s.end_time,
+                "duration_ms": round((s.end_time - s.start_time) / 1e6, 3),
+                "status": s.status.status_code.name,
+                "attributes": dict(s.attributes or {}),
+            }, default=str))
+        with self._lock, open(self.path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+def setup_tracing(app) -> None:
+    """Installs the SDK provider, exporters and automatic spans; no-op unless TRACING_ENABLED."""
+    if not TRACING_ENABLED:
+        return
+
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(TRACING_SAMPLE_RATIO)),
+    )
+    if TRACING_FILE:
+        provider.add_span_processor(BatchSpanProcessor(JsonLinesSpanExporter(TRACING_FILE)))
+    if TRACING_OTLP_ENDPOINT:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=TRACING_OTLP_ENDPOINT)))
+    trace.set_tracer_provider(provider)
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+    FastAPIInstrumentor.instrument_app(app, tracer_provider=provider)
+
+
+# -----------------------------------------
+# Waterfall viewer
+# -----------------------------------------
+
+def _load_trace(path: str, trace_id: Optional[str]) -> list:
+    traces: Dict[str, list] = {}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                s = json.loads(line)
+                traces.setdefault(s["trace_id"], []).append(s)
+    if not traces:
+        return []
+    if trace_id:
+        return traces.get(trace_id, [])
+    # slowest trace by its root span
+    return max(traces.values(), key=lambda spans: max(s["duration_ms"] for s in spans))
+
+
+def print_waterfall(spans: list, width: int = 60) -> None:
+    if not spans:
+        print("no spans")
+        return
+    start = min(s["start_ns"] for s in spans)
+    end = max(s["end_ns"] for s in spans)
+    total = max(end - start, 1)
+    children: Dict[Optional[str], list] = {}
+    ids = {s["span_id"] for s in spans}
+    for s in sorted(spans, key=lambda s: s["start_ns"]):
+        parent = s["parent_id"] if s["parent_id"] in ids else None
+        children.setdefault(parent, []).append(s)
+
+    print(f"trace {spans[0]['trace_id']}  {total / 1e6:.1f} ms  {len(spans)} spans")
+
+    def walk(parent: Optional[str], depth: int) -> None:
+        for s in children.get(parent, []):
+            offset = int((s["start_ns"] - start) / total * width)
+            length = max(1, int((s["end_ns"] - s["start_ns"]) / total * width))
+            bar = " " * offset + "#" * min(length, width - offset)
+            label = ("  " * depth + s["name"])[:48]
+            print(f"{label:<48} {s['duration_ms']:>10.1f} ms |{bar:<{width}}|")
+            walk(s["span_id"], depth + 1)
+
+    walk(None, 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print a trace from a span file as a waterfall")
+    parser.add_argument("file")
+    parser.add_argument("--trace", help="trace id (default: the slowest trace in the file)")
+    args = parser.parse_args()
+    print_waterfall(_load_trace(args.file, args.trace))
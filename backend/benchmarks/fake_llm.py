@@ -0,0 +1,626 @@
+"""
+Local stand-in for the OpenAI and Anthropic HTTP APIs, for load tests and
+benchmarks that must not hit (or pay for) the real providers.
+
+Implements:
+  POST /v1/chat/completions   OpenAI chat completions (stream, json_object / json_schema)
+  POST /v1/responses          OpenAI responses (stream)
+  POST /v1/messages           Anthropic messages (stream)
+  GET  /_fake/stats           request / template / error counters
+  POST /_fake/profile         switch latency profile at runtime ({"profile": "...", ...overrides})
+
+Payloads are templated per call site (interview raw + humanized answers,
+interview chat reply, survey simulation, questionnaire, question
+validators, persona confidence, OCEAN, auto-generated personas, discussion
+guide, Claude reports) so the app's parsers accept them. JSON-mode prompts
+without a dedicated template get the last JSON example spelled out in the
+prompt with its placeholders filled; anything else gets a generic JSON
+object or plain text. Latency is time-to-first-token drawn from a
+log-normal distribution plus output tokens / token rate, and errors (429
+with Retry-After, 500, 503) are injected at configurable rates. With
+max_concurrency set, requests beyond that many in flight get a 429 too,
+like a provider's concurrency limit, so client-side limiting can be tested. A request
+can pick its own profile with the X-Fake-Profile header.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.fake_llm --port 8900 --profile realistic
+
+and point the app at it through the base-URL settings:
+
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8900
+    OPENAI_API_KEY=fake ANTHROPIC_API_KEY=fake
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+# -----------------------------------------
+# Latency / error profiles
+# -----------------------------------------
+
+@dataclass
+class Profile:
+    ttft_ms: float = 0.0            # median time to first token
+    ttft_sigma: float = 0.0         # log-normal sigma of the first-token latency
+    tokens_per_second: float = 0.0  # 0 = emit all output at once
+    error_rate: float = 0.0         # share of requests failing with 500/503
+    rate_limit_rate: float = 0.0    # share of requests failing with 429
+    max_concurrency: int = 0        # 429 beyond this many requests in flight (0 = no cap)
+    retry_after_s: float = 1.0
+    chunk_tokens: int = 8           # tokens per streamed delta
+
+
+PROFILES: Dict[str, Profile] = {
+    "instant": Profile(),
+    "fast": Profile(ttft_ms=150, ttft_sigma=0.25, tokens_per_second=250),
+    "realistic": Profile(ttft_ms=700, ttft_sigma=0.5, tokens_per_second=70, error_rate=0.01, rate_limit_rate=0.01),
+    "degraded": Profile(ttft_ms=2500, ttft_sigma=0.7, tokens_per_second=20, error_rate=0.05, rate_limit_rate=0.10, retry_after_s=2.0),
+}
+
+
+class State:
+    def __init__(self, profile: Profile, seed: Optional[int]):
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.stats: Counter = Counter()
+        self.in_flight = 0
+
+    def profile_for(self, request: Request) -> Profile:
+        name = request.headers.get("x-fake-profile")
+        return PROFILES.get(name, self.profile) if name else self.profile
+
+    def ttft_seconds(self, profile: Profile) -> float:
+        if profile.ttft_ms <= 0:
+            return 0.0
+        return profile.ttft_ms * math.exp(self.rng.gauss(0.0, profile.ttft_sigma)) / 1000.0
+
+
+def count_tokens(text: str) -> int:
+    return max(1, len(text or "") // 4)
+
+
+# -----------------------------------------
+# Templated payloads
+# -----------------------------------------
+
+_WORDS = (
+    "honestly usually price quality weekend family budget convenience trust brand habit store online "
+    "delivery time value friends reviews compare careful practical worried happy options decide routine "
+    "month worth switch local premium simple easy offer discount recommend experience busy".split()
+)
+
+
+def sentence(rng: random.Random, n: int = 14) -> str:
+    words = [rng.choice(_WORDS) for _ in range(n)]
+    return " ".join(words).capitalize() + "."
+
+
+def paragraph(rng: random.Random, sentences: int = 3) -> str:
+    return " ".join(sentence(rng, rng.randint(10, 18)) for _ in range(sentences))
+
+
+def _quoted_values(prompt: str, key: str) -> List[str]:
+    values = []
+    for m in re.finditer(r'"%s"\s*:\s*"((?:[^"\\]|\\.)*)"' % re.escape(key), prompt):
+        try:
+            value = json.loads(f'"{m.group(1)}"')
+        except ValueError:
+            value = m.group(1)
+        if value and value not in values and not value.startswith(("<", "...")):
+            values.append(value)
+    return values
+
+
+def _raw_interview(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    questions = _quoted_values(prompt, "question") or ["General question"]
+    return {"answers": [
+        {
+            "question": q,
+            "persona_answer": paragraph(rng, 2),
+            "implications": [sentence(rng, 8), sentence(rng, 8)],
+            "quality_score": round(rng.uniform(0.6, 0.95), 2),
+            "independence_score": round(rng.uniform(0.6, 0.95), 2),
+            "authenticity_markers": rng.sample(_WORDS, 3),
+            "stance_indicators": rng.sample(_WORDS, 2),
+            "behavioral_signals": {
+                "stated_value": rng.choice(_WORDS),
+                "actual_behavior": sentence(rng, 6),
+                "contradiction_detected": rng.random() < 0.3,
+                "hidden_driver": rng.choice(_WORDS),
+            },
+        }
+        for q in questions
+    ]}
+
+
+def _humanized(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    questions = _quoted_values(prompt, "question") or ["General question"]
+    return {"answers": [
+        {"question": q, "revised_persona_answer": paragraph(rng, 3), "implications": [sentence(rng, 8)]}
+        for q in questions
+    ]}
+
+
+def _chat_reply(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "persona_answer": paragraph(rng, 2),
+        "quality_score": round(rng.uniform(0.6, 0.95), 2),
+        "independence_score": round(rng.uniform(0.6, 0.95), 2),
+        "authenticity_markers": rng.sample(_WORDS, 3),
+    }
+
+
+def _survey(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    m = re.search(r"TOTAL SAMPLE SIZE:\s*(\d+)", prompt)
+    total = int(m.group(1)) if m else 100
+    results = []
+    for qm in re.finditer(r"QUESTION:\s*(.+?)\nOPTIONS:\s*(\[.*?\])", prompt):
+        try:
+            options = json.loads(qm.group(2)) or ["Yes", "No"]
+        except ValueError:
+            options = ["Yes", "No"]
+        weights = [rng.random() + 0.1 for _ in options]
+        counts = [int(total * w / sum(weights)) for w in weights]
+        counts[0] += total - sum(counts)
+        results.append({
+            "text": qm.group(1).strip(),
+            "options": [
+                {"option": o, "count": c, "pct": round(100.0 * c / total, 1) if total else 0.0}
+                for o, c in zip(options, counts)
+            ],
+            "total": total,
+        })
+    return {
+        "sample_size": total,
+        "question_results": results,
+        "summary": paragraph(rng, 2),
+        "llm_source_explanation": {
+            "used_persona_traits": rng.sample(_WORDS, 3),
+            "persona_influences": {},
+            "used_research_objective_elements": rng.sample(_WORDS, 2),
+            "final_reasoning_summary": sentence(rng),
+        },
+    }
+
+
+def _questionnaire(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    titles = ["Attitudes & Preferences", "Perceptions & Acceptance", "Pricing & Purchase Intent"]
+    return {"sections": [
+        {
+            "title": title,
+            "questions": [
+                {
+                    "text": f"How would you rate {rng.choice(_WORDS)} when choosing {rng.choice(_WORDS)}?",
+                    "options": ["Very low", "Low", "Neutral", "High", "Very high"],
+                }
+                for _ in range(4)
+            ],
+        }
+        for title in titles
+    ]}
+
+
+def _discussion_guide(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    return {"sections": [
+        {
+            "title": f"Theme {i + 1}: {rng.choice(_WORDS).capitalize()}",
+            "theme_description": paragraph(rng, 2),
+            "questions": [f"How do you think about {rng.choice(_WORDS)} when it comes to {rng.choice(_WORDS)}?" for _ in range(4)],
+        }
+        for i in range(4)
+    ]}
+
+
+def _validation(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    return {"result": {"valid_or_not": rng.random() < 0.8, "validation_reason": sentence(rng, 12)}}
+
+
+def _confidence(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    score = rng.randint(60, 95)
+    return {
+        "score": f"{score}%",
+        "stars": round(score / 20, 1),
+        "reliability": "High" if score >= 80 else "Medium",
+        "strengths": [sentence(rng, 6), sentence(rng, 6)],
+        "weaknesses": [sentence(rng, 6)],
+        "improvements": sentence(rng, 14),
+    }
+
+
+def _ocean(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    traits = ["openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism"]
+    scores = {t: round(rng.uniform(0.2, 0.9), 2) for t in traits}
+    return {
+        "scores": scores,
+        "labels": {t: "High" if v >= 0.66 else "Medium" if v >= 0.33 else "Low" for t, v in scores.items()},
+        "spider_svg": "<svg xmlns='http://www.w3.org/2000/svg'/>",
+    }
+
+
+def _personas(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    return {"consumer_personas": [
+        {
+            "name": f"The {rng.choice(_WORDS).capitalize()} {rng.choice(['Planner', 'Explorer', 'Saver'])}",
+            "age_range": rng.choice(["18-24", "25-34", "35-44"]),
+            "gender": rng.choice(["Male", "Female"]),
+            "occupation": rng.choice(["Engineer", "Teacher", "Designer"]),
+            "lifestyle": sentence(rng, 8),
+            "values": sentence(rng, 6),
+            "motivations": sentence(rng, 6),
+            "backstory": paragraph(rng, 3),
+            "confidence_scoring": _confidence(prompt, rng),
+            "reference_sites_with_usage": ["https://www.reddit.com/r/example", "https://medium.com/example"],
+            "evidence_snapshot": sentence(rng, 10),
+        }
+        for _ in range(2)
+    ]}
+
+
+def _report_markdown(prompt: str, rng: random.Random) -> str:
+    parts = ["# Research Report", "", "## Executive Summary", paragraph(rng, 4), ""]
+    for i in range(1, 4):
+        parts += [f"## Finding {i}", paragraph(rng, 3), "", f"- {sentence(rng, 8)}", f"- {sentence(rng, 8)}", ""]
+    return "\n".join(parts)
+
+
+# (name, predicate on the prompt text, builder); first match wins
+TEMPLATES: List[Tuple[str, Callable[[str], bool], Callable[[str, random.Random], Any]]] = [
+    ("humanized_answers", lambda p: "revised_persona_answer" in p, _humanized),
+    ("raw_interview", lambda p: "persona_answer" in p and '"answers"' in p, _raw_interview),
+    ("chat_reply", lambda p: "persona_answer" in p, _chat_reply),
+    ("survey_simulation", lambda p: "question_results" in p, _survey),
+    ("discussion_guide", lambda p: "theme_description" in p and '"sections"' in p, _discussion_guide),
+    ("questionnaire", lambda p: '"sections"' in p and "options" in p, _questionnaire),
+    ("question_validation", lambda p: "valid_or_not" in p, _validation),
+    ("persona_confidence", lambda p: '"reliability"' in p and '"stars"' in p, _confidence),
+    ("ocean_profile", lambda p: "OCEAN" in p and "spider_svg" in p, _ocean),
+    ("auto_personas", lambda p: "consumer_personas" in p, _personas),
+]
+
+
+def _fill(value: Any, rng: random.Random) -> Any:
+    if isinstance(value, dict):
+        return {k: _fill(v, rng) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fill(v, rng) for v in value]
+    if isinstance(value, str) and (value.startswith("<") or len(value) > 40 or not value):
+        return sentence(rng)
+    return value
+
+
+def _schema_echo(prompt: str, rng: random.Random) -> Optional[Dict[str, Any]]:
+    """The last JSON object example spelled out in the prompt, with placeholder text filled in."""
+    decoder = json.JSONDecoder()
+    found = None
+    for m in re.finditer(r"\{", prompt):
+        try:
+            obj, _ = decoder.raw_decode(prompt, m.start())
+        except ValueError:
+            continue
+        if isinstance(obj, dict) and obj:
+            found = obj
+    return _fill(found, rng) if found is not None else None
+
+
+def render(prompt: str, json_mode: bool, rng: random.Random, anthropic: bool = False) -> Tuple[str, str]:
+    """(template name, output text) for a prompt."""
+    for name, matches, build in TEMPLATES:
+        if matches(prompt):
+            return name, json.dumps(build(prompt, rng))
+    if anthropic:
+        return "report_markdown", _report_markdown(prompt, rng)
+    if json_mode:
+        echoed = _schema_echo(prompt, rng)
+        if echoed is not None:
+            return "schema_echo", json.dumps(echoed)
+        return "generic_json", json.dumps({"result": "ok", "summary": paragraph(rng, 2)})
+    return "generic_text", paragraph(rng, 3)
+
+
+# -----------------------------------------
+# Request parsing
+# -----------------------------------------
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            part.get("text", "") if isinstance(part, dict) else str(part) for part in content
+        )
+    return ""
+
+
+def _messages_text(messages: List[Dict[str, Any]]) -> str:
+    return "\n".join(_content_text(m.get("content")) for m in messages or [])
+
+
+def _responses_text(body: Dict[str, Any]) -> str:
+    inp = body.get("input")
+    text = inp if isinstance(inp, str) else _messages_text(inp or [])
+    return "\n".join(filter(None, [body.get("instructions") or "", text]))
+
+
+def _error(state: State, profile: Profile, flavour: str) -> Optional[JSONResponse]:
+    roll = state.rng.random()
+    if profile.max_concurrency and state.in_flight > profile.max_concurrency:
+        state.stats["errors_429_concurrency"] += 1
+        status, etype, headers = 429, "rate_limit_error", {"retry-after": str(profile.retry_after_s)}
+    elif roll < profile.rate_limit_rate:
+        state.stats["errors_429"] += 1
+        status, etype, headers = 429, "rate_limit_error", {"retry-after": str(profile.retry_after_s)}
+    elif roll < profile.rate_limit_rate + profile.error_rate:
+        status = state.rng.choice([500, 503])
+        state.stats[f"errors_{status}"] += 1
+        etype, headers = "server_error" if flavour == "openai" else "api_error", {}
+    else:
+        return None
+    message = f"Injected {status} from fake LLM server"
+    if flavour == "anthropic":
+        body = {"type": "error", "error": {"type": etype, "message": message}}
+    else:
+        body = {"error": {"message": message, "type": etype, "param": None, "code": None}}
+    return JSONResponse(body, status_code=status, headers=headers)
+
+
+def _chunks(text: str, profile: Profile) -> List[str]:
+    size = max(1, profile.chunk_tokens) * 4
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+async def _pace(state: State, profile: Profile, text: str) -> None:
+    delay = state.ttft_seconds(profile)
+    if profile.tokens_per_second > 0:
+        delay += count_tokens(text) / profile.tokens_per_second
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+async def _stream_paced(state: State, profile: Profile, text: str):
+    first = state.ttft_seconds(profile)
+    if first > 0:
+        await asyncio.sleep(first)
+    for chunk in _chunks(text, profile):
+        yield chunk
+        if profile.tokens_per_second > 0:
+            await asyncio.sleep(count_tokens(chunk) / profile.tokens_per_second)
+
+
+def _sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+# -----------------------------------------
+# App
+# -----------------------------------------
+
+class InFlightMiddleware:
+    """Counts requests until their (possibly streamed) body has been sent."""
+
+    def __init__(self, app, state: State):
+        self.app = app
+        self.state = state
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/v1/"):
+            await self.app(scope, receive, send)
+            return
+        self.state.in_flight += 1
+        self.state.stats["peak_in_flight"] = max(self.state.stats["peak_in_flight"], self.state.in_flight)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.state.in_flight -= 1
+
+
+def create_app(profile: Profile, seed: Optional[int] = None) -> FastAPI:
+    app = FastAPI(title="Fake LLM server")
+    state = State(profile, seed)
+    app.state.fake = state
+    app.add_middleware(InFlightMiddleware, state=state)
+
+    @app.get("/_fake/stats")
+    async def stats():
+        return {"profile": asdict(state.profile), "in_flight": state.in_flight, "counters": dict(state.stats)}
+
+    @app.post("/_fake/profile")
+    async def set_profile(request: Request):
+        body = await request.json()
+        base = PROFILES.get(body.pop("profile", None), state.profile)
+        state.profile = replace(base, **{k: v for k, v in body.items() if k in Profile.__dataclass_fields__})
+        return asdict(state.profile)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        profile = state.profile_for(request)
+        state.stats["chat.completions"] += 1
+        if (err := _error(state, profile, "openai")) is not None:
+            return err
+
+        prompt = _messages_text(body.get("messages"))
+        fmt = (body.get("response_format") or {}).get("type")
+        name, text = render(prompt, fmt in ("json_object", "json_schema"), state.rng)
+        state.stats[f"template.{name}"] += 1
+
+        cid, created, model = f"chatcmpl-{uuid.uuid4().hex}", int(time.time()), body.get("model", "fake")
+        usage = {
+            "prompt_tokens": count_tokens(prompt),
+            "completion_tokens": count_tokens(text),
+            "total_tokens": count_tokens(prompt) + count_tokens(text),
+        }
+
+        if body.get("stream"):
+            async def events():
+                base = {"id": cid, "object": "chat.completion.chunk", "created": created, "model": model}
+                yield _sse({**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]})
+                async for chunk in _stream_paced(state, profile, text):
+                    yield _sse({**base, "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}]})
+                yield _sse({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    yield _sse({**base, "choices": [], "usage": usage})
+                yield "data: [DONE]\n\n"
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await _pace(state, profile, text)
+        return {
+            "id": cid,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text, "refusal": None},
+                "finish_reason": "stop",
+                "logprobs": None,
+            }],
+            "usage": usage,
+        }
+
+    @app.post("/v1/responses")
+    async def responses(request: Request):
+        body = await request.json()
+        profile = state.profile_for(request)
+        state.stats["responses"] += 1
+        if (err := _error(state, profile, "openai")) is not None:
+            return err
+
+        prompt = _responses_text(body)
+        fmt = ((body.get("text") or {}).get("format") or {}).get("type")
+        name, text = render(prompt, fmt in ("json_object", "json_schema"), state.rng)
+        state.stats[f"template.{name}"] += 1
+
+        rid, mid = f"resp_{uuid.uuid4().hex}", f"msg_{uuid.uuid4().hex}"
+
+        def response_obj(status: str, out: str) -> Dict[str, Any]:
+            return {
+                "id": rid,
+                "object": "response",
+                "created_at": int(time.time()),
+                "status": status,
+                "model": body.get("model", "fake"),
+                "output": [{
+                    "type": "message", "id": mid, "status": status, "role": "assistant",
+                    "content": [{"type": "output_text", "text": out, "annotations": []}],
+                }] if out else [],
+                "parallel_tool_calls": True,
+                "tool_choice": "auto",
+                "tools": [],
+                "usage": {
+                    "input_tokens": count_tokens(prompt),
+                    "input_tokens_details": {"cached_tokens": 0},
+                    "output_tokens": count_tokens(out),
+                    "output_tokens_details": {"reasoning_tokens": 0},
+                    "total_tokens": count_tokens(prompt) + count_tokens(out),
+                },
+            }
+
+        if body.get("stream"):
+            async def events():
+                seq = 0
+                yield _sse({"type": "response.created", "sequence_number": seq, "response": response_obj("in_progress", "")}, "response.created")
+                async for chunk in _stream_paced(state, profile, text):
+                    seq += 1
+                    yield _sse({
+                        "type": "response.output_text.delta", "sequence_number": seq,
+                        "item_id": mid, "output_index": 0, "content_index": 0, "delta": chunk,
+                    }, "response.output_text.delta")
+                seq += 1
+                yield _sse({"type": "response.completed", "sequence_number": seq, "response": response_obj("completed", text)}, "response.completed")
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await _pace(state, profile, text)
+        return response_obj("completed", text)
+
+    @app.post("/v1/messages")
+    async def anthropic_messages(request: Request):
+        body = await request.json()
+        profile = state.profile_for(request)
+        state.stats["anthropic.messages"] += 1
+        if (err := _error(state, profile, "anthropic")) is not None:
+            return err
+
+        prompt = "\n".join([_content_text(body.get("system")), _messages_text(body.get("messages"))])
+        name, text = render(prompt, False, state.rng, anthropic=True)
+        state.stats[f"template.{name}"] += 1
+
+        msg_id, model = f"msg_{uuid.uuid4().hex}", body.get("model", "fake")
+        usage = {"input_tokens": count_tokens(prompt), "output_tokens": count_tokens(text)}
+
+        if body.get("stream"):
+            async def events():
+                start = {
+                    "id": msg_id, "type": "message", "role": "assistant", "model": model, "content": [],
+                    "stop_reason": None, "stop_sequence": None,
+                    "usage": {"input_tokens": usage["input_tokens"], "output_tokens": 0},
+                }
+                yield _sse({"type": "message_start", "message": start}, "message_start")
+                yield _sse({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}, "content_block_start")
+                async for chunk in _stream_paced(state, profile, text):
+                    yield _sse({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": chunk}}, "content_block_delta")
+                yield _sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+                yield _sse({
+                    "type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                    "usage": {"output_tokens": usage["output_tokens"]},
+                }, "message_delta")
+                yield _sse({"type": "message_stop"}, "message_stop")
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await _pace(state, profile, text)
+        return {
+            "id": msg_id,
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": usage,
+        }
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="fast")
+    parser.add_argument("--ttft-ms", type=float)
+    parser.add_argument("--ttft-sigma", type=float)
+    parser.add_argument("--tokens-per-second", type=float)
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--rate-limit-rate", type=float)
+    parser.add_argument("--retry-after-s", type=float)
+    parser.add_argument("--max-concurrency", type=int)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    overrides = {
+        k: v for k, v in vars(args).items()
+        if k in Profile.__dataclass_fields__ and v is not None
+    }
+    profile = replace(PROFILES[args.profile], **overrides)
+
+    import uvicorn
+
+    uvicorn.run(create_app(profile, args.seed), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
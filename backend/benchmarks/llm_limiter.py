@@ -0,0 +1,112 @@
+"""
+Burst test for the per-model LLM limiter (app/utils/llm_limiter.py).
+
+Starts the fake LLM server with a provider-style concurrency cap (requests
+beyond --server-max-concurrency in flight get a 429 with Retry-After) and
+fires --calls chat completions at once through the app's own client. It
+reports client-side failures, latency, the 429s the server handed out, the
+server's peak in-flight count and the limiter's final lane state.
+
+Run it with and without the limiter to compare:
+
+    python -m benchmarks.llm_limiter --calls 200 --server-max-concurrency 8
+    python -m benchmarks.llm_limiter --calls 200 --server-max-concurrency 8 --no-limiter
+
+With the limiter, the lane's concurrency limit should settle near the
+server's cap, and calls should queue rather than fail. Without it, most of
+the burst is rejected, and whatever the SDK retries cannot absorb surfaces
+as RateLimitError.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from benchmarks.research_flow import configure_llm_env, p95, start_fake_llm
+
+
+async def one_call(client, model: str, i: int, stream: bool) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        messages = [{"role": "user", "content": f"Burst call {i}: reply with a short sentence."}]
+        if stream:
+            response = await client.chat.completions.create(
+                model=model, messages=messages, max_tokens=200, stream=True,
+            )
+            async for _ in response:
+                pass
+        else:
+            await client.chat.completions.create(model=model, messages=messages, max_tokens=200)
+        error = None
+    except Exception as e:
+        error = e.__class__.__name__
+    return {"latency_ms": (time.perf_counter() - start) * 1000, "error": error}
+
+
+async def main(args) -> None:
+    import httpx
+
+    from app.utils.llm_clients import async_openai_client
+    from app.utils.llm_limiter import llm_limiter
+
+    client = async_openai_client()
+    started = time.perf_counter()
+    results: List[Dict[str, Any]] = await asyncio.gather(*(
+        one_call(client, args.model, i, args.stream) for i in range(args.calls)
+    ))
+    wall = time.perf_counter() - started
+
+    async with httpx.AsyncClient() as http:
+        server = (await http.get(f"http://127.0.0.1:{args.port}/_fake/stats")).json()["counters"]
+
+    ok = sorted(r["latency_ms"] for r in results if r["error"] is None)
+    report = {
+        "limiter": not args.no_limiter,
+        "calls": args.calls,
+        "succeeded": len(ok),
+        "failed": dict(Counter(r["error"] for r in results if r["error"])),
+        "wall_seconds": round(wall, 2),
+        "throughput_per_s": round(len(ok) / wall, 2) if wall else None,
+        "p50_ms": round(statistics.median(ok), 1) if ok else None,
+        "p95_ms": round(p95(ok), 1) if ok else None,
+        "max_ms": round(ok[-1], 1) if ok else None,
+        "server": {
+            "max_concurrency": args.server_max_concurrency,
+            "peak_in_flight": server.get("peak_in_flight", 0),
+            "rate_limited": server.get("errors_429", 0) + server.get("errors_429_concurrency", 0),
+        },
+        "lane": llm_limiter.snapshot()["lanes"].get(args.model),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--model", default="gpt-4.1")
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--profile", default="fast")
+    parser.add_argument("--server-max-concurrency", type=int, default=8)
+    parser.add_argument("--retry-after-s", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-limiter", action="store_true")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    # both read by app.config at import time
+    os.environ["LLM_LIMITER_ENABLED"] = "false" if args.no_limiter else "true"
+    configure_llm_env(f"http://127.0.0.1:{args.port}")
+    start_fake_llm(
+        args.port, args.profile, args.seed,
+        max_concurrency=args.server_max_concurrency, retry_after_s=args.retry_after_s,
+    )
+
+    asyncio.run(main(args))
@@ -0,0 +1,528 @@
+"""
+End-to-end benchmark of the research flow, driven through the FastAPI app.
+
+Seeds a throwaway user/org/workspace and, per run, a fresh exploration, then
+walks the whole flow over HTTP (in-process ASGI transport, real Postgres,
+LLM calls answered by benchmarks/fake_llm.py):
+
+    OMI session + chat -> auto personas -> population simulation ->
+    questionnaire -> combined survey simulation -> survey preview ->
+    interview guide -> interviews -> rebuttal -> traceability ->
+    survey report / interview export
+
+For every step it records p50/p95/mean latency, DB statements executed,
+request + response bytes, RSS growth, the process's peak RSS and the worst
+event-loop stall (with the blocking stack printed the first time a step
+stalls longer than --block-threshold-ms), and writes the results as JSON so
+two commits can be compared:
+
+    python -m benchmarks.research_flow --runs 5 --output before.json
+    git checkout <other commit>
+    python -m benchmarks.research_flow --runs 5 --output after.json --compare before.json
+
+The fake LLM server is started in a background thread unless --llm-url
+points at one that is already running. Run from the backend directory with a
+reachable DATABASE_URL in .env; report steps need wkhtmltopdf installed and
+are reported with their error count otherwise.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import resource
+import statistics
+import subprocess
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+
+STEPS = [
+    "omi_session",
+    "omi_chat",
+    "personas",
+    "population",
+    "questionnaire",
+    "survey_simulation",
+    "survey_preview",
+    "interview_guide",
+    "interviews",
+    "rebuttal",
+    "traceability",
+    "survey_report",
+    "interview_report",
+]
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return None
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def start_fake_llm(port: int, profile: str, seed: Optional[int], **overrides):
+    import uvicorn
+    from dataclasses import replace
+
+    from benchmarks.fake_llm import PROFILES, create_app
+
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(replace(PROFILES[profile], **overrides), seed), host="127.0.0.1", port=port, log_level="warning",
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def configure_llm_env(llm_url: str) -> None:
+    """Must run before anything under app/ is imported: the clients read the base URLs at import."""
+    os.environ["OPENAI_BASE_URL"] = f"{llm_url.rstrip('/')}/v1"
+    os.environ["ANTHROPIC_BASE_URL"] = llm_url.rstrip("/")
+    os.environ.setdefault("OPENAI_API_KEY", "fake")
+    os.environ.setdefault("ANTHROPIC_API_KEY", "fake")
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+class Measurement:
+    def __init__(self):
+        self.latency_ms: List[float] = []
+        self.statements: List[int] = []
+        self.bytes: List[int] = []
+        self.rss_growth_mb: List[float] = []
+        self.peak_rss_mb = 0.0
+        self.errors = 0
+        self.skipped = 0
+        self.max_loop_lag_ms = 0.0
+        self.loop_stalls = 0
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.latency_ms:
+            return {"runs": 0, "skipped": self.skipped, "errors": self.errors}
+        timings = sorted(self.latency_ms)
+        return {
+            "runs": len(timings),
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(p95(timings), 2),
+            "mean_ms": round(statistics.mean(timings), 2),
+            "db_statements": round(statistics.mean(self.statements), 1),
+            "bytes": round(statistics.mean(self.bytes)),
+            "rss_growth_mb": round(statistics.mean(self.rss_growth_mb), 2) if self.rss_growth_mb else None,
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+            "max_loop_lag_ms": self.max_loop_lag_ms,
+            "loop_stalls": self.loop_stalls,
+            "errors": self.errors,
+            "skipped": self.skipped,
+        }
+
+
+def p95(ordered: List[float]) -> float:
+    """Nearest-rank 95th percentile of an already sorted, non-empty list."""
+    return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
+
+class ResearchFlow:
+    """One pass through the flow for one exploration; each step fills `state` for the next."""
+
+    def __init__(self, client, ids: Dict[str, str], exploration_id: str, counter: StatementCounter, monitor):
+        self.client = client
+        self.monitor = monitor
+        self.ids = ids
+        self.exploration_id = exploration_id
+        self.counter = counter
+        self.base = f"/workspaces/{ids['workspace_id']}/explorations/{exploration_id}"
+        self.state: Dict[str, Any] = {}
+        self._bytes = 0
+        self._failed = False
+
+    async def call(self, method: str, url: str, **kwargs):
+        res = await self.client.request(method, url, **kwargs)
+        self._bytes += len(res.request.content or b"") + len(res.content)
+        if res.status_code >= 400:
+            self._failed = True
+            print(f"[research_flow] {method} {url} -> {res.status_code}: {res.text[:300]}")
+        return res
+
+    @staticmethod
+    def data(res) -> Any:
+        try:
+            body = res.json()
+        except ValueError:
+            return None
+        return body.get("data", body) if isinstance(body, dict) else body
+
+    # ----- steps -----
+
+    async def omi_session(self):
+        res = await self.call("POST", "/workspaces/omi/session", params={"exploration_id": self.exploration_id})
+        self.state["omi_session_id"] = (self.data(res) or {}).get("session_id")
+
+    async def omi_chat(self):
+        if not self.state.get("omi_session_id"):
+            return False
+        await self.call("POST", "/workspaces/omi/chat", json={
+            "session_id": self.state["omi_session_id"],
+            "exploration_id": self.exploration_id,
+            "message": "I want to understand why urban professionals switch grocery delivery apps.",
+        })
+
+    async def personas(self):
+        res = await self.call("GET", f"{self.base}/personas/auto-generate")
+        personas = (self.data(res) or {}).get("personas") or []
+        self.state["persona_ids"] = [p["id"] for p in personas]
+
+    async def population(self):
+        persona_ids = self.state.get("persona_ids")
+        if not persona_ids:
+            return False
+        res = await self.call("POST", f"{self.base}/population/simulate", json={
+            "exploration_id": self.exploration_id,
+            "persona_ids": persona_ids,
+            "sample_distribution": {pid: 50 for pid in persona_ids},
+        })
+        self.state["population_id"] = (self.data(res) or {}).get("id")
+
+    async def questionnaire(self):
+        if not self.state.get("persona_ids"):
+            return False
+        res = await self.call("POST", f"{self.base}/questionnaire/generate", json={
+            "exploration_id": self.exploration_id,
+            "persona_id": self.state["persona_ids"],
+            "simulation_id": self.state.get("population_id"),
+        })
+        sections = (self.data(res) or {}).get("questionnaire") or []
+        self.state["question_ids"] = [q["id"] for sec in sections for q in sec.get("questions", [])]
+
+    async def survey_simulation(self):
+        if not self.state.get("question_ids"):
+            return False
+        res = await self.call("POST", f"{self.base}/questionnaire/simulate", json={
+            "exploration_id": self.exploration_id,
+            "persona_id": self.state["persona_ids"],
+            "simulation_id": self.state.get("population_id"),
+        })
+        self.state["survey_id"] = (self.data(res) or {}).get("id")
+
+    async def survey_preview(self):
+        if not self.state.get("survey_id"):
+            return False
+        await self.call("GET", f"{self.base}/questionnaire/simulation/{self.state['survey_id']}/preview")
+
+    async def interview_guide(self):
+        await self.call("POST", f"{self.base}/in-depth/guides/generate")
+
+    async def interviews(self):
+        if not self.state.get("persona_ids"):
+            return False
+        for persona_id in self.state["persona_ids"]:
+            await self.call("POST", f"{self.base}/in-depth/interviews", json={"persona_id": persona_id})
+
+    async def rebuttal(self):
+        if not (self.state.get("survey_id") and self.state.get("question_ids")):
+            return False
+        res = await self.call("POST", f"{self.base}/rebuttal/start", json={
+            "persona_id": self.state["persona_ids"],
+            "simulation_id": self.state["survey_id"],
+            "question_id": self.state["question_ids"][0],
+        })
+        session_id = (self.data(res) or {}).get("session_id")
+        if session_id:
+            await self.call("POST", f"{self.base}/rebuttal/reply", json={
+                "session_id": session_id, "user_message": "Why did most of you choose that option?",
+            })
+
+    async def traceability(self):
+        await self.call("GET", f"{self.base}/traceability/")
+
+    async def survey_report(self):
+        if not self.state.get("survey_id"):
+            return False
+        await self.call("GET", f"{self.base}/questionnaire/simulation/{self.state['survey_id']}/download")
+
+    async def interview_report(self):
+        await self.call("GET", f"{self.base}/in-depth/interviews/export")
+
+    async def run(self, results: Dict[str, Measurement]) -> None:
+        for name in STEPS:
+            step: Callable = getattr(self, name)
+            m = results[name]
+            self._bytes, self._failed = 0, False
+            statements, rss = self.counter.count, _rss_mb()
+            self.monitor.take_window()
+            start = time.perf_counter()
+            try:
+                ran = await step()
+            except Exception as e:
+                print(f"[research_flow] {name} raised {e.__class__.__name__}: {e}")
+                ran, self._failed = None, True
+            elapsed = (time.perf_counter() - start) * 1000
+            # give the sampler a tick to see a stall that ended with the step
+            await asyncio.sleep(self.monitor.sample_s * 2)
+            loop = self.monitor.take_window()
+            if ran is False:
+                m.skipped += 1
+                continue
+            m.latency_ms.append(elapsed)
+            m.statements.append(self.counter.count - statements)
+            m.bytes.append(self._bytes)
+            if rss is not None:
+                m.rss_growth_mb.append((_rss_mb() or rss) - rss)
+            m.peak_rss_mb = max(m.peak_rss_mb, _peak_rss_mb())
+            m.errors += int(self._failed)
+            m.max_loop_lag_ms = max(m.max_loop_lag_ms, loop["max_lag_ms"])
+            if loop["stalls"] and not m.loop_stalls:
+                worst = max(loop["stalls"], key=lambda s: s["duration_ms"])
+                print(f"[research_flow] {name} blocked the event loop for {worst['duration_ms']} ms:\n{worst['stack'] or ''}")
+            m.loop_stalls += len(loop["stalls"])
+
+
+async def seed_account() -> Dict[str, str]:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.db import async_engine
+    from app.models.organization import Organization
+    from app.models.user import User
+    from app.models.workspace import Workspace, WorkspaceMember
+    from app.utils.id_generator import generate_id
+    from app.utils.security import create_access_token
+
+    ids = {"user_id": generate_id(), "org_id": generate_id(), "workspace_id": generate_id()}
+    email = f"bench-{ids['user_id']}@example.com"
+    async with AsyncSession(async_engine) as session:
+        session.add(User(id=ids["user_id"], full_name="Bench User", email=email, hashed_password="x", is_verified=True))
+        await session.flush()
+        session.add(Organization(id=ids["org_id"], owner_id=ids["user_id"]))
+        await session.flush()
+        session.add(Workspace(id=ids["workspace_id"], name="Bench", organization_id=ids["org_id"]))
+        await session.flush()
+        session.add(WorkspaceMember(workspace_id=ids["workspace_id"], user_id=ids["user_id"], email=email,
+                                    role="admin", accepted=True))
+        await session.commit()
+    ids["token"] = create_access_token(ids["user_id"], "user")
+    return ids
+
+
+async def seed_exploration(ids: Dict[str, str], i: int) -> str:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.db import async_engine
+    from app.models.exploration import Exploration
+    from app.models.research_objectives import ResearchObjectives
+
+    description = (
+        "Understand why urban working professionals aged 25-40 switch between grocery delivery apps, "
+        "which factors (price, delivery time, assortment, trust) drive loyalty, and what would make "
+        "them consolidate their weekly shopping on a single platform."
+    )
+    exploration = Exploration(workspace_id=ids["workspace_id"], title=f"Bench exploration {i}",
+                              description=description, is_quantitative=True, is_qualitative=True,
+                              created_by=ids["user_id"])
+    async with AsyncSession(async_engine) as session:
+        session.add(exploration)
+        await session.flush()
+        session.add(ResearchObjectives(exploration_id=exploration.id, description=description,
+                                       created_by=ids["user_id"], validation_status="valid",
+                                       ai_interpretation={}, confidence_level=90))
+        await session.commit()
+        return exploration.id
+
+
+async def cleanup(ids: Dict[str, str]) -> None:
+    from sqlalchemy import delete
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlmodel import select
+
+    from app.db import async_engine
+    from app.models.exploration import Exploration
+    from app.models.interview import (Interview, InterviewAnswerIndex, InterviewFile, InterviewQuestion,
+                                      InterviewSection)
+    from app.models.omi import OmiMessage, OmiSession, OmiWorkflowAction
+    from app.models.organization import Organization
+    from app.models.persona import Persona
+    from app.models.population import PopulationSimulation
+    from app.models.questionnaire import QuestionnaireQuestion, QuestionnaireSection
+    from app.models.rebuttal import RebuttalSession
+    from app.models.research_objectives import ResearchObjectives
+    from app.models.survey_simulation import SurveySimulation
+    from app.models.traceability import TraceabilityRecord, TraceabilityReport
+    from app.models.user import User
+    from app.models.workspace import Workspace, WorkspaceMember
+
+    workspace_id = ids["workspace_id"]
+    explorations = select(Exploration.id).where(Exploration.workspace_id == workspace_id)
+    omi_sessions = select(OmiSession.id).where(OmiSession.exploration_id.in_(explorations))
+    interviews = select(Interview.id).where(Interview.workspace_id == workspace_id)
+    guide_sections = select(InterviewSection.id).where(InterviewSection.workspace_id == workspace_id)
+    q_sections = select(QuestionnaireSection.id).where(QuestionnaireSection.workspace_id == workspace_id)
+
+    async with AsyncSession(async_engine) as session:
+        for stmt in (
+            delete(OmiWorkflowAction).where(OmiWorkflowAction.session_id.in_(omi_sessions)),
+            delete(OmiMessage).where(OmiMessage.session_id.in_(omi_sessions)),
+            delete(OmiSession).where(OmiSession.exploration_id.in_(explorations)),
+            delete(RebuttalSession).where(RebuttalSession.workspace_id == workspace_id),
+            delete(SurveySimulation).where(SurveySimulation.workspace_id == workspace_id),
+            delete(PopulationSimulation).where(PopulationSimulation.workspace_id == workspace_id),
+            delete(TraceabilityRecord).where(TraceabilityRecord.workspace_id == workspace_id),
+            delete(TraceabilityReport).where(TraceabilityReport.exploration_id.in_(explorations)),
+            delete(InterviewAnswerIndex).where(InterviewAnswerIndex.workspace_id == workspace_id),
+            delete(InterviewFile).where(InterviewFile.interview_id.in_(interviews)),
+            delete(Interview).where(Interview.workspace_id == workspace_id),
+            delete(InterviewQuestion).where(InterviewQuestion.section_id.in_(guide_sections)),
+            delete(InterviewSection).where(InterviewSection.workspace_id == workspace_id),
+            delete(QuestionnaireQuestion).where(QuestionnaireQuestion.section_id.in_(q_sections)),
+            delete(QuestionnaireSection).where(QuestionnaireSection.workspace_id == workspace_id),
+            delete(Persona).where(Persona.workspace_id == workspace_id),
+            delete(ResearchObjectives).where(ResearchObjectives.exploration_id.in_(explorations)),
+            delete(Exploration).where(Exploration.workspace_id == workspace_id),
+            delete(WorkspaceMember).where(WorkspaceMember.workspace_id == workspace_id),
+            delete(Workspace).where(Workspace.id == workspace_id),
+            delete(Organization).where(Organization.id == ids["org_id"]),
+            delete(User).where(User.id == ids["user_id"]),
+        ):
+            await session.execute(stmt)
+        await session.commit()
+
+
+async def drain_background_tasks(timeout: float, ignore=()) -> None:
+    """
+    Let fire-and-forget work (persona derivatives, index writes) finish
+    before the next run/cleanup. Long-lived loops such as the lag sampler
+    never finish and must be passed in `ignore`.
+    """
+    skip = {asyncio.current_task(), *ignore}
+    pending = [t for t in asyncio.all_tasks() if t not in skip]
+    if pending:
+        await asyncio.wait(pending, timeout=timeout)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    out = {}
+    for name, cur in current["steps"].items():
+        base = baseline.get("steps", {}).get(name)
+        if not base or not cur.get("runs") or not base.get("runs"):
+            continue
+        out[name] = {
+            key: {
+                "before": base[key],
+                "after": cur[key],
+                "change_pct": round(100.0 * (cur[key] - base[key]) / base[key], 1) if base[key] else None,
+            }
+            for key in ("p50_ms", "p95_ms", "db_statements", "bytes")
+        }
+    return out
+
+
+async def main(args) -> None:
+    import httpx
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    from app.db import async_engine, init_db, add_is_active_column
+    from app.main import app
+    from app.utils.loop_monitor import LoopMonitor
+
+    counter = StatementCounter()
+    # every engine the services create (some modules build their own), not just app.db's
+    event.listen(Engine, "before_cursor_execute", counter)
+
+    async_engine.echo = False
+    await init_db()
+    await add_is_active_column()
+
+    monitor = LoopMonitor(sample_ms=10, block_threshold_ms=args.block_threshold_ms, capture_stacks=True, log=False)
+    monitor.start()
+
+    ids = await seed_account()
+    results = {name: Measurement() for name in STEPS}
+    started = time.perf_counter()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                     headers={"Authorization": f"Bearer {ids['token']}"},
+                                     timeout=args.timeout) as client:
+            for i in range(args.runs):
+                exploration_id = await seed_exploration(ids, i)
+                await ResearchFlow(client, ids, exploration_id, counter, monitor).run(results)
+                await drain_background_tasks(args.drain_timeout, ignore=[monitor._task])
+    finally:
+        event.remove(Engine, "before_cursor_execute", counter)
+        await monitor.stop()
+        if not args.keep:
+            await cleanup(ids)
+        await async_engine.dispose()
+
+    report = {
+        "meta": {
+            "benchmark": "research_flow",
+            "commit": _git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "runs": args.runs,
+            "llm_profile": args.llm_profile if not args.llm_url else "external",
+            "total_seconds": round(time.perf_counter() - started, 2),
+        },
+        "steps": {name: m.summary() for name, m in results.items()},
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            report["comparison"] = compare(report, json.load(f))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    blocked = [name for name, m in results.items() if m.loop_stalls]
+    if args.fail_on_block and blocked:
+        raise SystemExit(f"event loop blocked > {args.block_threshold_ms:.0f} ms in: {', '.join(blocked)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--llm-url", help="already running fake LLM server, e.g. http://127.0.0.1:8900")
+    parser.add_argument("--llm-port", type=int, default=8900)
+    parser.add_argument("--llm-profile", default="fast")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--drain-timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run to diff against")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded rows for inspection")
+    parser.add_argument("--block-threshold-ms", type=float, default=50.0,
+                        help="event-loop stalls longer than this are counted per step")
+    parser.add_argument("--fail-on-block", action="store_true",
+                        help="exit non-zero if any step stalled the event loop")
+    args = parser.parse_args()
+
+    if args.llm_url:
+        configure_llm_env(args.llm_url)
+    else:
+        start_fake_llm(args.llm_port, args.llm_profile, args.seed)
+        configure_llm_env(f"http://127.0.0.1:{args.llm_port}")
+
+    asyncio.run(main(args))
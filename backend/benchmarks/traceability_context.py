@@ -0,0 +1,243 @@
+"""
+Benchmark for services.traceability.fetch_all_context.
+
+Seeds a throwaway workspace/exploration with 50 interviews (plus personas,
+guide sections, surveys and rebuttals), then times the previous sequential,
+full-row loader against the concurrent projected loader.
+
+Usage (from the backend directory, with a reachable DATABASE_URL in .env):
+
+    python -m benchmarks.traceability_context --interviews 50 --runs 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from sqlalchemy import delete
+from sqlmodel import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import async_engine, init_db
+from app.models.exploration import Exploration
+from app.models.interview import Interview, InterviewAnswerIndex, InterviewSection, InterviewQuestion
+from app.models.organization import Organization
+from app.models.persona import Persona
+from app.models.questionnaire import QuestionnaireSection, QuestionnaireQuestion
+from app.models.rebuttal import RebuttalSession
+from app.models.survey_simulation import SurveySimulation
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.services.traceability import fetch_all_context, _json_dumps_safe
+from app.utils.id_generator import generate_id
+from benchmarks.research_flow import p95
+
+
+async def legacy_fetch_all_context(workspace_id: str, exploration_id: str):
+    """The original loader: sequential full-row SELECTs plus one query per guide section."""
+    async with AsyncSession(async_engine) as session:
+        exploration = (await session.execute(
+            select(Exploration).where(Exploration.id == exploration_id)
+        )).scalars().first()
+        personas = (await session.execute(select(Persona).where(
+            Persona.workspace_id == workspace_id, Persona.exploration_id == exploration_id
+        ))).scalars().all()
+        interviews = (await session.execute(select(Interview).where(
+            Interview.workspace_id == workspace_id, Interview.exploration_id == exploration_id
+        ))).scalars().all()
+        surveys = (await session.execute(select(SurveySimulation).where(
+            SurveySimulation.workspace_id == workspace_id, SurveySimulation.exploration_id == exploration_id
+        ))).scalars().all()
+        rebuttals = (await session.execute(select(RebuttalSession).where(
+            RebuttalSession.workspace_id == workspace_id, RebuttalSession.exploration_id == exploration_id
+        ))).scalars().all()
+        sections = (await session.execute(select(InterviewSection).where(
+            InterviewSection.workspace_id == workspace_id, InterviewSection.exploration_id == exploration_id
+        ))).scalars().all()
+
+        interview_guide = []
+        for section in sections:
+            questions = (await session.execute(
+                select(InterviewQuestion).where(InterviewQuestion.section_id == section.id)
+            )).scalars().all()
+            interview_guide.append({
+                "section_id": section.id,
+                "title": section.title,
+                "questions": [q.text for q in questions]
+            })
+
+    return {
+        "exploration": exploration,
+        "personas": personas,
+        "interviews": interviews,
+        "surveys": surveys,
+        "rebuttals": rebuttals,
+        "interview_guide": interview_guide,
+    }
+
+
+def _persona_payload(i: int) -> dict:
+    return {
+        "name": f"Bench Persona {i}",
+        "age_range": "25-34",
+        "gender": "Female" if i % 2 else "Male",
+        "location_country": "India",
+        "education_level": "Graduate",
+        "occupation": "Product Manager",
+        "income_range": "10-20 LPA",
+        "lifestyle": "Urban, time-poor, health conscious " * 3,
+        "values": "Convenience, transparency, value for money",
+        "motivations": "Save time on weekly errands",
+        "interests": ["fitness", "travel", "cooking"],
+        "backstory": "Lorem ipsum dolor sit amet. " * 40,
+        "ocean_profile": {"openness": 0.7, "conscientiousness": 0.6, "extraversion": 0.4},
+        "persona_details": {"reference_sites_with_usage": ["https://example.com"] * 20,
+                            "notes": "x" * 4000},
+    }
+
+
+async def seed(n_interviews: int, n_personas: int, n_sections: int, n_questions: int) -> dict:
+    ids = {
+        "user_id": generate_id(),
+        "org_id": generate_id(),
+        "workspace_id": generate_id(),
+        "exploration_id": generate_id(),
+    }
+    async with AsyncSession(async_engine) as session:
+        session.add(User(id=ids["user_id"], full_name="Bench User",
+                         email=f"bench-{ids['user_id']}@example.com", hashed_password="x"))
+        await session.flush()
+        session.add(Organization(id=ids["org_id"], owner_id=ids["user_id"]))
+        await session.flush()
+        session.add(Workspace(id=ids["workspace_id"], name="Bench", organization_id=ids["org_id"]))
+        await session.flush()
+        session.add(Exploration(id=ids["exploration_id"], workspace_id=ids["workspace_id"],
+                                title="Bench exploration", description="Benchmark research objective " * 20,
+                                created_by=ids["user_id"]))
+        await session.flush()
+
+        scope = dict(workspace_id=ids["workspace_id"], exploration_id=ids["exploration_id"])
+        persona_ids = []
+        for i in range(n_personas):
+            p = Persona(created_by=ids["user_id"], **scope, **_persona_payload(i))
+            session.add(p)
+            persona_ids.append(p.id)
+
+        guide_questions = []
+        for s in range(n_sections):
+            section = InterviewSection(title=f"Section {s}", description="Theme " * 10,
+                                       created_by=ids["user_id"], **scope)
+            session.add(section)
+            await session.flush()
+            for q in range(n_questions):
+                text = f"Section {s} question {q}: how do you feel about the offer?"
+                session.add(InterviewQuestion(section_id=section.id, text=text, created_by=ids["user_id"]))
+                guide_questions.append((section.title, text))
+        await session.flush()
+
+        for i in range(n_interviews):
+            persona_id = persona_ids[i % n_personas]
+            messages, answers = [], {}
+            for section_title, text in guide_questions:
+                messages.append({"role": "user", "text": text, "meta": {"section": section_title}})
+                messages.append({"role": "assistant", "text": "A considered answer. " * 15})
+                answers[text] = {"persona_id": persona_id, "persona_answer": "Answer " * 30,
+                                 "implications": ["implication one", "implication two"]}
+            session.add(Interview(persona_id=persona_id, messages=messages, generated_answers=answers,
+                                  created_by=ids["user_id"], **scope))
+
+        q_section = QuestionnaireSection(title="Bench Q", created_by=ids["user_id"], **scope)
+        session.add(q_section)
+        await session.flush()
+        q_question = QuestionnaireQuestion(section_id=q_section.id, text="Would you buy?",
+                                           options=["Yes", "No"], created_by=ids["user_id"])
+        session.add(q_question)
+        await session.flush()
+
+        for i in range(5):
+            session.add(SurveySimulation(
+                persona_id=persona_ids, total_sample_size=500, created_by=ids["user_id"],
+                results={"Would you buy?": [{"option": "Yes", "count": 300, "pct": 60.0}]},
+                narrative={"summary": "Narrative " * 50},
+                simulation_result={"internal": ["stat"] * 2000},
+                **scope,
+            ))
+            session.add(RebuttalSession(
+                id=generate_id(), persona_id=persona_ids[i % n_personas], question_id=q_question.id,
+                messages=[{"role": "user", "text": "Why?"}, {"role": "assistant", "text": "Because."}],
+                created_by=ids["user_id"], **scope,
+            ))
+
+        await session.commit()
+
+    ids["questionnaire_section_id"] = q_section.id
+    return ids
+
+
+async def cleanup(ids: dict) -> None:
+    workspace_id = ids["workspace_id"]
+    async with AsyncSession(async_engine) as session:
+        section_ids = select(InterviewSection.id).where(InterviewSection.workspace_id == workspace_id)
+        await session.execute(delete(RebuttalSession).where(RebuttalSession.workspace_id == workspace_id))
+        await session.execute(delete(SurveySimulation).where(SurveySimulation.workspace_id == workspace_id))
+        await session.execute(delete(QuestionnaireQuestion).where(
+            QuestionnaireQuestion.section_id == ids["questionnaire_section_id"]))
+        await session.execute(delete(QuestionnaireSection).where(QuestionnaireSection.workspace_id == workspace_id))
+        await session.execute(delete(InterviewAnswerIndex).where(InterviewAnswerIndex.workspace_id == workspace_id))
+        await session.execute(delete(Interview).where(Interview.workspace_id == workspace_id))
+        await session.execute(delete(InterviewQuestion).where(InterviewQuestion.section_id.in_(section_ids)))
+        await session.execute(delete(InterviewSection).where(InterviewSection.workspace_id == workspace_id))
+        await session.execute(delete(Persona).where(Persona.workspace_id == workspace_id))
+        await session.execute(delete(Exploration).where(Exploration.workspace_id == workspace_id))
+        await session.execute(delete(Workspace).where(Workspace.id == workspace_id))
+        await session.execute(delete(Organization).where(Organization.id == ids["org_id"]))
+        await session.execute(delete(User).where(User.id == ids["user_id"]))
+        await session.commit()
+
+
+async def _time(loader, ids: dict, runs: int) -> dict:
+    timings = []
+    payload_bytes = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        context = await loader(ids["workspace_id"], ids["exploration_id"])
+        timings.append((time.perf_counter() - start) * 1000)
+    for key in ("personas", "interviews", "surveys", "rebuttals", "interview_guide"):
+        payload_bytes += len(_json_dumps_safe(context.get(key, [])))
+    timings.sort()
+    return {
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(p95(timings), 2),
+        "mean_ms": round(statistics.mean(timings), 2),
+        "serialized_bytes": payload_bytes,
+    }
+
+
+async def main(args) -> None:
+    async_engine.echo = False
+    await init_db()
+    ids = await seed(args.interviews, args.personas, args.sections, args.questions)
+    try:
+        # warm the pool so neither loader pays connection setup
+        await fetch_all_context(ids["workspace_id"], ids["exploration_id"])
+        results = {
+            "interviews": args.interviews,
+            "runs": args.runs,
+            "legacy": await _time(legacy_fetch_all_context, ids, args.runs),
+            "concurrent": await _time(fetch_all_context, ids, args.runs),
+        }
+    finally:
+        await cleanup(ids)
+        await async_engine.dispose()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=50)
+    parser.add_argument("--personas", type=int, default=10)
+    parser.add_argument("--sections", type=int, default=6)
+    parser.add_argument("--questions", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,30 @@
+import asyncio
+import os
+
+import pytest
+
+# app.config builds Settings() at import time; tests need no real secrets
+for _name in ("JWT_SECRET", "MAIL_USERNAME", "MAIL_PASSWORD", "MAIL_FROM", "MAIL_SERVER",
+              "SUPERADMIN_NAME", "SUPERADMIN_EMAIL", "SUPERADMIN_PASSWORD"):
+    os.environ.setdefault(_name, "test")
+
+from app.utils.loop_monitor import blocking_guard  # noqa: E402
+
+
+@pytest.fixture
+def run_without_blocking():
+    """
+    Runs an async test body on a fresh loop inside blocking_guard(), so the
+    test fails with LoopBlockedError if anything held the loop too long:
+
+        def test_upload(run_without_blocking):
+            async def body():
+                ...
+            run_without_blocking(body)
+    """
+    def run(body, threshold_ms: float = 50):
+        async def guarded():
+            async with blocking_guard(threshold_ms=threshold_ms):
+                await body()
+        asyncio.run(guarded())
+    return run
@@ -0,0 +1,23 @@
+import asyncio
+import time
+
+import pytest
+
+from app.utils.loop_monitor import LoopBlockedError
+
+
+def test_cooperative_code_passes(run_without_blocking):
+    async def body():
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+
+    run_without_blocking(body)
+
+
+def test_blocking_call_fails(run_without_blocking):
+    async def body():
+        time.sleep(0.2)  # a sync call on the loop thread
+
+    with pytest.raises(LoopBlockedError) as exc:
+        run_without_blocking(body)
+    assert "time.sleep(0.2)" in str(exc.value)
@@ -11,6 +11,40 @@ export const interviewService = {
     return response.data;
   },
 
+  // Start an interview that is generated in the background (poll getInterviewProgress)
+  startInterviewInBackground: async (workspaceId, explorationId, personaId) => {
+    const response = await axiosInstance.post(
+      `/workspaces/${workspaceId}/explorations/${explorationId}/in-depth/interviews`,
+      { persona_id: personaId, background: true }
+    );
+    return response.data;
+  },
+
+  // Interview several personas (all of the exploration when omitted) in one background batch
+  startInterviewBatch: async (workspaceId, explorationId, personaIds = null) => {
+    const response = await axiosInstance.post(
+      `/workspaces/${workspaceId}/explorations/${explorationId}/in-depth/interviews/batch`,
+      { persona_ids: personaIds }
+    );
+    return response.data;
+  },
+
+  // Per-persona progress of an interview batch
+  getInterviewBatch: async (workspaceId, explorationId, batchId) => {
+    const response = await axiosInstance.get(
+      `/workspaces/${workspaceId}/explorations/${explorationId}/in-depth/interviews/batch/${batchId}`
+    );
+    return response.data;
+  },
+
+  // Generation progress of an interview
+  getInterviewProgress: async (workspaceId, explorationId, interviewId) => {
+    const response = await axiosInstance.get(
+      `/workspaces/${workspaceId}/explorations/${explorationId}/in-depth/interviews/${interviewId}/progress`
+    );
+    return response.data;
+  },
+
   // Get interview by ID
   getInterview: async (workspaceId, explorationId, interviewId) => {
     const response = await axiosInstance.get(
@@ -14,3 +14,17 @@ export const triggerOmniWorkflow = async ({ stage, event, payload = {} }) => {
     timestamp: Date.now(),
   };
 };
+
+export const triggerOmniWorkflowBatch = async (events = []) => {
+  const response = await axiosInstance.post('/omi/workflow/events', {
+    events: events.map(({ stage, event, payload = {} }) => ({ stage, event, payload })),
+  });
+
+  const timestamp = Date.now();
+  return response.data.map((data, index) => ({
+    ...data,
+    stage: events[index].stage,
+    event: events[index].event,
+    timestamp,
+  }));
+};
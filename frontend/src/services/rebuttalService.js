@@ -16,6 +16,10 @@ export const rebuttalApi = {
   sendReply: (workspaceId, explorationId, data) =>
     axiosInstance.post(`/workspaces/${workspaceId}/explorations/${explorationId}/rebuttal/reply`, data),
 
+  // Each persona answers individually (generated in parallel)
+  sendPersonaReplies: (workspaceId, explorationId, data) =>
+    axiosInstance.post(`/workspaces/${workspaceId}/explorations/${explorationId}/rebuttal/reply/personas`, data),
+
   // Get session details
   getSession: (workspaceId, explorationId, sessionId) =>
     axiosInstance.get(`/workspaces/${workspaceId}/explorations/${explorationId}/rebuttal/session/${sessionId}`),